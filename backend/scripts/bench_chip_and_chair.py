@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Chip & A Chair what-if benchmark: build_chip_and_chair once per rule
+variant vs build_chip_and_chair_batch for all variants at once.
+
+Default: a synthetic 40-player season with 600 eliminations (repeat pairs,
+eliminators missing from SeasonTotals, tied Drop-2 points) and 500 random
+variants of base stack, multipliers, per-elim / repeat-tier chips and HV
+rank thresholds. Checks every player's TotalStack matches under every
+variant.
+
+Usage:
+  python backend/scripts/bench_chip_and_chair.py
+  python backend/scripts/bench_chip_and_chair.py --variants 2000 --players 80
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import time
+
+from chip_and_chair import (
+    ChipAndChairRules,
+    build_chip_and_chair,
+    build_chip_and_chair_batch,
+    chip_and_chair_features,
+)
+
+
+def synthetic_season(n_players: int, n_elims: int, seed: int = 0):
+    rnd = random.Random(seed)
+    names = [f"Player {i:02d}" for i in range(n_players)]
+    season_totals = [
+        {"Player": p, "SeasonPointsDrop2": rnd.randint(0, 120) / 2}
+        for p in names
+    ]
+    # a few eliminators who never made SeasonTotals, and padded names
+    pool = names + ["Guest A", "Guest B"]
+    eliminations = []
+    for _ in range(n_elims):
+        killer, victim = rnd.sample(pool, 2)
+        if rnd.random() < 0.3:   # rivalries: repeat pairs
+            killer, victim = names[rnd.randrange(5)], names[5 + rnd.randrange(5)]
+        eliminations.append({
+            "EliminatorPlayer": f" {killer}" if rnd.random() < 0.05 else killer,
+            "EliminatedPlayer": victim,
+        })
+    return season_totals, eliminations
+
+
+def random_variants(n: int, seed: int = 1):
+    rnd = random.Random(seed)
+    return [
+        ChipAndChairRules(
+            base_stack=rnd.choice([5000, 6500, 8000]),
+            season_points_chip_multiplier=rnd.choice([75, 101, 150, 175, 200]),
+            chip_per_total_elim=rnd.randrange(0, 201, 25),
+            chip_per_repeat_elim=rnd.randrange(0, 301, 25),
+            chip_per_hv_elim=rnd.randrange(0, 501, 50),
+            hv_victim_rank_max=rnd.randint(1, 6),
+            hv_eliminator_rank_min=rnd.randint(2, 10),
+        )
+        for _ in range(n)
+    ]
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--players", type=int, default=40)
+    ap.add_argument("--elims", type=int, default=600)
+    ap.add_argument("--variants", type=int, default=500)
+    args = ap.parse_args(argv)
+
+    season_totals, eliminations = synthetic_season(args.players, args.elims)
+    variants = random_variants(args.variants)
+
+    t0 = time.perf_counter()
+    loop = [
+        {r["Player"]: r["TotalStack"] for r in build_chip_and_chair(season_totals, eliminations, v)}
+        for v in variants
+    ]
+    loop_s = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    features = chip_and_chair_features(season_totals, eliminations)
+    features_s = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    players, stacks = build_chip_and_chair_batch(features, variants)
+    batch_s = time.perf_counter() - t0
+
+    print(f"{len(players)} players x {len(variants)} variants ({len(eliminations)} eliminations)")
+    print(f"  build_chip_and_chair per variant  {loop_s * 1000:8.1f} ms")
+    print(f"  features (once)                   {features_s * 1000:8.1f} ms")
+    print(f"  batch, all variants               {batch_s * 1000:8.1f} ms")
+    for j, by_player in enumerate(loop):
+        assert set(by_player) == set(players), f"variant {j}: player sets differ"
+        for i, p in enumerate(players):
+            assert stacks[i, j] == by_player[p], (j, p, stacks[i, j], by_player[p], variants[j])
+    print("  identical stacks for every player and variant")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Peak-RSS benchmark for the streaming event reader.
+
+Generates N synthetic weekly logs (default N = 10, 100, 1,000, 10,000;
+~55 rows each, like a real game night) and, for each N, runs a fresh child
+interpreter that either
+  - ingest: runs ingest_all_csvs.main() into a scratch DB, or
+  - frames: drains event_reader.iter_event_frames() over all files
+and reports the child's peak RSS. Flat numbers across N = bounded memory.
+
+In ingest mode the SQLite page cache (WRITE_PRAGMAS cache_size, 64MB) fills
+up as the DB grows. That cache is capped. Pass --cache-kib to shrink it and
+isolate the Python side.
+
+Usage:
+  python backend/scripts/bench_event_reader.py
+  python backend/scripts/bench_event_reader.py --files 10 1000 --mode frames
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import os
+import resource
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+SCRIPTS_DIR = Path(__file__).resolve().parent
+ROWS_PER_FILE = 55
+
+
+def make_logs(root: Path, n_files: int) -> Path:
+    from bench_ingest import write_synthetic_log
+
+    src = root / "all"
+    src.mkdir(exist_ok=True)
+    d0 = date(2000, 1, 1)
+    for i in range(n_files):
+        name = f"{(d0 + timedelta(days=i)).strftime('%m.%d.%y')} log.csv"
+        path = src / name
+        if not path.exists():
+            write_synthetic_log(path, ROWS_PER_FILE)
+    return src
+
+
+def link_first(src: Path, dst: Path, n_files: int) -> None:
+    dst.mkdir()
+    for path in sorted(src.iterdir())[:n_files]:
+        os.symlink(path, dst / path.name)
+
+
+def child(args, data_dir: Path, db_path: Path) -> None:
+    if args.mode == "ingest":
+        import db_utils
+        import ingest_all_csvs
+        from migrate_db import migrate
+
+        if args.cache_kib:
+            db_utils.WRITE_PRAGMAS["cache_size"] = -args.cache_kib
+
+        conn = sqlite3.connect(str(db_path))
+        conn.executescript((SCRIPTS_DIR.parent / "sql" / "schema.sql").read_text(encoding="utf-8"))
+        migrate(conn)
+        conn.commit()
+        conn.close()
+
+        ingest_all_csvs.DB_PATH = db_path
+        ingest_all_csvs.DATA_DIR = data_dir
+        with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+            ingest_all_csvs.main([])
+    else:
+        from event_reader import iter_event_frames
+
+        files = sorted(data_dir.glob("*.csv"))
+        rows = sum(len(df) for df in iter_event_frames(files, chunksize=args.chunksize))
+        assert rows > 0
+
+    # ru_maxrss is KiB on Linux
+    print(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--files", type=int, nargs="+", default=[10, 100, 1_000, 10_000])
+    ap.add_argument("--mode", choices=["ingest", "frames"], default="ingest")
+    ap.add_argument("--cache-kib", type=int, help="override the ingest page cache size (KiB)")
+    ap.add_argument("--chunksize", type=int, default=10_000, help="rows per DataFrame in frames mode")
+    ap.add_argument("--child", nargs=2, metavar=("DATA_DIR", "DB_PATH"), help=argparse.SUPPRESS)
+    args = ap.parse_args(argv)
+
+    if args.child:
+        child(args, Path(args.child[0]), Path(args.child[1]))
+        return 0
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        src = make_logs(tmp, max(args.files))
+
+        opts = f"cache_kib={args.cache_kib or 'default'}" if args.mode == "ingest" else f"chunksize={args.chunksize:,}"
+        print(f"mode={args.mode}  rows/file={ROWS_PER_FILE}  {opts}")
+        print(f"{'files':>8} {'rows':>10} {'peak RSS':>12} {'secs':>8}")
+        for n in sorted(args.files):
+            data_dir = tmp / f"n{n}"
+            link_first(src, data_dir, n)
+
+            t0 = time.perf_counter()
+            cmd = [sys.executable, __file__, "--mode", args.mode, "--chunksize", str(args.chunksize)]
+            if args.cache_kib:
+                cmd += ["--cache-kib", str(args.cache_kib)]
+            out = subprocess.run(
+                cmd + ["--child", str(data_dir), str(tmp / f"n{n}.sqlite")],
+                check=True, capture_output=True, text=True, cwd=SCRIPTS_DIR,
+            )
+            secs = time.perf_counter() - t0
+            rss_mb = int(out.stdout.strip().splitlines()[-1]) / 1024
+            print(f"{n:>8,} {n * ROWS_PER_FILE:>10,} {rss_mb:>9.1f} MB {secs:>8.2f}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+ICM accuracy and speed check.
+
+Accuracy: icm_exact vs a brute force over every finish order on random
+small fields (2..8 players, ladders shorter and longer than the field),
+and icm_monte_carlo vs icm_exact on a 9-player field. Speed: a 16-player
+Chip & A Chair field (6 paid) exact, and a 40-player field Monte Carlo.
+
+Usage:
+  python backend/scripts/bench_icm.py
+  python backend/scripts/bench_icm.py --fields 500 --players 20
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import time
+from itertools import permutations
+
+import numpy as np
+
+from build_weekly_payouts import CHIP_AND_CHAIR_PAYOUTS
+from icm import icm_equity, icm_exact, icm_monte_carlo
+
+
+def icm_brute_force(stacks, payouts) -> np.ndarray:
+    """Equity summed over all n! finish orders, each weighted by its Malmuth-Harville probability."""
+    n = len(stacks)
+    total = float(sum(stacks))
+    equity = np.zeros(n)
+    for order in permutations(range(n)):
+        p, left = 1.0, total
+        for i in order:
+            p *= stacks[i] / left
+            left -= stacks[i]
+        for place, i in enumerate(order[:len(payouts)]):
+            equity[i] += p * payouts[place]
+    return equity
+
+
+def best_of(fn, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        out = fn()
+        best = min(best, time.perf_counter() - t0)
+    return out, best
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--fields", type=int, default=200, help="random small fields checked vs brute force")
+    ap.add_argument("--players", type=int, default=16, help="field size for the timed exact run")
+    ap.add_argument("--repeat", type=int, default=5)
+    args = ap.parse_args(argv)
+    rnd = random.Random(0)
+
+    worst = 0.0
+    for _ in range(args.fields):
+        n = rnd.randint(2, 8)
+        stacks = [rnd.randint(1, 400) * 50 for _ in range(n)]
+        payouts = sorted((rnd.randint(1, 50) * 10 for _ in range(rnd.randint(1, 9))), reverse=True)
+        brute = icm_brute_force(stacks, payouts)
+        exact = icm_exact(stacks, payouts)
+        worst = max(worst, float(np.abs(exact - brute).max()))
+        assert np.allclose(exact, brute, rtol=0, atol=1e-9), (stacks, payouts, exact, brute)
+        assert abs(exact.sum() - sum(payouts[:n])) < 1e-9
+    print(f"exact vs brute force: {args.fields} fields of 2..8 players, max |diff| ${worst:.2e}")
+
+    stacks = [rnd.randint(80, 340) * 50 for _ in range(9)]
+    exact = icm_exact(stacks, CHIP_AND_CHAIR_PAYOUTS)
+    mc = icm_monte_carlo(stacks, CHIP_AND_CHAIR_PAYOUTS)
+    assert np.abs(mc - exact).max() < 1.0, (mc, exact)
+    print(f"monte carlo vs exact (9 players, 200k trials): max |diff| ${np.abs(mc - exact).max():.3f}")
+
+    stacks = [rnd.randint(130, 340) * 50 for _ in range(args.players)]
+    (equity, method), exact_s = best_of(lambda: icm_equity(stacks, CHIP_AND_CHAIR_PAYOUTS), args.repeat)
+    print(f"{args.players} players, {len(CHIP_AND_CHAIR_PAYOUTS)} paid ({method})   {exact_s * 1000:8.1f} ms")
+    mc, mc_s = best_of(lambda: icm_monte_carlo(stacks, CHIP_AND_CHAIR_PAYOUTS), args.repeat)
+    print(f"{args.players} players, monte carlo 200k trials  {mc_s * 1000:8.1f} ms  "
+          f"(max |diff| vs {method} ${np.abs(mc - equity).max():.3f})")
+
+    big = [rnd.randint(130, 340) * 50 for _ in range(40)]
+    (_, method), big_s = best_of(lambda: icm_equity(big, CHIP_AND_CHAIR_PAYOUTS), args.repeat)
+    print(f"40 players, {len(CHIP_AND_CHAIR_PAYOUTS)} paid ({method})       {big_s * 1000:8.1f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""
+Ingest throughput benchmark (rows/sec) on synthetic weekly logs.
+
+Compares the pre-bulk ingest_one_csv loop, verbatim (default sqlite
+settings, list(reader) first, one `cur.execute` per row of the eight
+original columns) against ingest_all_csvs.ingest_one_csv (streamed batches
+into executemany + WRITE_PRAGMAS, one commit per file). The current path
+also parses the typed level / chips / amount / table columns and
+event_epoch / event_dt per row, so it does more work per row than the
+loop it replaced.
+
+Usage:
+  python backend/scripts/bench_ingest.py               # 10k and 1M rows
+  python backend/scripts/bench_ingest.py --rows 50000 --skip-legacy
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import sqlite3
+import tempfile
+import time
+from pathlib import Path
+
+from db_utils import connect
+from ingest_all_csvs import ingest_one_csv
+
+SCHEMA_PATH = Path(__file__).resolve().parents[1] / "sql" / "schema.sql"
+
+HEADER = ["Time", "Event", "Level", "Players", "Eliminated By", "Chips", "Amount", "Table", "Position"]
+BENCH_DATE = "2026-01-01"
+PLAYERS = [f"Player {i:02d}" for i in range(40)]
+
+
+def write_synthetic_log(path: Path, n_rows: int) -> None:
+    """A repeating mix of the event types seen in real logs."""
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        w = csv.writer(f)
+        w.writerow(HEADER)
+        for i in range(n_rows):
+            minute = i % 300
+            ts = f"{7 + minute // 60}:{minute % 60:02d}pm"
+            p = PLAYERS[i % len(PLAYERS)]
+            kind = i % 5
+            if kind == 0:
+                w.writerow([ts, "BuyIn", "", p, "", "6,500 each", "$20.00 each", "", ""])
+            elif kind == 1:
+                w.writerow([ts, "Blinds", f"Level {i % 20 + 1}, 100/200, 15 min.", "", "", "", "", "", ""])
+            elif kind == 2:
+                w.writerow([ts, "Eliminated", "", p, PLAYERS[(i + 7) % len(PLAYERS)], "", "", "", ""])
+            elif kind == 3:
+                w.writerow([ts, "Seat", "", p, "", "", "", str(i % 3 + 1), str(i % 10 + 1)])
+            else:
+                w.writerow([ts, "TimerPause", "", "", "", "", "", "", ""])
+
+
+def fresh_db(path: Path) -> None:
+    for suffix in ("", "-wal", "-shm"):
+        Path(f"{path}{suffix}").unlink(missing_ok=True)
+
+    conn = sqlite3.connect(str(path))
+    conn.executescript(SCHEMA_PATH.read_text(encoding="utf-8"))
+    conn.execute("INSERT INTO seasons (season_id, season_name) VALUES ('bench', 'Bench')")
+    conn.execute(
+        "INSERT INTO tournaments (tournament_id, season_id, tournament_date) VALUES (1, 'bench', ?)", (BENCH_DATE,)
+    )
+    conn.commit()
+    conn.close()
+
+
+def legacy_ingest(db_path: Path, csv_path: Path) -> int:
+    """The pre-bulk ingest_one_csv loop, kept verbatim: list(reader), notes string, one execute per row."""
+    conn = sqlite3.connect(str(db_path))
+    cur = conn.cursor()
+    tournament_id = 1
+
+    # wipe existing rows for this tournament (safe reruns)
+    cur.execute("DELETE FROM raw_log_events WHERE tournament_id = ?", (tournament_id,))
+
+    with open(csv_path, "r", newline="", encoding="utf-8-sig") as f:
+        reader = csv.DictReader(f)
+        rows = list(reader)
+
+    inserted = 0
+    for r in rows:
+        event_ts = (r.get("Time") or "").strip()
+        event_type = (r.get("Event") or "unknown").strip()
+        player_name = (r.get("Players") or "").strip()
+        eliminator_player_name = (r.get("Eliminated By") or "").strip()
+        eliminated_player_name = ""
+
+        pos_text = (r.get("Position") or "").strip()
+        position = int(pos_text) if pos_text.isdigit() else None
+
+        notes = (
+            f"Level={r.get('Level','')}; "
+            f"Chips={r.get('Chips','')}; "
+            f"Amount={r.get('Amount','')}; "
+            f"Table={r.get('Table','')}; "
+            f"Position={r.get('Position','')}"
+        )
+
+        cur.execute(
+            """
+            INSERT INTO raw_log_events
+                (tournament_id, event_ts, event_type, player_name, eliminated_player_name, eliminator_player_name, notes, position)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+            (tournament_id, event_ts, event_type, player_name, eliminated_player_name, eliminator_player_name, notes, position),
+        )
+        inserted += 1
+
+    conn.commit()
+    conn.close()
+    return inserted
+
+
+def bulk_ingest(db_path: Path, csv_path: Path) -> int:
+    conn = connect(db_path, write=True)
+    n = ingest_one_csv(conn.cursor(), 1, csv_path, BENCH_DATE)
+    conn.commit()
+    conn.close()
+    return n
+
+
+def timed(fn, db_path: Path, csv_path: Path) -> tuple[int, float]:
+    fresh_db(db_path)
+    t0 = time.perf_counter()
+    n = fn(db_path, csv_path)
+    return n, time.perf_counter() - t0
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--rows", type=int, nargs="+", default=[10_000, 1_000_000])
+    ap.add_argument("--skip-legacy", action="store_true", help="only time the bulk loader")
+    args = ap.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        for n_rows in args.rows:
+            csv_path = tmp / f"synthetic_{n_rows}.csv"
+            write_synthetic_log(csv_path, n_rows)
+
+            print(f"\n== {n_rows:,} rows ==")
+            results = {}
+            if not args.skip_legacy:
+                results["legacy per-row"] = timed(legacy_ingest, tmp / "legacy.sqlite", csv_path)
+            results["bulk executemany"] = timed(bulk_ingest, tmp / "bulk.sqlite", csv_path)
+
+            for label, (n, secs) in results.items():
+                print(f"  {label:<18} {n:>10,} rows  {secs:8.3f}s  {n / secs:>12,.0f} rows/sec")
+
+            if len(results) == 2:
+                speedup = results["legacy per-row"][1] / results["bulk executemany"][1]
+                print(f"  speedup: {speedup:.1f}x")
+
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
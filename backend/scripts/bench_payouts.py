@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+weekly_payouts rebuild benchmark: statements issued and wall time for a
+multi-season rebuild, at a small and a large tournament count.
+
+Synthetic seasons of 11 weeks (10 regular + Chip & A Chair), field sizes
+4..30 (inside and outside the commissioner table), points and finish
+places in weekly_points; season_totals / player_season_stats come from
+the season_aggregates triggers. Checks every regular week pays its
+field size's ladder, the Chip & A Chair week its ladder, the season
+awards go to the Drop-2 top 3 of seasons that reached week 10, and the
+number of distinct statements does not grow with the number of
+tournaments (the INSERT is one executemany, traced once per row).
+
+Usage:
+  python backend/scripts/bench_payouts.py
+  python backend/scripts/bench_payouts.py --tournaments 2000
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import sqlite3
+import tempfile
+import time
+from pathlib import Path
+
+from build_weekly_payouts import DEFAULT_PAYOUT_POLICY, payout_ladders, rebuild_payouts
+from migrate_db import migrate
+from stage_profiler import SqlTrace
+
+SCHEMA_PATH = Path(__file__).resolve().parents[1] / "sql" / "schema.sql"
+WEEKS = 11
+PLAYERS = 40
+
+
+def fresh_db(path: Path, n_tournaments: int, seed: int = 0) -> list[str]:
+    rnd = random.Random(seed)
+    conn = sqlite3.connect(str(path))
+    conn.executescript(SCHEMA_PATH.read_text(encoding="utf-8"))
+    migrate(conn)
+    conn.executemany(
+        "INSERT INTO players (player_id, player_name) VALUES (?, ?)",
+        [(p, f"Player {p:02d}") for p in range(1, PLAYERS + 1)],
+    )
+    seasons = [f"bench_{s:03d}" for s in range((n_tournaments + WEEKS - 1) // WEEKS)]
+    conn.executemany(
+        "INSERT INTO seasons (season_id, season_name) VALUES (?, ?)", [(s, s) for s in seasons]
+    )
+    rows = []
+    for t in range(n_tournaments):
+        season_id, week = seasons[t // WEEKS], t % WEEKS + 1
+        conn.execute(
+            "INSERT INTO tournaments (tournament_id, season_id, tournament_date) VALUES (?, ?, ?)",
+            (t + 1, season_id, f"2000-01-01+{t}"),
+        )
+        field = rnd.sample(range(1, PLAYERS + 1), rnd.randint(6 if week == WEEKS else 4, 30))
+        rows.extend(
+            (season_id, t + 1, week, pid, place, float(len(field) - place + rnd.randint(0, 3)))
+            for place, pid in enumerate(field, start=1)
+        )
+    conn.executemany(
+        """
+        INSERT INTO weekly_points (season_id, tournament_id, week_num, player_id, finish_place, points)
+        VALUES (?, ?, ?, ?, ?, ?)
+        """,
+        rows,
+    )
+    conn.commit()
+    conn.close()
+    return seasons
+
+
+def check(conn: sqlite3.Connection, seasons: list[str]) -> None:
+    policy = DEFAULT_PAYOUT_POLICY
+    ladders = payout_ladders(policy)
+    weeks = conn.execute(
+        """
+        SELECT season_id, week_num, COUNT(*) FROM weekly_points
+        WHERE finish_place IS NOT NULL GROUP BY season_id, week_num
+        """
+    ).fetchall()
+    paid = dict(
+        ((s, w), (n, total)) for s, w, n, total in conn.execute(
+            """
+            SELECT season_id, week_num, COUNT(*), SUM(amount) FROM weekly_payouts
+            WHERE payout_type <> 'season_award' GROUP BY season_id, week_num
+            """
+        )
+    )
+    for season_id, week, field_size in weeks:
+        ladder = policy.chip_and_chair if week == policy.chip_and_chair_week else ladders[field_size]
+        expected = [a for a in ladder if a > 0]
+        assert paid[(season_id, week)] == (len(expected), sum(expected)), (season_id, week, field_size)
+
+    last_week = dict(conn.execute("SELECT season_id, MAX(week_num) FROM weekly_points GROUP BY season_id"))
+    for season_id in seasons:
+        top = [r[0] for r in conn.execute(
+            """
+            SELECT st.player_id FROM season_totals st
+            JOIN players p ON p.player_id = st.player_id
+            LEFT JOIN player_season_stats pss ON pss.season_id = st.season_id AND pss.player_id = st.player_id
+            WHERE st.season_id = ?
+            ORDER BY st.season_points_drop2 DESC, st.season_points_total DESC,
+                     COALESCE(pss.wins, 0) DESC, p.player_name DESC
+            LIMIT ?
+            """,
+            (season_id, len(policy.season_awards)),
+        )]
+        awards = conn.execute(
+            "SELECT player_id, amount FROM weekly_payouts WHERE season_id = ? AND payout_type = 'season_award' "
+            "ORDER BY amount DESC",
+            (season_id,),
+        ).fetchall()
+        if last_week[season_id] < policy.award_week:      # season not finished: no awards yet
+            top = []
+        assert awards == list(zip(top, map(float, policy.season_awards))), (season_id, awards, top)
+
+
+def timed_rebuild(n_tournaments: int) -> tuple[int, int, float]:
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = Path(tmp) / "payouts.sqlite"
+        seasons = fresh_db(db_path, n_tournaments)
+        conn = sqlite3.connect(str(db_path))
+        trace = SqlTrace()
+        conn.set_trace_callback(trace)
+        t0 = time.perf_counter()
+        n_rows = rebuild_payouts(conn, seasons)
+        elapsed = time.perf_counter() - t0
+        conn.set_trace_callback(None)
+        conn.commit()
+        check(conn, seasons)
+        conn.close()
+    return len(trace.statements), n_rows, elapsed
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--tournaments", type=int, default=200)
+    args = ap.parse_args(argv)
+
+    counts = set()
+    for n in (WEEKS, args.tournaments):
+        statements, n_rows, elapsed = timed_rebuild(n)
+        counts.add(statements)
+        print(f"{n:5d} tournaments: {statements} distinct statements, {n_rows:5d} payout rows, {elapsed * 1000:7.1f} ms")
+    assert len(counts) == 1, "statement count grows with the number of tournaments"
+    print("  payouts match the ladders and season standings; statement count is constant")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
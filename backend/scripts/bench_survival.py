@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+"""
+compute_survival_weekly benchmark: the per-tournament loop vs the SQL
+per-participant load + survival_from_participants on a synthetic season.
+
+Default: 2,000 tournaments x 500 events = 1M timed events. Times carry
+seconds (so minute values hit the rounding edges), some tournaments have no
+TOURNAMENT START / END row, some eliminations repeat or name players who
+never bought in. Checks both produce the same frame and reports the SQL
+load (one row per participant) and the NumPy compute separately, on a
+connection with the pipeline's write pragmas.
+
+Usage:
+  python backend/scripts/bench_survival.py
+  python backend/scripts/bench_survival.py --tournaments 200 --events 500
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import sqlite3
+import tempfile
+import time
+from pathlib import Path
+
+import pandas as pd
+
+from compute_survival import SurvivalConfig, load_survival_participants, survival_from_participants
+from db_utils import connect
+from migrate_db import migrate
+
+SCHEMA_PATH = Path(__file__).resolve().parents[1] / "sql" / "schema.sql"
+SEASON = "bench"
+PLAYERS_PER_TOURNAMENT = 40
+
+
+def fresh_db(path: Path, n_tournaments: int, n_events: int, seed: int = 0) -> None:
+    rnd = random.Random(seed)
+    conn = sqlite3.connect(str(path))
+    conn.executescript(SCHEMA_PATH.read_text(encoding="utf-8"))
+    migrate(conn)
+    conn.execute("INSERT INTO seasons (season_id, season_name) VALUES (?, 'Bench')", (SEASON,))
+    conn.executemany(
+        "INSERT INTO tournaments (tournament_id, season_id, tournament_date) VALUES (?, ?, ?)",
+        [(t, SEASON, f"2000-01-01+{t}") for t in range(1, n_tournaments + 1)],
+    )
+
+    rows = []
+    for t in range(1, n_tournaments + 1):
+        t0 = 1_000_000 * t
+        players = [f"Player {p:02d}" for p in rnd.sample(range(80), PLAYERS_PER_TOURNAMENT)]
+        events = [(t0 + rnd.randint(0, 300), "BuyIn", p, None) for p in players]
+        if rnd.random() > 0.1:
+            events.append((t0 + 600, "TOURNAMENT START", None, None))
+        out = rnd.sample(players, PLAYERS_PER_TOURNAMENT - 1)
+        for i, p in enumerate(out):
+            ts = t0 + 600 + (i + 1) * rnd.randint(60, 400)
+            events.append((ts, "Eliminated", f" {p} ", None))
+            if rnd.random() < 0.05:   # logs sometimes repeat
+                events.append((ts + 30, "Eliminated", p, None))
+        if rnd.random() < 0.05:
+            events.append((t0 + 700, "Eliminated", "Ghost", ""))
+        if rnd.random() > 0.1:
+            events.append((max(e[0] for e in events) + rnd.randint(0, 59), "TOURNAMENT END", None, None))
+        while len(events) < n_events:
+            events.append((t0 + rnd.randint(0, 20_000), "Blinds", None, None))
+        rows.extend((t, e, typ, p, elim) for e, typ, p, elim in events[:n_events])
+
+    conn.executemany(
+        """
+        INSERT INTO raw_log_events (tournament_id, event_epoch, event_type, player_name, eliminated_player_name)
+        VALUES (?, ?, ?, ?, ?)
+        """,
+        rows,
+    )
+    conn.commit()
+    conn.close()
+
+
+def legacy_survival_weekly(conn: sqlite3.Connection, cfg: SurvivalConfig) -> pd.DataFrame:
+    """The pre-vectorization compute_survival_weekly, kept verbatim for comparison."""
+    def _minutes_between(a, b):
+        return max(0.0, (b - a) / 60.0)
+
+    sql = f"""
+    SELECT
+        e.{cfg.col_tournament_id} AS tournament_id,
+        e.{cfg.col_event_epoch} AS event_epoch,
+        e.{cfg.col_event_type} AS event_type,
+        e.{cfg.col_player_name} AS player_name,
+        CASE
+            WHEN e.{cfg.col_event_type} = 'Eliminated'
+                THEN COALESCE(
+                    NULLIF(TRIM(e.{cfg.col_eliminated_name}), ''),
+                    NULLIF(TRIM(e.{cfg.col_player_name}), '')
+                    )
+            ELSE NULL
+            END AS eliminated_player_name
+    FROM {cfg.events_table} e
+    JOIN {cfg.tournaments_table} t
+      ON t.{cfg.col_tournament_id} = e.{cfg.col_tournament_id}
+    WHERE t.season_id = ?
+      AND e.{cfg.col_event_epoch} IS NOT NULL
+    """
+    df = pd.read_sql_query(sql, conn, params=(cfg.season_id,))
+
+    out_rows = []
+    for tid, g in df.groupby("tournament_id", sort=True):
+        start_rows = g[g["event_type"] == cfg.evt_tournament_start]
+        end_rows = g[g["event_type"] == cfg.evt_tournament_end]
+        start_epoch = start_rows["event_epoch"].min() if not start_rows.empty else g["event_epoch"].min()
+        end_epoch = end_rows["event_epoch"].max() if not end_rows.empty else g["event_epoch"].max()
+        tournament_minutes = _minutes_between(start_epoch, end_epoch)
+
+        participants = (
+            g.loc[g["event_type"] == cfg.evt_buyin, "player_name"]
+             .dropna()
+             .astype(str)
+             .unique()
+             .tolist()
+        )
+        elim = g[g["event_type"] == cfg.evt_eliminated].copy()
+        elim = elim.dropna(subset=["eliminated_player_name"])
+        elim_first = elim.groupby("eliminated_player_name", as_index=True)["event_epoch"].min()
+
+        for player in participants:
+            if player in elim_first.index:
+                minutes_survived = _minutes_between(start_epoch, elim_first[player])
+                if tournament_minutes > 0:
+                    minutes_survived = min(minutes_survived, tournament_minutes)
+            else:
+                minutes_survived = tournament_minutes
+            survival_percent = (minutes_survived / tournament_minutes) if tournament_minutes > 0 else 0.0
+            out_rows.append({
+                "tournament_id": int(tid),
+                "player_name": player,
+                "tournament_minutes": round(tournament_minutes, 1),
+                "minutes_survived": round(minutes_survived, 1),
+                "survival_percent": round(survival_percent, 3),
+            })
+    return pd.DataFrame(out_rows)
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--tournaments", type=int, default=2000)
+    ap.add_argument("--events", type=int, default=500, help="events per tournament")
+    ap.add_argument("--repeat", type=int, default=5, help="best-of for the load and the compute")
+    args = ap.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = Path(tmp) / "survival.sqlite"
+        fresh_db(db_path, args.tournaments, args.events)
+        conn = connect(db_path, write=True)
+        cfg = SurvivalConfig(season_id=SEASON)
+
+        t0 = time.perf_counter()
+        legacy = legacy_survival_weekly(conn, cfg)
+        legacy_s = time.perf_counter() - t0
+
+        load_s = compute_s = float("inf")
+        for _ in range(args.repeat):
+            t0 = time.perf_counter()
+            participants = load_survival_participants(conn, cfg)
+            load_s = min(load_s, time.perf_counter() - t0)
+            t0 = time.perf_counter()
+            weekly = survival_from_participants(participants)
+            compute_s = min(compute_s, time.perf_counter() - t0)
+        conn.close()
+
+    print(
+        f"{args.tournaments} tournaments x {args.events} events = {args.tournaments * args.events:,} events "
+        f"({len(participants):,} participant rows loaded), {len(weekly):,} rows"
+    )
+    print(f"  legacy loop (load + compute)  {legacy_s * 1000:8.1f} ms")
+    print(f"  participant load (SQL)        {load_s * 1000:8.1f} ms")
+    print(f"  compute (NumPy)               {compute_s * 1000:8.1f} ms")
+    print(f"  load + compute                {(load_s + compute_s) * 1000:8.1f} ms")
+    pd.testing.assert_frame_equal(legacy, weekly)
+    print(f"  identical output; speedup vs legacy: {legacy_s / (load_s + compute_s):.1f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
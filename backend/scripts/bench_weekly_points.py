@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+build_weekly_points benchmark: SQL statements and time on a synthetic season.
+
+Default: 100 tournaments x 40 players (4,000 buy-ins, all players new).
+Compares the old per-buy-in loop (SELECT ... WHERE TRIM(player_name) =
+TRIM(?), INSERT OR IGNORE + re-SELECT for new players, one INSERT per row)
+against build_weekly_points.run (bulk player create + one INSERT ... SELECT
+on players.player_key), and checks both produce the same rows.
+
+Usage:
+  python backend/scripts/bench_weekly_points.py
+  python backend/scripts/bench_weekly_points.py --tournaments 500 --players 60
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import io
+import sqlite3
+import tempfile
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+import build_weekly_points
+from migrate_db import migrate
+from stage_profiler import SqlTrace
+
+SCHEMA_PATH = Path(__file__).resolve().parents[1] / "sql" / "schema.sql"
+SEASON = "bench"
+
+
+def fresh_db(path: Path, n_tournaments: int, n_players: int) -> None:
+    path.unlink(missing_ok=True)
+    conn = sqlite3.connect(str(path))
+    conn.executescript(SCHEMA_PATH.read_text(encoding="utf-8"))
+    migrate(conn)
+    conn.execute("INSERT INTO seasons (season_id, season_name) VALUES (?, 'Bench')", (SEASON,))
+
+    d0 = date(2026, 1, 1)
+    conn.executemany(
+        "INSERT INTO tournaments (tournament_id, season_id, tournament_date) VALUES (?, ?, ?)",
+        [(t, SEASON, (d0 + timedelta(days=7 * t)).isoformat()) for t in range(1, n_tournaments + 1)],
+    )
+    # padded names exercise the TRIM normalization; a Blinds row per buy-in is noise
+    rows = []
+    for t in range(1, n_tournaments + 1):
+        for p in range(n_players):
+            rows.append((t, "BuyIn", f" Player {p:03d} "))
+            rows.append((t, "Blinds", ""))
+    conn.executemany("INSERT INTO raw_log_events (tournament_id, event_type, player_name) VALUES (?, ?, ?)", rows)
+    conn.commit()
+    conn.close()
+
+
+def legacy_run(conn: sqlite3.Connection, season_id: str) -> None:
+    """The pre-rewrite loop, kept verbatim for comparison."""
+    cur = conn.cursor()
+    cur.execute("DELETE FROM weekly_points WHERE season_id = ?", (season_id,))
+    tournaments = cur.execute(
+        "SELECT tournament_id, tournament_date FROM tournaments WHERE season_id = ? ORDER BY tournament_date",
+        (season_id,),
+    ).fetchall()
+    week_map = {tid: i + 1 for i, (tid, _d) in enumerate(tournaments)}
+    date_map = {tid: d for tid, d in tournaments}
+
+    buyins = cur.execute("""
+        SELECT DISTINCT r.tournament_id, TRIM(r.player_name) AS player_name
+        FROM raw_log_events r
+        JOIN tournaments t ON t.tournament_id = r.tournament_id
+        WHERE t.season_id = ?
+          AND LOWER(TRIM(r.event_type)) IN ('buyin', 'buy-in', 'buy in')
+          AND r.player_name IS NOT NULL
+          AND TRIM(r.player_name) <> ''
+        ORDER BY r.tournament_id, player_name
+    """, (season_id,)).fetchall()
+
+    for tournament_id, player_name in buyins:
+        row = cur.execute(
+            "SELECT player_id FROM players WHERE TRIM(player_name) = TRIM(?)", (player_name,)
+        ).fetchone()
+        if not row:
+            cur.execute("INSERT OR IGNORE INTO players (player_name) VALUES (?)", (player_name,))
+            row = cur.execute(
+                "SELECT player_id FROM players WHERE TRIM(player_name) = TRIM(?)", (player_name,)
+            ).fetchone()
+        if not row:
+            continue
+        cur.execute("""
+            INSERT OR REPLACE INTO weekly_points
+              (season_id, tournament_id, week_num, tournament_date, player_id, finish_place, points, payout)
+            VALUES (?, ?, ?, ?, ?, NULL, NULL, NULL)
+        """, (season_id, tournament_id, week_map[tournament_id], date_map[tournament_id], int(row[0])))
+
+
+def set_based_run(conn: sqlite3.Connection, season_id: str) -> None:
+    with contextlib.redirect_stdout(io.StringIO()):
+        build_weekly_points.run(conn, season_id=season_id)
+
+
+def timed(fn, db_path: Path) -> tuple[int, int, float, list]:
+    conn = sqlite3.connect(str(db_path))
+    trace = SqlTrace()
+    conn.set_trace_callback(trace)
+    t0 = time.perf_counter()
+    fn(conn, SEASON)
+    conn.commit()
+    secs = time.perf_counter() - t0
+    conn.set_trace_callback(None)
+
+    rows = conn.execute("""
+        SELECT wp.tournament_id, wp.week_num, wp.tournament_date, p.player_id, p.player_name
+        FROM weekly_points wp JOIN players p ON p.player_id = wp.player_id
+        ORDER BY wp.tournament_id, p.player_name
+    """).fetchall()
+    conn.close()
+    return sum(trace.statements.values()), trace.trigger_calls, secs, rows
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--tournaments", type=int, default=100)
+    ap.add_argument("--players", type=int, default=40)
+    args = ap.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        results = {}
+        for label, fn in (("legacy per-row", legacy_run), ("set-based", set_based_run)):
+            db_path = tmp / f"{label.split()[0]}.sqlite"
+            fresh_db(db_path, args.tournaments, args.players)
+            results[label] = timed(fn, db_path)
+
+    print(f"{args.tournaments} tournaments x {args.players} players")
+    for label, (statements, trigger_calls, secs, rows) in results.items():
+        print(
+            f"  {label:<16} {len(rows):>7,} rows  {statements:>7,} SQL statements"
+            f"  {trigger_calls:>7,} trigger calls  {secs:8.4f}s"
+        )
+
+    (_, _, legacy_secs, legacy_rows), (_, _, bulk_secs, bulk_rows) = results.values()
+    assert legacy_rows == bulk_rows, "set-based weekly_points differ from the legacy loop"
+    print(f"  identical output; speedup: {legacy_secs / bulk_secs:.1f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
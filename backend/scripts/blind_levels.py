@@ -0,0 +1,286 @@
+# backend/scripts/blind_levels.py
+"""
+Blind-level pace and survival by level, from the raw event table that
+compute_survival reads (raw_log_events, same SurvivalConfig columns).
+
+  Timeline   per tournament and level: start / end (minutes from the
+             tournament start), minutes played, blinds and scheduled length
+  ByLevel    league-wide: tournaments that reached the level, average
+             minutes, eliminations and eliminations per hour
+  ByPlayer   per player and level: eliminations at that level and
+             tournaments in which the player was still in at its start
+
+A level runs from its Blinds row to the next Blinds or Break row (breaks
+are not level time), or to the tournament end. Levels are numbered from 1:
+a Blinds row without a level >= 1 ("Level 0" pre-game timer) ends the level
+before it like a break and is not level time itself. An elimination belongs to
+the last level started at or before it. Everything is one grouped pass
+over the season's events: sort by (tournament, time) once, then segment
+arithmetic and a single searchsorted; blinds text is parsed once per
+distinct string.
+
+Usage:
+  python backend/scripts/blind_levels.py      # league-wide table
+"""
+
+from __future__ import annotations
+
+import os
+import sqlite3
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from compute_survival import SurvivalConfig
+from log_fields import parse_blinds, parse_notes
+
+DB_PATH = Path(os.environ.get("POKERLEAGUE_DB", "backend/db/pokerleague.sqlite"))
+SEASON_ID = os.environ.get("SEASON_ID", "spring_2026")
+
+EVT_BLINDS = "Blinds"
+EVT_BREAK = "Break"
+
+# event_kind codes produced by load_level_events
+KIND_OTHER, KIND_START, KIND_END, KIND_ELIMINATED, KIND_BLINDS, KIND_BREAK = 0, 1, 2, 3, 4, 5
+
+_EPOCH_BITS = 34    # (tournament index, epoch) packed in one int64 sort key
+
+
+def load_level_events(conn: sqlite3.Connection, cfg: SurvivalConfig) -> pd.DataFrame:
+    """
+    The season's timed events with an integer event_kind, the level number
+    and notes on Blinds rows, and the eliminated player's key (TRIM name,
+    as players.player_key) on Eliminated rows. level is as parsed at ingest
+    (parse_level accepts "Level 0"); blind_levels() drops levels < 1.
+    """
+    sql = f"""
+    SELECT
+        e.{cfg.col_tournament_id} AS tournament_id,
+        e.{cfg.col_event_epoch} AS event_epoch,
+        CASE e.{cfg.col_event_type}
+            WHEN ? THEN {KIND_START}
+            WHEN ? THEN {KIND_END}
+            WHEN ? THEN {KIND_ELIMINATED}
+            WHEN ? THEN {KIND_BLINDS}
+            WHEN ? THEN {KIND_BREAK}
+            ELSE {KIND_OTHER}
+            END AS event_kind,
+        CASE WHEN e.{cfg.col_event_type} = ? THEN e.level END AS level,
+        CASE WHEN e.{cfg.col_event_type} = ? THEN e.notes END AS notes,
+        CASE
+            WHEN e.{cfg.col_event_type} = ?
+                THEN COALESCE(
+                    NULLIF(TRIM(e.{cfg.col_eliminated_name}), ''),
+                    NULLIF(TRIM(e.{cfg.col_player_name}), '')
+                    )
+            END AS player_key
+    FROM {cfg.events_table} e
+    JOIN {cfg.tournaments_table} t
+      ON t.{cfg.col_tournament_id} = e.{cfg.col_tournament_id}
+    WHERE t.season_id = ?
+      AND e.{cfg.col_event_epoch} IS NOT NULL
+    """
+    params = (
+        cfg.evt_tournament_start, cfg.evt_tournament_end, cfg.evt_eliminated, EVT_BLINDS, EVT_BREAK,
+        EVT_BLINDS, EVT_BLINDS, cfg.evt_eliminated, cfg.season_id,
+    )
+    return pd.read_sql_query(sql, conn, params=params)
+
+
+def _participants(conn: sqlite3.Connection, season_id: str) -> pd.DataFrame:
+    return pd.read_sql_query(
+        """
+        SELECT wp.tournament_id, wp.player_id, p.player_name, p.player_key
+        FROM weekly_points wp
+        JOIN players p ON p.player_id = wp.player_id
+        WHERE wp.season_id = ?
+        """,
+        conn,
+        params=(season_id,),
+    )
+
+
+def blind_levels(conn: sqlite3.Connection, season_id=None) -> dict:
+    """The season's BlindLevels JSON section (see the module docstring)."""
+    season_id = season_id or SEASON_ID
+    cfg = SurvivalConfig(season_id=season_id)
+    events = load_level_events(conn, cfg)
+    empty = {"Levels": [], "Timeline": [], "ByLevel": [], "ByPlayer": []}
+    if events.empty or not (events["event_kind"] == KIND_BLINDS).any():
+        return empty
+
+    # one sort by (tournament, time); at the same minute a Blinds row sorts
+    # last, so a "Shuffle up" break logged with level 1 doesn't end it
+    t_ids, t_idx = np.unique(events["tournament_id"].to_numpy(), return_inverse=True)
+    epochs = events["event_epoch"].to_numpy(dtype=np.int64)
+    order = np.lexsort((events["event_kind"].to_numpy() == KIND_BLINDS, epochs, t_idx))
+    t_idx, epochs = t_idx[order], epochs[order]
+    kind = events["event_kind"].to_numpy()[order]
+    level = events["level"].to_numpy(dtype=float)[order]
+    notes = events["notes"].to_numpy(dtype=object)[order]
+    player_key = events["player_key"].to_numpy(dtype=object)[order]
+
+    # tournament bounds: START / END rows, else first / last event
+    n_t = len(t_ids)
+    seg = np.searchsorted(t_idx, np.arange(n_t))
+    first, last = epochs[seg], epochs[np.r_[seg[1:], len(epochs)] - 1]
+    start = np.minimum.reduceat(np.where(kind == KIND_START, epochs, np.iinfo(np.int64).max), seg)
+    end = np.maximum.reduceat(np.where(kind == KIND_END, epochs, np.iinfo(np.int64).min), seg)
+    start = np.where(start == np.iinfo(np.int64).max, first, start)
+    end = np.where(end == np.iinfo(np.int64).min, last, end)
+
+    # level spans: each Blinds row runs to the next Blinds / Break row or the end
+    bound = np.flatnonzero((kind == KIND_BLINDS) | (kind == KIND_BREAK))
+    next_bound = np.r_[bound[1:], -1]
+    same_t = (next_bound >= 0) & (t_idx[np.maximum(next_bound, 0)] == t_idx[bound])
+    span_end = np.where(same_t, epochs[np.maximum(next_bound, 0)], end[t_idx[bound]])
+    is_level = (kind[bound] == KIND_BLINDS) & (level[bound] >= 1)     # NaN / "Level 0" rows are not levels
+    rows = bound[is_level]
+    if not len(rows):
+        return empty
+    span = pd.DataFrame({
+        "t": t_idx[rows],
+        "level": level[rows].astype(np.int64),
+        "start": epochs[rows],
+        "end": np.maximum(span_end[is_level], epochs[rows]),
+        "notes": notes[rows],
+    })
+    span["minutes"] = (span["end"] - span["start"]) / 60.0
+
+    # blinds text -> (small, big, scheduled minutes), once per distinct string
+    parsed = {n: parse_blinds(parse_notes(n).get("Level")) for n in pd.unique(span["notes"].dropna())}
+    blinds = span["notes"].map(lambda n: parsed.get(n))
+
+    # a level restarted by the timer shows up twice: one timeline row per level
+    span["small"] = [b[0] if b else None for b in blinds]
+    span["big"] = [b[1] if b else None for b in blinds]
+    span["scheduled"] = [b[2] if b else None for b in blinds]
+    timeline = (
+        span.groupby(["t", "level"], as_index=False, sort=True)
+            .agg(start=("start", "min"), end=("end", "max"), minutes=("minutes", "sum"),
+                 small=("small", "first"), big=("big", "first"), scheduled=("scheduled", "first"))
+    )
+
+    # eliminations -> level in effect (last level start at or before it)
+    # (span rows are already in (tournament, time) order, so lvl_key is sorted)
+    lvl_t, lvl_level = span["t"].to_numpy(), span["level"].to_numpy()
+    lvl_key = (lvl_t << _EPOCH_BITS) + span["start"].to_numpy()
+    elim = np.flatnonzero((kind == KIND_ELIMINATED) & pd.notna(player_key))
+    elim_key = (t_idx[elim] << _EPOCH_BITS) + epochs[elim]
+    pos = np.maximum(np.searchsorted(lvl_key, elim_key, side="right") - 1, 0)
+    first_lvl = np.minimum(np.searchsorted(lvl_t, t_idx[elim]), len(lvl_t) - 1)
+    has_levels = lvl_t[first_lvl] == t_idx[elim]       # tournaments without Blinds rows are left out
+    elim_level = np.where(lvl_t[pos] == t_idx[elim], lvl_level[pos], lvl_level[first_lvl])
+    busts = (
+        pd.DataFrame({
+            "tournament_id": t_ids[t_idx[elim]],
+            "player_key": player_key[elim],
+            "bust_level": elim_level,
+        })[has_levels]
+        .drop_duplicates(["tournament_id", "player_key"])        # repeated elim rows: first one
+    )
+
+    # arrays are indexed by level - first_level (the exported Levels list)
+    first_level = max(1, int(timeline["level"].min()))
+    levels = np.arange(first_level, int(timeline["level"].max()) + 1)
+    n_levels = len(levels)
+    t_max_level = timeline.groupby("t")["level"].max().reindex(range(n_t)).fillna(0).to_numpy()
+
+    # league-wide per level
+    reached_t = np.bincount(timeline["level"] - first_level, minlength=n_levels)
+    minutes_sum = np.bincount(timeline["level"] - first_level, weights=timeline["minutes"], minlength=n_levels)
+    elims_by_level = np.bincount(busts["bust_level"] - first_level, minlength=n_levels)
+    by_level = [
+        {
+            "Level": int(lv),
+            "Tournaments": int(reached_t[i]),
+            "AvgMinutes": round(float(minutes_sum[i] / reached_t[i]), 1) if reached_t[i] else None,
+            "Eliminations": int(elims_by_level[i]),
+            "EliminationsPerHour": (
+                round(float(elims_by_level[i] / (minutes_sum[i] / 60.0)), 2) if minutes_sum[i] > 0 else None
+            ),
+        }
+        for i, lv in enumerate(levels)
+    ]
+
+    # per player: busts at each level, and levels reached (still in at the start)
+    players = _participants(conn, season_id).merge(busts, how="left", on=["tournament_id", "player_key"])
+    players = players[players["tournament_id"].isin(t_ids)]
+    p_ids, p_idx = np.unique(players["player_id"].to_numpy(), return_inverse=True)
+    p_t = np.searchsorted(t_ids, players["tournament_id"].to_numpy())
+    bust = players["bust_level"].to_numpy(dtype=float)
+    busted = ~np.isnan(bust)
+    last_in = np.where(busted, bust, t_max_level[p_t]).astype(np.int64)   # last level the player saw
+    last_in = np.where(last_in > 0, last_in - first_level + 1, 0)         # 0 = no level seen, else index + 1
+    n_p = len(p_ids)
+    elims_by_player = np.bincount(
+        p_idx[busted] * n_levels + last_in[busted] - 1, minlength=n_p * n_levels
+    ).reshape(n_p, n_levels)
+    # reached level L = tournaments whose last level seen is >= L (reverse cumsum)
+    last_hist = np.bincount(p_idx * (n_levels + 1) + last_in, minlength=n_p * (n_levels + 1))
+    reached_by_player = np.cumsum(last_hist.reshape(n_p, n_levels + 1)[:, ::-1], axis=1)[:, ::-1][:, 1:]
+    names = dict(zip(players["player_id"], players["player_name"]))
+    tournaments_by_player = np.bincount(p_idx, minlength=len(p_ids))
+
+    by_player = sorted(
+        (
+            {
+                "Player": names[pid],
+                "PlayerID": int(pid),
+                "Tournaments": int(tournaments_by_player[i]),
+                "Eliminations": [int(x) for x in elims_by_player[i]],
+                "Reached": [int(x) for x in reached_by_player[i]],
+            }
+            for i, pid in enumerate(p_ids)
+        ),
+        key=lambda r: r["Player"],
+    )
+
+    dates = dict(conn.execute(
+        "SELECT tournament_id, tournament_date FROM tournaments WHERE season_id = ?", (season_id,)
+    ).fetchall())
+    t_start = start[timeline["t"].to_numpy()]
+    timeline_rows = [
+        {
+            "TournamentDate": dates.get(int(t_ids[t])),
+            "Level": int(lv),
+            "SmallBlind": None if pd.isna(sb) else int(sb),
+            "BigBlind": None if pd.isna(bb) else int(bb),
+            "ScheduledMinutes": None if pd.isna(sch) else int(sch),
+            "StartMinute": round(float((s - ts) / 60.0), 1),
+            "EndMinute": round(float((e - ts) / 60.0), 1),
+            "Minutes": round(float(m), 1),
+        }
+        for t, lv, s, e, m, sb, bb, sch, ts in zip(
+            timeline["t"], timeline["level"], timeline["start"], timeline["end"], timeline["minutes"],
+            timeline["small"], timeline["big"], timeline["scheduled"], t_start,
+        )
+    ]
+    timeline_rows.sort(key=lambda r: (r["TournamentDate"] or "", r["Level"]))
+
+    return {
+        "Levels": [int(x) for x in levels],
+        "Timeline": timeline_rows,
+        "ByLevel": by_level,
+        "ByPlayer": by_player,
+    }
+
+
+def main() -> int:
+    conn = sqlite3.connect(str(DB_PATH))
+    try:
+        section = blind_levels(conn)
+    finally:
+        conn.close()
+    print(f"Blind levels, {SEASON_ID}")
+    print(f"  {'level':>5} {'tourn':>5} {'avg min':>8} {'elims':>6} {'elims/h':>8}")
+    for r in section["ByLevel"]:
+        avg = "" if r["AvgMinutes"] is None else f"{r['AvgMinutes']:8.1f}"
+        rate = "" if r["EliminationsPerHour"] is None else f"{r['EliminationsPerHour']:8.2f}"
+        print(f"  {r['Level']:>5} {r['Tournaments']:>5} {avg:>8} {r['Eliminations']:>6} {rate:>8}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
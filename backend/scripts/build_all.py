@@ -4,12 +4,17 @@ from zoneinfo import ZoneInfo
 import json
 import math
 import os
+import numpy as np
 import pandas as pd
 
+from event_reader import iter_event_frames
+from log_fields import parse_notes
+from scoring_rules import BUILTIN_RULES
 from source_files import latest_log_filename
 
 SEASON_ID = os.environ.get("SEASON_ID", "spring_2026")
 SEASON_NAME = os.environ.get("SEASON_NAME", "Spring Season 2026")
+FIELD_SIZE_RULE = BUILTIN_RULES[("field_size", 1)]
 
 def payouts_multiple_of_20(pot: float, percents: list[float], increment: int = 20) -> list[int]:
     raw_amounts = [pot * p for p in percents]
@@ -28,26 +33,6 @@ def payouts_multiple_of_20(pot: float, percents: list[float], increment: int = 2
     return rounded
 
 
-def parse_dt_series(s: pd.Series) -> pd.Series:
-    """
-    Warning-free datetime parsing for strings that may:
-    - have or not have seconds
-    - have AM/PM attached (e.g., '7:05PM')
-    """
-    s = (
-        s.astype("string")
-         .str.strip()
-         .str.replace(r"\s+", " ", regex=True)
-         .str.replace(r"(?i)(\d)(am|pm)$", r"\1 \2", regex=True)
-         .str.upper()
-    )
-
-    dt_no_sec = pd.to_datetime(s, format="%m/%d/%y %I:%M %p", errors="coerce")
-    dt_with_sec = pd.to_datetime(s, format="%m/%d/%y %I:%M:%S %p", errors="coerce")
-
-    return dt_no_sec.fillna(dt_with_sec)
-
-
 # --- project paths ---
 PROJECT_ROOT = Path(__file__).resolve().parents[2]
 
@@ -91,7 +76,57 @@ def format_int_cols_for_html(df: pd.DataFrame, cols: list[str]) -> pd.DataFrame:
 
 LAST_SOURCE_FILE = "N/A"
 
-def load_raw_events(data_dir: Path) -> tuple[pd.DataFrame, str]:
+# event_reader columns -> the CSV-style names build_tables() was written against
+RAW_COLUMN_NAMES = {
+    "source_file": "SourceFile",
+    "tournament_date": "TournamentDate",
+    "event_ts": "Time",
+    "event_type": "Event",
+    "player_name": "Players",
+    "eliminator_player_name": "Eliminated By",
+    "level": "Level",
+    "amount_cents": "AmountCents",
+    "event_epoch": "EventEpoch",
+}
+# Raw_LogEvents.csv: the log's own columns, verbatim, + SourceFile / TournamentDate
+RAW_LOG_COLUMNS = ["Time", "Event", "Level", "Players", "Eliminated By",
+                   "Chips", "Amount", "Table", "Position", "SourceFile", "TournamentDate"]
+RAW_CHUNK_SIZE = 50_000
+
+def is_build_event(event: pd.Series) -> pd.Series:
+    """The rows build_tables() reads: BuyIn, Eliminated and TOURNAMENT START / END."""
+    clean = event.astype(str).str.upper().str.strip()
+    return clean.isin(["BUYIN", "ELIMINATED"]) | clean.str.contains("TOURNAMENT", na=False)
+
+
+def raw_log_frame(chunk: pd.DataFrame) -> pd.DataFrame:
+    """
+    A normalized event chunk as Raw_LogEvents rows: Level / Chips / Amount /
+    Table / Position as logged (from the notes ingest keeps verbatim).
+    """
+    extras = pd.DataFrame.from_records(
+        chunk["notes"].map(parse_notes).tolist(),
+        columns=["Level", "Chips", "Amount", "Table", "Position"],
+        index=chunk.index,
+    )
+    out = extras.assign(
+        Time=chunk["event_ts"],
+        Event=chunk["event_type"],
+        Players=chunk["player_name"],
+        SourceFile=chunk["source_file"],
+        TournamentDate=chunk["tournament_date"],
+    )
+    out["Eliminated By"] = chunk["eliminator_player_name"]
+    return out[RAW_LOG_COLUMNS]
+
+
+def load_raw_events(data_dir: Path, raw_csv: Path | None = None) -> tuple[pd.DataFrame, str]:
+    """
+    The season's BuyIn / Eliminated / TOURNAMENT events, read chunk by chunk.
+    Every event is appended to raw_csv (Raw_LogEvents.csv) as its chunk
+    arrives; only the rows build_tables() uses are kept, so memory grows with
+    buy-ins and eliminations, not with the blinds / chip rows of the logs.
+    """
     # Grab all CSVs
     files = sorted(data_dir.glob("*.csv"))
 
@@ -110,17 +145,17 @@ def load_raw_events(data_dir: Path) -> tuple[pd.DataFrame, str]:
     global LAST_SOURCE_FILE
     LAST_SOURCE_FILE = files[-1].name
 
-    dfs = []
-    for f in files:
-        date_text = f.stem.split()[0]
-        tournament_date = pd.to_datetime(date_text, format="%m.%d.%y", errors="coerce").date()
-
-        df = pd.read_csv(f)
-        df["SourceFile"] = f.name
-        df["TournamentDate"] = tournament_date
-        dfs.append(df)
-
-    raw = pd.concat(dfs, ignore_index=True)
+    # Stream normalized events (event_epoch already resolved, see event_times.py)
+    # in fixed-size chunks: each one goes to raw_csv whole, then only the
+    # columns and rows build_tables() reads are kept.
+    kept = []
+    for i, chunk in enumerate(iter_event_frames(files, chunksize=RAW_CHUNK_SIZE)):
+        if raw_csv is not None:
+            raw_log_frame(chunk).to_csv(raw_csv, mode="w" if i == 0 else "a", header=i == 0, index=False)
+        chunk = chunk[list(RAW_COLUMN_NAMES)].rename(columns=RAW_COLUMN_NAMES)
+        kept.append(chunk[is_build_event(chunk["Event"])])
+    raw = pd.concat(kept, ignore_index=True)
+    raw["TournamentDate"] = pd.to_datetime(raw["TournamentDate"], format="%Y-%m-%d").dt.date
     return raw, LAST_SOURCE_FILE
 
 def build_tables(raw: pd.DataFrame) -> dict[str, pd.DataFrame]:
@@ -128,14 +163,7 @@ def build_tables(raw: pd.DataFrame) -> dict[str, pd.DataFrame]:
     buyins = raw.loc[raw["Event"].astype(str).str.upper().str.strip() == "BUYIN"].copy()
 
     if not buyins.empty:
-        buyins["BuyInAmount"] = (
-            buyins["Amount"]
-            .astype(str)
-            .str.replace("$", "", regex=False)
-            .str.split()
-            .str[0]
-        )
-        buyins["BuyInAmount"] = pd.to_numeric(buyins["BuyInAmount"], errors="coerce")
+        buyins["BuyInAmount"] = pd.to_numeric(buyins["AmountCents"], errors="coerce") / 100
         buyins = buyins.rename(columns={"Players": "Player"})
         buyins = buyins[["SourceFile", "TournamentDate", "Player", "BuyInAmount", "Time"]].rename(
             columns={"Time": "BuyInTime"}
@@ -171,12 +199,12 @@ def build_tables(raw: pd.DataFrame) -> dict[str, pd.DataFrame]:
         start = (
             trows[trows["EventClean"].str.contains("START", na=False)]
             .groupby("SourceFile", as_index=False)
-            .agg(StartTime=("Time", "min"))
+            .agg(StartTime=("Time", "min"), StartEpoch=("EventEpoch", "min"))
         )
         end = (
             trows[trows["EventClean"].str.contains("END", na=False)]
             .groupby("SourceFile", as_index=False)
-            .agg(EndTime=("Time", "max"))
+            .agg(EndTime=("Time", "max"), EndEpoch=("EventEpoch", "max"))
         )
         weekly_tournaments = pd.merge(start, end, on="SourceFile", how="left")
         weekly_tournaments = pd.merge(
@@ -189,6 +217,8 @@ def build_tables(raw: pd.DataFrame) -> dict[str, pd.DataFrame]:
         weekly_tournaments = weekly_summary[["SourceFile", "TournamentDate"]].copy()
         weekly_tournaments["StartTime"] = pd.NaT
         weekly_tournaments["EndTime"] = pd.NaT
+        weekly_tournaments["StartEpoch"] = pd.NA
+        weekly_tournaments["EndEpoch"] = pd.NA
 
     # ---- Eliminations ----
     elims = raw.loc[raw["Event"].astype(str).str.upper().str.strip() == "ELIMINATED"].copy()
@@ -199,13 +229,14 @@ def build_tables(raw: pd.DataFrame) -> dict[str, pd.DataFrame]:
                 "Players": "EliminatedPlayer",        # busted player
                 "Eliminated By": "EliminatorPlayer",  # who busted them
                 "Time": "EliminationTime",
+                "EventEpoch": "EliminationEpoch",
             }
         )
 
-        # build a sortable datetime for elimination order
-        elims["EliminationDT"] = parse_dt_series(elims["TournamentDate"].astype(str) + " " + elims["EliminationTime"].astype(str))
+        # sortable datetime for elimination order (from the precomputed epoch)
+        elims["EliminationDT"] = pd.to_datetime(elims["EliminationEpoch"], unit="s")
 
-        elims = elims[["SourceFile", "TournamentDate", "EliminationTime", "EliminationDT",
+        elims = elims[["SourceFile", "TournamentDate", "EliminationTime", "EliminationDT", "EliminationEpoch",
                     "EliminatedPlayer", "EliminatorPlayer"]]
 
         # VERY IMPORTANT: one row per eliminated player per tournament (prevents duplicates blowing up places)
@@ -213,7 +244,7 @@ def build_tables(raw: pd.DataFrame) -> dict[str, pd.DataFrame]:
         elims = elims.drop_duplicates(subset=["SourceFile", "TournamentDate", "EliminatedPlayer"], keep="first")
     else:
         elims = pd.DataFrame(
-            columns=["SourceFile", "TournamentDate", "EliminationTime", "EliminationDT",
+            columns=["SourceFile", "TournamentDate", "EliminationTime", "EliminationDT", "EliminationEpoch",
                     "EliminatedPlayer", "EliminatorPlayer"]
         )
 
@@ -263,9 +294,9 @@ def build_tables(raw: pd.DataFrame) -> dict[str, pd.DataFrame]:
 
     # ---- Weekly points (0.5 per place; winner gets PlayersCount*0.5) ----
     if not finish_positions.empty:
-        finish_positions["Points"] = (finish_positions["PlayersCount"] - finish_positions["Place"] + 1) * 0.5
+        finish_positions["Points"] = FIELD_SIZE_RULE.points(finish_positions["Place"], finish_positions["PlayersCount"])
     if not winners.empty:
-        winners["Points"] = winners["PlayersCount"] * 0.5
+        winners["Points"] = FIELD_SIZE_RULE.points(np.ones(len(winners)), winners["PlayersCount"])
 
     # ---- Weekly points (0.5 per place; winner gets PlayersCount*0.5) ----
     finish_points = finish_positions[["SourceFile", "TournamentDate", "Player", "Points"]].copy()
@@ -453,35 +484,25 @@ def build_tables(raw: pd.DataFrame) -> dict[str, pd.DataFrame]:
 
     # We can only compute if TOURNAMENT start/end exists
     wt = weekly_tournaments.copy()
-    if ("StartTime" in wt.columns) and ("EndTime" in wt.columns) and (not wt.empty):
-        wt["TournamentDate"] = parse_dt_series(wt["TournamentDate"]).dt.date
-        wt["StartDT"] = parse_dt_series(wt["TournamentDate"].astype(str) + " " + wt["StartTime"].astype(str))
-
-
-        wt["EndDT"] = parse_dt_series(wt["TournamentDate"].astype(str) + " " + wt["EndTime"].astype(str))
-
-        # If the tournament crosses midnight, EndDT will parse earlier than StartDT
-        mask = wt["EndDT"].notna() & wt["StartDT"].notna() & (wt["EndDT"] < wt["StartDT"])
-        wt.loc[mask, "EndDT"] = wt.loc[mask, "EndDT"] + pd.Timedelta(days=1)
-
-        wt["TournamentMinutes"] = (wt["EndDT"] - wt["StartDT"]).dt.total_seconds() / 60.0
+    if ("StartEpoch" in wt.columns) and ("EndEpoch" in wt.columns) and (not wt.empty):
+        # epochs are already rolled past midnight, so this is a plain subtraction
+        wt["TournamentMinutes"] = (
+            pd.to_numeric(wt["EndEpoch"], errors="coerce") - pd.to_numeric(wt["StartEpoch"], errors="coerce")
+        ) / 60.0
 
         elim_surv = pd.DataFrame(columns=["TournamentDate", "Player", "MinutesSurvived", "TournamentMinutes"])
         if not elims.empty:
             e = elims.copy()
-            e["TournamentDate"] = parse_dt_series(e["TournamentDate"]).dt.date
-            e["EliminationDT"] = parse_dt_series(
-                e["TournamentDate"].astype(str) + " " + e["EliminationTime"].astype(str))
-            
-            e = e.merge(wt[["SourceFile", "TournamentDate", "StartDT", "TournamentMinutes"]], on=["SourceFile", "TournamentDate"], how="left")
-            e["MinutesSurvived"] = (e["EliminationDT"] - e["StartDT"]).dt.total_seconds() / 60.0
+            e = e.merge(wt[["SourceFile", "TournamentDate", "StartEpoch", "TournamentMinutes"]], on=["SourceFile", "TournamentDate"], how="left")
+            e["MinutesSurvived"] = (
+                pd.to_numeric(e["EliminationEpoch"], errors="coerce") - pd.to_numeric(e["StartEpoch"], errors="coerce")
+            ) / 60.0
             e["Player"] = e["EliminatedPlayer"]
             elim_surv = e[["TournamentDate", "Player", "MinutesSurvived", "TournamentMinutes"]].copy()
 
         win_surv = pd.DataFrame(columns=["TournamentDate", "Player", "MinutesSurvived", "TournamentMinutes"])
         if not winners.empty:
             w = winners.copy()
-            w["TournamentDate"] = parse_dt_series(w["TournamentDate"]).dt.date
             w = w.merge(wt[["SourceFile", "TournamentDate", "TournamentMinutes"]], on=["SourceFile", "TournamentDate"], how="left")
             w["MinutesSurvived"] = w["TournamentMinutes"]
             win_surv = w[["TournamentDate", "Player", "MinutesSurvived", "TournamentMinutes"]].copy()
@@ -517,7 +538,6 @@ def build_tables(raw: pd.DataFrame) -> dict[str, pd.DataFrame]:
     )
 
     return {
-        "Raw_LogEvents": raw,
         "Buyins": buyins,
         "TournamentPlayers": tournament_players,
         "WeeklySummary": weekly_summary,
@@ -729,7 +749,6 @@ def write_season_json(tables: dict, out_path: Path):
     """
 
     # --- Extract tables from build_tables() ---
-    raw = tables["Raw_LogEvents"]
     season_totals = tables["SeasonTotals"]
     chip_and_chair = tables["ChipAndChair"]
     weekly_points = tables["WeeklyPoints"]
@@ -961,7 +980,8 @@ def write_outputs(tables: dict, last_source_file: str) -> None:
 
 
 def main():
-    raw, last_source_file = load_raw_events(DATA_DIR)
+    TABLES_DIR.mkdir(parents=True, exist_ok=True)
+    raw, last_source_file = load_raw_events(DATA_DIR, raw_csv=TABLES_DIR / "Raw_LogEvents.csv")
     tables = build_tables(raw)
 
     write_season_json(tables, JSON_OUTPUT_PATH)
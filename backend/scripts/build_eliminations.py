@@ -1,19 +1,31 @@
+import os
 import sqlite3
 
-DB_PATH = "backend/db/pokerleague.sqlite"
+from dirty_tournaments import qmarks
 
-def main():
-    conn = sqlite3.connect(DB_PATH)
+DB_PATH = os.environ.get("POKERLEAGUE_DB", "backend/db/pokerleague.sqlite")
+
+def run(conn, season_id=None, tournament_ids=None):
+    """tournament_ids: rebuild just these tournaments (None = everything)."""
     cur = conn.cursor()
 
+    if tournament_ids is None:
+        scope_sql, params = "", ()
+    else:
+        params = tuple(sorted(tournament_ids))
+        scope_sql = f"AND r.tournament_id IN ({qmarks(params)})"
+
     # Rebuild eliminations deterministically from raw_log_events
-    cur.execute("DELETE FROM eliminations;")
+    if tournament_ids is None:
+        cur.execute("DELETE FROM eliminations;")
+    else:
+        cur.execute(f"DELETE FROM eliminations WHERE tournament_id IN ({qmarks(params)})", params)
 
     # For 'Eliminated' events in raw_log_events:
     # - player_name is the eliminated player (victim)
     # - eliminator_player_name is the killer
     # - eliminated_player_name is often blank, so we fall back to player_name.
-    cur.execute("""
+    cur.execute(f"""
         INSERT INTO eliminations (
             tournament_id,
             event_ts,
@@ -41,24 +53,31 @@ def main():
         AND r.eliminator_player_name IS NOT NULL
         AND r.eliminator_player_name <> ''
         AND COALESCE(NULLIF(r.eliminated_player_name, ''), r.player_name) IS NOT NULL
-        AND COALESCE(NULLIF(r.eliminated_player_name, ''), r.player_name) <> '';
-    """)
-
-    conn.commit()
+        AND COALESCE(NULLIF(r.eliminated_player_name, ''), r.player_name) <> ''
+        {scope_sql};
+    """, params)
 
     # quick sanity
-    rows = cur.execute("""
+    rows = cur.execute(f"""
         SELECT tournament_id, COUNT(*) AS elim_events
-        FROM eliminations
+        FROM eliminations r
+        WHERE 1 = 1 {scope_sql}
         GROUP BY tournament_id
         ORDER BY tournament_id;
-    """).fetchall()
+    """, params).fetchall()
 
     print("✅ eliminations rebuilt:")
     for tid, n in rows:
         print(f"  tournament_id={tid} rows={n}")
 
-    conn.close()
+
+def main():
+    conn = sqlite3.connect(DB_PATH)
+    try:
+        run(conn)
+        conn.commit()
+    finally:
+        conn.close()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -2,13 +2,13 @@ import os
 import sqlite3
 from pathlib import Path
 
-DB_PATH = Path("backend/db/pokerleague.sqlite")
+DB_PATH = Path(os.environ.get("POKERLEAGUE_DB", "backend/db/pokerleague.sqlite"))
 
 
 SEASON_ID = os.environ.get("SEASON_ID", "spring_2026")
 
-def main():
-    con = sqlite3.connect(DB_PATH)
+def run(con, season_id=None):
+    season_id = season_id or SEASON_ID
     cur = con.cursor()
 
     # Create table if missing
@@ -22,7 +22,9 @@ def main():
     );
     """)
 
-    # Build stats from weekly_points
+    # Build stats from weekly_points (from scratch: the season_aggregates
+    # triggers keep it current between builds)
+    cur.execute("DELETE FROM player_season_stats WHERE season_id = ?", (season_id,))
     cur.execute("""
     INSERT INTO player_season_stats (season_id, player_id, wins, avg_finish)
     SELECT
@@ -37,9 +39,7 @@ def main():
     ON CONFLICT(season_id, player_id) DO UPDATE SET
       wins = excluded.wins,
       avg_finish = excluded.avg_finish;
-    """, (SEASON_ID,))
-
-    con.commit()
+    """, (season_id,))
 
     # Print top 10 as a quick check
     rows = cur.execute("""
@@ -49,11 +49,19 @@ def main():
     WHERE s.season_id = ?
     ORDER BY s.wins DESC, s.avg_finish ASC, p.player_name ASC
     LIMIT 10;
-    """, (SEASON_ID,)).fetchall()
+    """, (season_id,)).fetchall()
 
     print("✅ player_season_stats updated")
 
-    con.close()
+
+def main():
+    con = sqlite3.connect(DB_PATH)
+    try:
+        run(con)
+        con.commit()
+    finally:
+        con.close()
+
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -3,26 +3,24 @@
 Tiny orchestration runner:
 1) build weekly payouts
 2) export season json
-"""
 
-import subprocess
-import sys
+Runs both stages in-process via run_pipeline (one connection, one commit
+per stage).
+"""
 
-SCRIPTS = [
-    "backend/scripts/build_weekly_payouts.py",
-    "backend/scripts/export_season_json.py",
-]
+from db_utils import connect
+from run_pipeline import DB_PATH, SEASON_ID, run_pipeline
 
-def run(cmd: list[str]) -> None:
-    print(f"\n==> {' '.join(cmd)}")
-    subprocess.run(cmd, check=True)
+STAGES = ["payouts", "export"]
 
 def main() -> int:
-    py = sys.executable  # uses the same python you ran this with
-    for script in SCRIPTS:
-        run([py, script])
+    conn = connect(DB_PATH, write=True)
+    try:
+        run_pipeline(conn, SEASON_ID, only=STAGES)
+    finally:
+        conn.close()
     print("\n✅ Done: payouts rebuilt + season JSON exported")
     return 0
 
 if __name__ == "__main__":
-    raise SystemExit(main())
\ No newline at end of file
+    raise SystemExit(main())
@@ -2,70 +2,161 @@ import os
 import sqlite3
 from pathlib import Path
 
+import numpy as np
+
 DB_PATH = Path(os.environ.get("POKERLEAGUE_DB", "backend/db/pokerleague.sqlite"))
 DB_PATH.parent.mkdir(parents=True, exist_ok=True)
 
 SEASON_ID = os.environ.get("SEASON_ID", "spring_2026")
-DROPS = 2
-
-def main():
-    conn = sqlite3.connect(str(DB_PATH))
+DROPS = 2  # default K; per season in seasons.drop_weeks
+
+
+def season_drops(conn, season_id) -> int:
+    """K lowest weeks dropped for this season (DROPS if the season has no setting)."""
+    try:
+        row = conn.execute("SELECT drop_weeks FROM seasons WHERE season_id = ?", (season_id,)).fetchone()
+    except sqlite3.OperationalError:  # DB from before seasons.drop_weeks
+        row = None
+    return DROPS if row is None or row[0] is None else int(row[0])
+
+
+def points_matrix(conn, season_id):
+    """
+    Season points as a dense player x week matrix, pulled in one pass.
+
+    Rows are every player (player_id order), columns the season's
+    tournaments in date order; absences and NULL points are 0.0 and
+    `played` marks the cells that had points.
+    Returns (player_ids, tournament_ids, points, played).
+    """
+    tournament_ids = np.array([r[0] for r in conn.execute(
+        "SELECT tournament_id FROM tournaments WHERE season_id = ? ORDER BY tournament_date",
+        (season_id,),
+    )], dtype=np.int64)
+    player_ids = np.array([r[0] for r in conn.execute(
+        "SELECT player_id FROM players ORDER BY player_id"
+    )], dtype=np.int64)
+
+    points = np.zeros((len(player_ids), len(tournament_ids)))
+    played = np.zeros(points.shape, dtype=bool)
+
+    rows = conn.execute(
+        """
+        SELECT player_id, tournament_id, points
+        FROM weekly_points
+        WHERE season_id = ? AND points IS NOT NULL
+        """,
+        (season_id,),
+    ).fetchall()
+    if rows and len(player_ids) and len(tournament_ids):
+        pid, tid, pts = (np.array(c) for c in zip(*rows))
+        # ids -> matrix indexes (player_ids is sorted; tournaments are in date order)
+        t_order = np.argsort(tournament_ids)
+        pi = np.minimum(np.searchsorted(player_ids, pid), len(player_ids) - 1)
+        ti = t_order[np.minimum(np.searchsorted(tournament_ids, tid, sorter=t_order), len(t_order) - 1)]
+        known = (player_ids[pi] == pid) & (tournament_ids[ti] == tid)
+        points[pi[known], ti[known]] = pts[known].astype(float)
+        played[pi[known], ti[known]] = True
+
+    return player_ids, tournament_ids, points, played
+
+
+def drop_k_sums(points: np.ndarray, k: int) -> np.ndarray:
+    """Row sums without each row's k lowest weeks (0 when there are <= k weeks)."""
+    n_players, n_weeks = points.shape
+    if n_weeks <= k:
+        return np.zeros(n_players)
+    if k <= 0:
+        return points.sum(axis=1)
+    return np.partition(points, k - 1, axis=1)[:, k:].sum(axis=1)
+
+
+def drop_k_table(points: np.ndarray) -> np.ndarray:
+    """
+    Drop-K sums for every K at once: column K = each row's sum without its
+    K lowest weeks, K = 0..weeks-1. Sorting each row ascending makes that
+    a suffix sum, i.e. a reversed cumsum.
+    """
+    ordered = np.sort(points, axis=1)
+    return np.cumsum(ordered[:, ::-1], axis=1)[:, ::-1]
+
+
+def drop_k_sensitivity(conn, season_id=None) -> dict:
+    """
+    Standings under every drop rule K = 0..weeks-1, for the players who
+    played. Ranks use the SeasonTotals order (drop-K points desc, total
+    desc, name asc); players are listed in the season's own-K order.
+    """
+    season_id = season_id or SEASON_ID
+    drops = season_drops(conn, season_id)
+    player_ids, _tournament_ids, points, played = points_matrix(conn, season_id)
+
+    keep = played.any(axis=1)
+    player_ids, points = player_ids[keep], points[keep]
+    n_players, n_weeks = points.shape
+    if not n_players or not n_weeks:
+        return {"K": [], "CurrentK": drops, "Players": []}
+
+    names = dict(conn.execute("SELECT player_id, player_name FROM players").fetchall())
+    names = np.array([names[int(pid)] for pid in player_ids], dtype=object)
+    by_k = np.round(drop_k_table(points), 2)
+    totals = by_k[:, 0]
+
+    # tie-break order (total desc, name asc), then a stable sort per K column
+    base = np.lexsort((names.astype(str), -totals))
+    order = base[np.argsort(-by_k[base], axis=0, kind="stable")]
+    ranks = np.empty_like(order)
+    np.put_along_axis(ranks, order, np.arange(1, n_players + 1)[:, None], axis=0)
+
+    current = min(drops, n_weeks - 1)
+    return {
+        "K": list(range(n_weeks)),
+        "CurrentK": drops,
+        "Players": [
+            {
+                "Player": names[i],
+                "PlayerID": int(player_ids[i]),
+                "Points": [float(x) for x in by_k[i]],
+                "Rank": [int(x) for x in ranks[i]],
+            }
+            for i in order[:, current]
+        ],
+    }
+
+
+def season_totals_rows(conn, season_id):
+    """
+    Full recompute of season_totals for one season:
+    (player_id, total, drop-K total, weeks_in_season, weeks_played) per player.
+    """
+    drops = season_drops(conn, season_id)
+    player_ids, tournament_ids, points, played = points_matrix(conn, season_id)
+
+    totals = points.sum(axis=1)
+    kept = drop_k_sums(points, drops)          # drop lowest K scores (including zeros for absences)
+    weeks_played = played.sum(axis=1)
+    return [
+        (int(pid), round(float(t), 2), round(float(d), 2), len(tournament_ids), int(w))
+        for pid, t, d, w in zip(player_ids, totals, kept, weeks_played)
+    ]
+
+
+def run(conn, season_id=None):
+    season_id = season_id or SEASON_ID
     cur = conn.cursor()
 
-    # Weeks in season
-    cur.execute("""
-        SELECT COUNT(*) FROM tournaments
-        WHERE season_id = ?
-    """, (SEASON_ID,))
-    weeks_in_season = int(cur.fetchone()[0])
-
-    # list of tournament_ids for the season
-    cur.execute("""
-        SELECT tournament_id
-        FROM tournaments
-        WHERE season_id = ?
-        ORDER BY tournament_date
-    """, (SEASON_ID,))
-    tournament_ids = [r[0] for r in cur.fetchall()]
-
-    # all players (roster for season would be better later; for now: all players table)
-    cur.execute("SELECT player_id FROM players")
-    player_ids = [r[0] for r in cur.fetchall()]
-
-    # wipe season totals
-    cur.execute("DELETE FROM season_totals WHERE season_id = ?", (SEASON_ID,))
-
-    # Build totals per player
-    for pid in player_ids:
-        week_points = []
-        weeks_played = 0
-
-        for tid in tournament_ids:
-            cur.execute("""
-                SELECT points
-                FROM weekly_points
-                WHERE season_id = ? AND tournament_id = ? AND player_id = ?
-            """, (SEASON_ID, tid, pid))
-            row = cur.fetchone()
-            pts = float(row[0]) if row and row[0] is not None else 0.0
-            week_points.append(pts)
-            if row and row[0] is not None:
-                weeks_played += 1
-
-        total = round(sum(week_points), 2)
-
-        # drop lowest DROPS scores (including zeros for absences)
-        sorted_pts = sorted(week_points)
-        kept = sorted_pts[DROPS:] if len(sorted_pts) > DROPS else []
-        drop2 = round(sum(kept), 2)
-
-        cur.execute("""
-            INSERT INTO season_totals
-              (season_id, player_id, season_points_total, season_points_drop2, weeks_in_season, weeks_played)
-            VALUES (?, ?, ?, ?, ?, ?)
-        """, (SEASON_ID, pid, total, drop2, weeks_in_season, weeks_played))
-
-    conn.commit()
+    drops = season_drops(conn, season_id)
+    totals_rows = season_totals_rows(conn, season_id)
+    weeks_in_season = totals_rows[0][3] if totals_rows else 0
+
+    # wipe season totals, then insert every player (from scratch: the
+    # season_aggregates triggers keep the table current between builds)
+    cur.execute("DELETE FROM season_totals WHERE season_id = ?", (season_id,))
+    cur.executemany("""
+        INSERT INTO season_totals
+          (season_id, player_id, season_points_total, season_points_drop2, weeks_in_season, weeks_played)
+        VALUES (?, ?, ?, ?, ?, ?)
+    """, [(season_id, *row) for row in totals_rows])
 
     # Show top 10 by drop2
     rows = cur.execute("""
@@ -75,11 +166,19 @@ def main():
         WHERE st.season_id = ?
         ORDER BY st.season_points_drop2 DESC, st.season_points_total DESC, p.player_name ASC
         LIMIT 10
-    """, (SEASON_ID,)).fetchall()
+    """, (season_id,)).fetchall()
 
-    print("✅ season_totals rebuilt (Drop-2 scoring)")
+    print(f"✅ season_totals rebuilt (Drop-{drops} scoring, {len(totals_rows)} players x {weeks_in_season} weeks)")
+
+
+def main():
+    conn = sqlite3.connect(str(DB_PATH))
+    try:
+        run(conn)
+        conn.commit()
+    finally:
+        conn.close()
 
-    conn.close()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
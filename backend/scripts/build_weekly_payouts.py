@@ -1,11 +1,34 @@
 # SPRING 2026 payout split: 45 / 35 / 20
 # Do not change mid-season.
-
+"""
+weekly_payouts from weekly_points finish places, table-driven.
+
+A season's PayoutPolicy says what every week pays: a regular week the
+ladder for its field size (the commissioner's PAYOUT_TABLE, else the pot
+split by PAYOUT_SPLIT in $20 steps), the Chip & A Chair week its fixed
+ladder, and the award week the season awards to the Drop-2 top N from
+season_totals (the SeasonAwards order: Drop-2, total, wins, name, desc).
+Ladders for every field size are computed once per policy and cached.
+
+One pass over the finish places builds every row and a single executemany
+INSERT writes them: a rebuild is the same four statements whether it
+covers one week or several seasons.
+
+Usage:
+  python backend/scripts/build_weekly_payouts.py
+  python backend/scripts/build_weekly_payouts.py --all-seasons
+"""
+
+import argparse
 import math
 import sqlite3
 import os
+from dataclasses import dataclass, field
+from functools import lru_cache
 from pathlib import Path
 
+from dirty_tournaments import qmarks
+
 DB_PATH = Path(os.environ.get("POKERLEAGUE_DB", "backend/db/pokerleague.sqlite"))
 DB_PATH.parent.mkdir(parents=True, exist_ok=True)
 
@@ -13,8 +36,8 @@ DB_PATH.parent.mkdir(parents=True, exist_ok=True)
 SEASON_ID = os.environ.get("SEASON_ID", "spring_2026")
 
 # Match your build_all.py PAYOUT_SPLIT.
-# Example: 50/30/20 — change if yours is different.
-PAYOUT_SPLIT = [0.50, 0.30, 0.20]
+# Pays field sizes PAYOUT_TABLE doesn't list.
+PAYOUT_SPLIT = [0.45, 0.35, 0.20]
 
 # Commissioner payout table for THIS season (fixed amounts by field size).
 # Values are [1st, 2nd, 3rd] and must sum to (players * BUY_IN_PER_PLAYER).
@@ -28,8 +51,15 @@ PAYOUT_TABLE = {
     10: [100, 60, 40],
 }
 
+# Week 11 (Chip & A Chair) pays the Top 6 a fixed ladder.
+CHIP_AND_CHAIR_PAYOUTS = [300, 260, 220, 160, 120, 60]
+
+# Week 10: season awards to the Top 3 by Drop-2 points.
+SEASON_AWARDS = [400, 250, 150]
+
 BUY_IN_PER_PLAYER = 20
 ROUND_TO = 20  # payouts must be multiples of $20
+MAX_FIELD = 64  # ladders precomputed for field sizes 1..MAX_FIELD
 
 
 def payouts_multiple_of_20(pot: float, percents: list[float], increment: int = 20) -> list[int]:
@@ -54,176 +84,197 @@ def payouts_multiple_of_20(pot: float, percents: list[float], increment: int = 2
     return rounded
 
 
-def main():
-    conn = sqlite3.connect(str(DB_PATH))
-    cur = conn.cursor()
+def _frozen_table(table: dict) -> tuple:
+    return tuple(sorted((int(n), tuple(amounts)) for n, amounts in table.items()))
+
+
+@dataclass(frozen=True)
+class PayoutPolicy:
+    """Everything a season pays out (hashable, so ladders cache per policy)."""
+    buy_in: int = BUY_IN_PER_PLAYER
+    round_to: int = ROUND_TO
+    split: tuple = tuple(PAYOUT_SPLIT)
+    table: tuple = field(default=_frozen_table(PAYOUT_TABLE))   # ((field size, ladder), ...)
+    award_week: int = 10
+    season_awards: tuple = tuple(SEASON_AWARDS)
+    chip_and_chair_week: int = 11
+    chip_and_chair: tuple = tuple(CHIP_AND_CHAIR_PAYOUTS)
+
+
+DEFAULT_PAYOUT_POLICY = PayoutPolicy()
+
+# season_id -> PayoutPolicy for seasons that pay differently
+SEASON_PAYOUT_POLICIES: dict[str, PayoutPolicy] = {}
+
+
+def payout_policy(season_id: str) -> PayoutPolicy:
+    return SEASON_PAYOUT_POLICIES.get(season_id, DEFAULT_PAYOUT_POLICY)
+
+
+@lru_cache(maxsize=None)
+def payout_ladders(policy: PayoutPolicy, max_field: int = MAX_FIELD) -> dict[int, tuple[int, ...]]:
+    """
+    Regular-week ladder for every field size 1..max_field: the policy's
+    table where it has one, else the pot split in round_to steps.
+    """
+    table = dict(policy.table)
+    return {
+        n: table.get(n) or tuple(payouts_multiple_of_20(n * policy.buy_in, list(policy.split), policy.round_to))
+        for n in range(1, max_field + 1)
+    }
+
+
+def payout_rows(weekly, standings, policies) -> list[list]:
+    """
+    All payout rows, one pass. weekly: (season_id, week_num, player_id) in
+    finish order per week; standings: (season_id, player_id, last_week) in
+    award order per season; policies: season_id -> PayoutPolicy.
+    Rows are [season_id, week_num, player_id, amount, payout_type, note].
+    """
+    by_week: dict[tuple, list[int]] = {}
+    for season_id, week_num, player_id in weekly:
+        by_week.setdefault((season_id, int(week_num)), []).append(int(player_id))
+
+    out = []
+    for (season_id, week_num), finishers in by_week.items():
+        policy = policies[season_id]
+        field_size = len(finishers)
+        if week_num == policy.chip_and_chair_week:
+            ladder = policy.chip_and_chair
+            if field_size < len(ladder):
+                # pay the places that exist, as a regular week does
+                print(f"⚠️  {season_id} week {week_num} has {field_size} finishers; "
+                      f"paying {field_size} of {len(ladder)} Chip & A Chair places")
+            payout_type, note = "chip_and_chair", "Chip & A Chair tournament payout"
+        else:
+            ladder = payout_ladders(policy, max(MAX_FIELD, field_size))[field_size]
+            payout_type, note = "weekly", f"Auto payout: pot=${field_size * policy.buy_in}"
+        out.extend(
+            [season_id, week_num, player_id, float(amount), payout_type, note]
+            for player_id, amount in zip(finishers, ladder)
+            if amount > 0
+        )
 
-    # 1) Pull weekly results (one row per player per week)
-    rows = cur.execute(
-        """
-        SELECT week_num, player_id, finish_place, points
+    awarded: dict[str, int] = {}
+    for season_id, player_id, last_week in standings:
+        policy = policies[season_id]
+        place = awarded.get(season_id, 0)
+        if place >= len(policy.season_awards) or (last_week or 0) < policy.award_week:
+            continue
+        awarded[season_id] = place + 1
+        out.append([
+            season_id, policy.award_week, int(player_id), float(policy.season_awards[place]),
+            "season_award", f"Season awards (Top {len(policy.season_awards)})",
+        ])
+    return out
+
+
+def rebuild_payouts(conn, season_ids, tournament_ids=None) -> int:
+    """
+    Rebuild weekly_payouts for season_ids in four statements: read finish
+    places, read award standings, delete, executemany insert. tournament_ids:
+    only the weeks of these tournaments (season awards are always redone).
+    Returns the number of rows written.
+    """
+    season_ids = sorted(set(season_ids))
+    if not season_ids:
+        return 0
+    policies = {s: payout_policy(s) for s in season_ids}
+    seasons_sql = f"season_id IN ({qmarks(season_ids)})"
+    if tournament_ids is None:
+        scope_sql, scope = "", ()
+    else:
+        scope = tuple(sorted(tournament_ids))
+        scope_sql = f"AND tournament_id IN ({qmarks(scope)})"
+
+    weekly = conn.execute(
+        f"""
+        SELECT season_id, week_num, player_id
         FROM weekly_points
-        WHERE season_id = ?
-        ORDER BY week_num ASC, finish_place ASC
+        WHERE {seasons_sql}
+          AND finish_place IS NOT NULL
+          {scope_sql}
+        ORDER BY season_id, week_num, finish_place
         """,
-        (SEASON_ID,),
+        (*season_ids, *scope),
     ).fetchall()
 
-    # Group by week_num
-    by_week = {}
-
-    for week_num, player_id, finish_place, points in rows:
-        # Skip incomplete rows (finish_place not yet computed)
-        if finish_place is None:
-            continue
-
-        by_week.setdefault(int(week_num), []).append(
-            {
-                "player_id": int(player_id),
-                "finish_place": int(finish_place),
-                "points": float(points or 0),
-            }
+    # top N by the SeasonAwards order, with the season's last week played
+    standings = conn.execute(
+        f"""
+        SELECT season_id, player_id, last_week
+        FROM (
+            SELECT st.season_id, st.player_id,
+                   (SELECT MAX(w.week_num) FROM weekly_points w WHERE w.season_id = st.season_id) AS last_week,
+                   ROW_NUMBER() OVER (
+                       PARTITION BY st.season_id
+                       ORDER BY st.season_points_drop2 DESC, st.season_points_total DESC,
+                                COALESCE(pss.wins, 0) DESC, p.player_name DESC
+                   ) AS award_rank
+            FROM season_totals st
+            JOIN players p ON p.player_id = st.player_id
+            LEFT JOIN player_season_stats pss
+              ON pss.season_id = st.season_id AND pss.player_id = st.player_id
+            WHERE st.{seasons_sql}
         )
+        WHERE award_rank <= ?
+        ORDER BY season_id, award_rank
+        """,
+        (*season_ids, max(len(p.season_awards) for p in policies.values())),
+    ).fetchall()
 
-    # 2) Wipe existing payouts for this season (rebuild-from-truth)
-    cur.execute("DELETE FROM weekly_payouts WHERE season_id = ?", (SEASON_ID,))
-
-    # 3) Compute + insert payouts per week
-    for week_num in sorted(by_week.keys()):
-        grp = by_week[week_num]
-        player_count = len(grp)  # should already be unique per player/week
-        pot = player_count * BUY_IN_PER_PLAYER
-
-        # Week 11 (Chip & A Chair) pays Top 6 by finish_place
-        if week_num == 11:
-            payout_amounts = [300, 260, 220, 160, 120, 60]
-            topN = sorted(grp, key=lambda r: r["finish_place"])[:6]
-            payout_type = "chip_and_chair"
-            note = f"Chip & A Chair payout: pot=${pot} + season_pool"
-        else:
-            # Regular weeks pay Top 3 by finish_place
-            payout_amounts = PAYOUT_TABLE.get(player_count)
-            if payout_amounts is None:
-                raise ValueError(f"No payout rule defined for {player_count} players")
-            topN = sorted(grp, key=lambda r: r["finish_place"])[:3]
-            payout_type = "weekly"
-            note = f"Auto payout: pot=${pot}"
-
-        payouts = PAYOUT_TABLE.get(player_count)
-
-        if payouts is None:
-            raise ValueError(f"No payout rule defined for {player_count} players")
-
-        for i, r in enumerate(topN):
-            amount = float(payout_amounts[i]) if i < len(payout_amounts) else 0.0
-            if amount <= 0:
-                continue
-
-            cur.execute(
-                """
-                INSERT INTO weekly_payouts
-                    (season_id, week_num, player_id, amount, payout_type, note)
-                VALUES (?, ?, ?, ?, ?, ?)
-                """,
-                (
-                    SEASON_ID,
-                    week_num,
-                    r["player_id"],
-                    amount,
-                    payout_type,
-                    note,
-                ),
-            )
-
-    
-    # ----------------------------
-    # Season Awards (Top 3) - Week 10 (fixed amounts for this season)
-    # ----------------------------
-    # Wipe any prior season_award rows so rebuilds are idempotent
-    cur.execute("""
-        DELETE FROM weekly_payouts
-        WHERE season_id = ?
-          AND week_num = 10
-          AND payout_type = 'season_award'
-    """, (SEASON_ID,))
-
-    season_awards = [
-        ("Bill B", 400.0),
-        ("Steve C", 250.0),
-        ("Todd L", 150.0),
-    ]
-
-    for player_name, amount in season_awards:
-        row = cur.execute(
-            "SELECT player_id FROM players WHERE player_name = ?",
-            (player_name,)
-        ).fetchone()
-        if not row:
-            raise ValueError(f"Season award player not found: {player_name}")
-        player_id = int(row[0])
-
-        cur.execute(
-            """
-            INSERT INTO weekly_payouts (season_id, week_num, player_id, amount, payout_type, note)
-            VALUES (?, ?, ?, ?, ?, ?)
+    rows = payout_rows(weekly, standings, policies)
+
+    if tournament_ids is None:
+        conn.execute(f"DELETE FROM weekly_payouts WHERE {seasons_sql}", season_ids)
+    else:
+        conn.execute(
+            f"""
+            DELETE FROM weekly_payouts
+            WHERE {seasons_sql}
+              AND (payout_type = 'season_award'
+                   OR week_num IN (SELECT wp.week_num FROM weekly_points wp
+                                   WHERE wp.season_id = weekly_payouts.season_id {scope_sql}))
             """,
-            (SEASON_ID, 10, player_id, float(amount), "season_award", "Season awards (Top 3)"),
+            (*season_ids, *scope),
         )
+    conn.executemany(
+        """
+        INSERT INTO weekly_payouts (season_id, week_num, player_id, amount, payout_type, note)
+        VALUES (?, ?, ?, ?, ?, ?)
+        """,
+        rows,
+    )
+    return len(rows)
 
-    # ----------------------------
-    # Chip & A Chair Tournament Payouts - Week 11 (Top 6 by finish_place)
-    # ----------------------------
-    # Only run if Week 11 exists for this season (prevents builds from failing before Week 11 happens)
-    week11_exists = cur.execute("""
-        SELECT 1
-        FROM weekly_points
-        WHERE season_id = ? AND week_num = 11
-        LIMIT 1
-    """, (SEASON_ID,)).fetchone()
 
-    if week11_exists:
-        # Wipe any prior chip_and_chair rows so rebuilds are idempotent
-        cur.execute("""
-            DELETE FROM weekly_payouts
-            WHERE season_id = ?
-              AND week_num = 11
-              AND payout_type = 'chip_and_chair'
-        """, (SEASON_ID,))
-
-        chip_and_chair_amounts = [300.0, 260.0, 220.0, 160.0, 120.0, 60.0]
-
-        # Get top 6 finishers from Week 11 (finish_place 1..6)
-        top6 = cur.execute("""
-            SELECT player_id
-            FROM weekly_points
-            WHERE season_id = ? AND week_num = 11
-            ORDER BY finish_place ASC
-            LIMIT 6
-        """, (SEASON_ID,)).fetchall()
-
-        if len(top6) != 6:
-            raise ValueError(f"Week 11 exists but has {len(top6)} finishers; expected 6")
-
-        for i, (player_id,) in enumerate(top6):
-            cur.execute(
-                """
-                INSERT INTO weekly_payouts (season_id, week_num, player_id, amount, payout_type, note)
-                VALUES (?, ?, ?, ?, ?, ?)
-                """,
-                (
-                    SEASON_ID,
-                    11,
-                    int(player_id),
-                    float(chip_and_chair_amounts[i]),
-                    "chip_and_chair",
-                    "Chip & A Chair tournament payout",
-                ),
-            )
-
-    conn.commit()
-    conn.close()
-    print("✅ weekly_payouts rebuilt for", SEASON_ID)
+def run(conn, season_id=None, tournament_ids=None):
+    """
+    tournament_ids: rebuild just the weeks of these tournaments (None = whole
+    season). Season awards are always refreshed.
+    """
+    season_id = season_id or SEASON_ID
+    n = rebuild_payouts(conn, [season_id], tournament_ids)
+    print(f"✅ weekly_payouts rebuilt for {season_id} ({n} rows)")
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Rebuild weekly_payouts from weekly_points.")
+    ap.add_argument("--all-seasons", action="store_true")
+    args = ap.parse_args(argv)
+
+    conn = sqlite3.connect(str(DB_PATH))
+    try:
+        if args.all_seasons:
+            seasons = [r[0] for r in conn.execute("SELECT season_id FROM seasons ORDER BY season_id")]
+            n = rebuild_payouts(conn, seasons)
+            print(f"✅ weekly_payouts rebuilt for {', '.join(seasons)} ({n} rows)")
+        else:
+            run(conn)
+        conn.commit()
+    finally:
+        conn.close()
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -2,16 +2,28 @@ import os
 import sqlite3
 from pathlib import Path
 
-DB_PATH = Path("backend/db/pokerleague.sqlite")
+from dirty_tournaments import mark_dirty, qmarks
+from season_aggregates import bulk_writes
+
+DB_PATH = Path(os.environ.get("POKERLEAGUE_DB", "backend/db/pokerleague.sqlite"))
 
 SEASON_ID = os.environ.get("SEASON_ID", "spring_2026")
 
-def main():
-    conn = sqlite3.connect(DB_PATH)
-    cur = conn.cursor()
+def run(conn, season_id=None, tournament_ids=None):
+    """
+    tournament_ids: rebuild just these tournaments' rows (None = whole season).
+    week_num is re-derived for every tournament either way; rows whose week
+    shifted (an earlier date back-filled) are renumbered in place and their
+    tournaments marked dirty for the downstream stages. The season
+    aggregates are refreshed once at the end, not per row (bulk_writes).
+    """
+    season_id = season_id or SEASON_ID
+    with bulk_writes(conn, [season_id]):
+        _rebuild(conn, season_id, tournament_ids)
 
-    # wipe old derived rows for season (safe rerun)
-    cur.execute("DELETE FROM weekly_points WHERE season_id = ?", (SEASON_ID,))
+
+def _rebuild(conn, season_id, tournament_ids):
+    cur = conn.cursor()
 
     # Build a week_num mapping by tournament_date order
     cur.execute("""
@@ -19,71 +31,111 @@ def main():
         FROM tournaments
         WHERE season_id = ?
         ORDER BY tournament_date
-    """, (SEASON_ID,))
+    """, (season_id,))
     tournaments = cur.fetchall()
 
     week_map = {tid: i + 1 for i, (tid, _d) in enumerate(tournaments)}
-    date_map = {tid: d for tid, d in tournaments}
 
-    # Get distinct players per tournament from BuyIn events
-    cur.execute("""
-        SELECT DISTINCT r.tournament_id, TRIM(r.player_name) AS player_name
+    if tournament_ids is None:
+        # wipe old derived rows for season (safe rerun)
+        cur.execute("DELETE FROM weekly_points WHERE season_id = ?", (season_id,))
+        scope_sql, scope = "", ()
+    else:
+        scope = tuple(sorted(tournament_ids))
+        scope_sql = f"AND r.tournament_id IN ({qmarks(scope)})"
+
+        shifted = [
+            (week_map[tid], season_id, tid)
+            for tid, week_num in cur.execute(
+                "SELECT DISTINCT tournament_id, week_num FROM weekly_points WHERE season_id = ?",
+                (season_id,),
+            ).fetchall()
+            if tid in week_map and week_map[tid] != week_num and tid not in scope
+        ]
+        if shifted:
+            cur.executemany(
+                "UPDATE weekly_points SET week_num = ? WHERE season_id = ? AND tournament_id = ?",
+                shifted,
+            )
+            mark_dirty(conn, [tid for _w, _s, tid in shifted])
+
+        cur.execute(
+            f"DELETE FROM weekly_points WHERE season_id = ? AND tournament_id IN ({qmarks(scope)})",
+            (season_id, *scope),
+        )
+
+    # Distinct (tournament, player_key) per BuyIn event; player_key is
+    # TRIM(player_name), the same normalization as players.player_key
+    buyins_sql = f"""
+        SELECT DISTINCT r.tournament_id, TRIM(r.player_name) AS player_key
         FROM raw_log_events r
         JOIN tournaments t ON t.tournament_id = r.tournament_id
         WHERE t.season_id = ?
           AND LOWER(TRIM(r.event_type)) IN ('buyin', 'buy-in', 'buy in')
           AND r.player_name IS NOT NULL
           AND TRIM(r.player_name) <> ''
-        ORDER BY r.tournament_id, player_name
-    """, (SEASON_ID,))
-    buyins = cur.fetchall()
-
-    inserted = 0
-    for tournament_id, player_name in buyins:
-        # lookup player_id
-        cur.execute(
-            "SELECT player_id FROM players WHERE TRIM(player_name) = TRIM(?)",
-            (player_name,),
+          {scope_sql}
+    """
+
+    # 1) Auto-create missing players in one statement, in first-seen
+    #    (tournament, name) order so player_ids come out as they always have
+    cur.execute(f"""
+        INSERT OR IGNORE INTO players (player_name)
+        SELECT b.player_key
+        FROM ({buyins_sql}) b
+        WHERE NOT EXISTS (SELECT 1 FROM players p WHERE p.player_key = b.player_key)
+        GROUP BY b.player_key
+        ORDER BY MIN(b.tournament_id), b.player_key
+    """, (season_id, *scope))
+
+    # 2) week_num = tournament_date order within the season. Kept in a keyed
+    #    temp table: a window subquery in the join below gets no index and
+    #    is rescanned per buy-in.
+    cur.execute("""
+        CREATE TEMP TABLE IF NOT EXISTS season_weeks (
+          tournament_id INTEGER PRIMARY KEY,
+          week_num INTEGER NOT NULL,
+          tournament_date TEXT
         )
-        row = cur.fetchone()
-
-        if not row:
-            # Auto-create player (safe because player_name is UNIQUE)
-            cur.execute(
-                "INSERT OR IGNORE INTO players (player_name) VALUES (?)",
-                (player_name,),
-            )
-            cur.execute(
-                "SELECT player_id FROM players WHERE TRIM(player_name) = TRIM(?)",
-                (player_name,),
-            )
-            row = cur.fetchone()
-
-        if not row:
-            continue
-
-        player_id = int(row[0])
-
-        cur.execute("""
-            INSERT OR REPLACE INTO weekly_points
-              (season_id, tournament_id, week_num, tournament_date, player_id, finish_place, points, payout)
-            VALUES (?, ?, ?, ?, ?, NULL, NULL, NULL)
-        """, (
-            SEASON_ID,
-            tournament_id,
-            week_map[tournament_id],
-            date_map[tournament_id],
-            player_id
-        ))
-        inserted += 1
+    """)
+    cur.execute("DELETE FROM temp.season_weeks")
+    cur.execute("""
+        INSERT INTO temp.season_weeks (tournament_id, week_num, tournament_date)
+        SELECT tournament_id, ROW_NUMBER() OVER (ORDER BY tournament_date), tournament_date
+        FROM tournaments
+        WHERE season_id = ?
+    """, (season_id,))
+
+    # 3) One row per buy-in. MIN(player_id) per key = the row the old
+    #    per-name lookup returned.
+    cur.execute(f"""
+        INSERT INTO weekly_points
+          (season_id, tournament_id, week_num, tournament_date, player_id, finish_place, points, payout)
+        SELECT ?, b.tournament_id, w.week_num, w.tournament_date, p.player_id, NULL, NULL, NULL
+        FROM ({buyins_sql}) b
+        JOIN temp.season_weeks w ON w.tournament_id = b.tournament_id
+        JOIN (
+            SELECT player_key, MIN(player_id) AS player_id
+            FROM players
+            GROUP BY player_key
+        ) p ON p.player_key = b.player_key
+        ORDER BY b.tournament_id, b.player_key
+    """, (season_id, season_id, *scope))
+    inserted = cur.rowcount
+
+    cur.execute("SELECT COUNT(*) FROM weekly_points WHERE season_id = ?", (season_id,))
+    count = cur.fetchone()[0]
 
-    conn.commit()
+    print(f"✅ weekly_points built. Inserted {inserted}. Total rows for {season_id}: {count}")
 
-    cur.execute("SELECT COUNT(*) FROM weekly_points WHERE season_id = ?", (SEASON_ID,))
-    count = cur.fetchone()[0]
 
-    print(f"✅ weekly_points built. Inserted {inserted}. Total rows for {SEASON_ID}: {count}")
-    conn.close()
+def main():
+    conn = sqlite3.connect(DB_PATH)
+    try:
+        run(conn)
+        conn.commit()
+    finally:
+        conn.close()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+Check that a scoped (dirty-tournaments-only) build ends where a clean build
+does.
+
+Each scenario builds a scratch DB from every CSV but the last, applies a
+change (a new scoring rule, or none), adds the last CSV and builds again
+with run_pipeline, so the scoped stages only see that tournament as dirty.
+A second scratch DB is built from scratch with the same CSVs and rule. The
+derived tables (compared by player name and tournament date, since ids
+follow ingest order) and the exports' content_hash must match.
+
+Usage:
+  python backend/scripts/check_scoped_build.py
+  python backend/scripts/check_scoped_build.py --rule field_size@v1
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import io
+import os
+import shutil
+import sqlite3
+import tempfile
+from pathlib import Path
+
+from db_utils import connect
+from run_pipeline import run_pipeline
+from scoring_rules import parse_rule_key
+from season_json_writer import stored_hash
+
+SEASON_ID = os.environ.get("SEASON_ID", "spring_2026")
+ROOT = Path(__file__).resolve().parents[2]
+DATA_DIR = ROOT / "data" / "incoming"
+SCHEMA_PATH = ROOT / "backend" / "sql" / "schema.sql"
+
+# derived tables, keyed by names instead of ingest-order ids
+COMPARE_SQL = {
+    "weekly_points": """
+        SELECT t.tournament_date, p.player_name, w.week_num, w.finish_place, w.points
+        FROM weekly_points w
+        JOIN tournaments t ON t.tournament_id = w.tournament_id
+        JOIN players p ON p.player_id = w.player_id
+        ORDER BY 1, 2
+    """,
+    "weekly_survival": """
+        SELECT t.tournament_date, p.player_name, s.tournament_minutes, s.minutes_survived, s.survival_percent
+        FROM weekly_survival s
+        JOIN tournaments t ON t.tournament_id = s.tournament_id
+        JOIN players p ON p.player_id = s.player_id
+        ORDER BY 1, 2
+    """,
+    "eliminations": """
+        SELECT t.tournament_date, e.seq_in_tournament, e.eliminator_player_name, e.eliminated_player_name
+        FROM eliminations e
+        JOIN tournaments t ON t.tournament_id = e.tournament_id
+        ORDER BY 1, 2
+    """,
+    "season_totals": """
+        SELECT st.season_id, p.player_name, st.season_points_total, st.season_points_drop2,
+               st.weeks_in_season, st.weeks_played
+        FROM season_totals st
+        JOIN players p ON p.player_id = st.player_id
+        ORDER BY 1, 2
+    """,
+    "player_season_stats": """
+        SELECT s.season_id, p.player_name, s.wins, s.avg_finish
+        FROM player_season_stats s
+        JOIN players p ON p.player_id = s.player_id
+        ORDER BY 1, 2
+    """,
+    "weekly_payouts": """
+        SELECT w.season_id, w.week_num, p.player_name, w.amount, w.payout_type
+        FROM weekly_payouts w
+        JOIN players p ON p.player_id = w.player_id
+        ORDER BY 1, 2, 3, 5
+    """,
+}
+
+
+def set_rule(conn: sqlite3.Connection, season_id: str, rule_key: str) -> None:
+    name, version = parse_rule_key(rule_key)
+    conn.execute(
+        """
+        INSERT INTO season_scoring_rules (season_id, rule_name, version) VALUES (?, ?, ?)
+        ON CONFLICT(season_id) DO UPDATE SET rule_name = excluded.rule_name, version = excluded.version
+        """,
+        (season_id, name, version),
+    )
+    conn.commit()
+
+
+def build(conn: sqlite3.Connection, work: Path, only=None) -> list[str]:
+    """run_pipeline on the scratch dir's CSVs; returns its "==> stage" lines."""
+    log = io.StringIO()
+    with contextlib.redirect_stdout(log):
+        run_pipeline(conn, SEASON_ID, only=only, stage_kwargs={
+            "init": {"schema": SCHEMA_PATH.read_text(encoding="utf-8")},
+            "ingest": {"data_dir": work / "data" / "incoming"},
+        })
+    return [line for line in log.getvalue().splitlines() if line.startswith("==>")]
+
+
+def snapshot(conn: sqlite3.Connection, work: Path) -> dict:
+    snap = {name: conn.execute(sql).fetchall() for name, sql in COMPARE_SQL.items()}
+    snap["content_hash"] = stored_hash(work / "frontend" / "data" / f"{SEASON_ID}.json")
+    snap["analytics content_hash"] = stored_hash(work / "frontend" / "data" / f"{SEASON_ID}.analytics.json")
+    return snap
+
+
+def run_scenario(csvs: list[Path], rule: str | None, tmp: Path) -> list[str]:
+    """Scoped vs clean build; returns the names of what differs."""
+    snaps = []
+    for mode in ("scoped", "clean"):
+        work = tmp / mode
+        (work / "data" / "incoming").mkdir(parents=True)
+        (work / "frontend" / "data").mkdir(parents=True)
+        conn = connect(work / "pokerleague.sqlite", write=True)
+        cwd = Path.cwd()
+        os.chdir(work)  # export / profile paths are relative to the repo root
+        try:
+            for csv_path in csvs[:-1] if mode == "scoped" else csvs:
+                shutil.copy2(csv_path, work / "data" / "incoming")
+            # clean: just enough for the season row the rule points at
+            build(conn, work, only=None if mode == "scoped" else {"init", "ingest"})
+            if rule:
+                set_rule(conn, SEASON_ID, rule)
+            if mode == "scoped":
+                shutil.copy2(csvs[-1], work / "data" / "incoming")
+            for line in build(conn, work):
+                print(f"  {mode:<6} {line}")
+            snaps.append(snapshot(conn, work))
+        finally:
+            os.chdir(cwd)
+            conn.close()
+    scoped, clean = snaps
+    return [name for name in scoped if scoped[name] != clean[name]]
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description="Compare scoped incremental builds against clean builds.")
+    ap.add_argument("--rule", default="field_size@v1", help="scoring rule switched to before the last CSV")
+    args = ap.parse_args(argv)
+
+    csvs = sorted(DATA_DIR.glob("*.csv"))
+    if len(csvs) < 2:
+        print(f"❌ need at least two CSVs in {DATA_DIR}")
+        return 1
+
+    failed = 0
+    for label, rule in (("new CSV", None), (f"new CSV + rule {args.rule}", args.rule)):
+        print(f"==> {label}")
+        with tempfile.TemporaryDirectory() as tmp:
+            diffs = run_scenario(csvs, rule, Path(tmp))
+        if diffs:
+            failed += 1
+            print(f"❌ {label}: scoped build differs from a clean build in {', '.join(diffs)}")
+        else:
+            print(f"✅ {label}: scoped build matches a clean build")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,7 +1,10 @@
 # backend/chip_and_chair.py
 from __future__ import annotations
+from collections import Counter
 from dataclasses import dataclass
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Sequence, Tuple
+
+import numpy as np
 
 @dataclass(frozen=True)
 class ChipAndChairRules:
@@ -190,4 +193,104 @@ def build_chip_and_chair(
 
     # return sorted by TotalStack desc
     out = sorted(by_player.values(), key=lambda r: (-r["TotalStack"], r["Player"]))
-    return out
\ No newline at end of file
+    return out
+
+
+# ----------------------------
+# Batch what-if: many rule variants at once
+# ----------------------------
+
+@dataclass(frozen=True)
+class ChipAndChairFeatures:
+    """
+    Per-player counts that every rule variant is a function of, in
+    build_chip_and_chair's player order (SeasonTotals, then eliminators
+    missing from it).
+    """
+    players: List[str]
+    drop2: np.ndarray               # SeasonPointsDrop2 (0 for eliminators not in SeasonTotals)
+    counts: np.ndarray              # players x 3: total elims, pairs eliminated exactly 2x, pairs 3x+
+    rank: np.ndarray                # dense Drop-2 rank (999 = unranked)
+    victim_ranks: np.ndarray        # sorted distinct victim ranks
+    hv_cum: np.ndarray              # players x (len(victim_ranks) + 1): elims of victims ranked <= victim_ranks[j-1]
+
+
+def chip_and_chair_features(
+    season_totals: List[Dict[str, Any]],
+    eliminations: List[Dict[str, Any]],
+) -> ChipAndChairFeatures:
+    """One pass over the season: the count matrix behind every variant."""
+    ranks = dense_ranks_by_drop2(season_totals)
+
+    drop2_by_player: Dict[str, float] = {}
+    for st in season_totals:
+        p = st.get("Player")
+        if p:
+            drop2_by_player[p] = float(st.get("SeasonPointsDrop2") or 0)
+
+    pairs = [
+        ((e.get("EliminatorPlayer") or "").strip(), (e.get("EliminatedPlayer") or "").strip())
+        for e in eliminations or []
+    ]
+    pairs = [(k, v) for k, v in pairs if k and v]
+    players = list(drop2_by_player) + [k for k in dict.fromkeys(k for k, _ in pairs) if k not in drop2_by_player]
+    index = {p: i for i, p in enumerate(players)}
+
+    counts = np.zeros((len(players), 3), dtype=np.int64)
+    elim_idx = np.array([index[k] for k, _ in pairs], dtype=np.int64)
+    np.add.at(counts[:, 0], elim_idx, 1)
+    for (k, _v), cnt in Counter(pairs).items():
+        if cnt >= 2:
+            counts[index[k], 1 if cnt == 2 else 2] += 1
+
+    victim_rank = np.array([ranks.get(v, 999) for _, v in pairs], dtype=np.int64)
+    victim_ranks = np.unique(victim_rank)
+    hist = np.zeros((len(players), len(victim_ranks) + 1), dtype=np.int64)
+    np.add.at(hist, (elim_idx, np.searchsorted(victim_ranks, victim_rank) + 1), 1)
+
+    return ChipAndChairFeatures(
+        players=players,
+        drop2=np.array([drop2_by_player.get(p, 0.0) for p in players]),
+        counts=counts,
+        rank=np.array([ranks.get(p, 999) for p in players], dtype=np.int64),
+        victim_ranks=victim_ranks,
+        hv_cum=np.cumsum(hist, axis=1),
+    )
+
+
+def build_chip_and_chair_batch(
+    features: ChipAndChairFeatures,
+    variants: Sequence[ChipAndChairRules],
+) -> Tuple[List[str], np.ndarray]:
+    """
+    TotalStack for every player under every variant: (players, stacks)
+    with stacks[i, j] = build_chip_and_chair(..., variants[j]) TotalStack
+    of players[i].
+
+    Per-elimination chips are one matmul of the count matrix against the
+    variants' weights (repeat tiers as in build_chip_and_chair: a pair
+    eliminated 2x earns chip_per_repeat_elim, 3x+ chip_per_hv_elim);
+    season-point chips are an outer product, HV counts a gather of the
+    cumulative victim-rank counts at each variant's thresholds.
+    """
+    def col(name):
+        return np.array([getattr(r, name) for r in variants], dtype=float)
+
+    mult, per_elim, repeat2, hv_chip = (
+        col("season_points_chip_multiplier"), col("chip_per_total_elim"),
+        col("chip_per_repeat_elim"), col("chip_per_hv_elim"),
+    )
+    weights = np.vstack([per_elim, repeat2, hv_chip])                     # 3 x variants
+
+    # int() per component, as the loop version adds them
+    elim_chips = np.trunc(features.counts[:, :1] * weights[:1])
+    repeat_chips = np.trunc(features.counts[:, 1:] @ weights[1:])
+    points_chips = np.round(np.outer(features.drop2, mult))
+
+    # HV elims: victims ranked <= hv_victim_rank_max, by eliminators ranked >= hv_eliminator_rank_min
+    hv_cols = np.searchsorted(features.victim_ranks, col("hv_victim_rank_max"), side="right")
+    eligible = features.rank[:, None] >= col("hv_eliminator_rank_min")[None, :]
+    hv_chips = np.trunc(np.where(eligible, features.hv_cum[:, hv_cols], 0) * hv_chip)
+
+    stacks = np.trunc(col("base_stack"))[None, :] + points_chips + elim_chips + repeat_chips + hv_chips
+    return features.players, stacks.astype(np.int64)
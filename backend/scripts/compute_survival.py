@@ -1,12 +1,33 @@
 # backend/scripts/compute_survival.py
+"""
+Survival minutes per player per tournament, from the raw event log.
+
+As a build stage (run), the weekly rows are persisted in weekly_survival,
+keyed by (tournament_id, player_id); scoped runs recompute only the given
+tournaments, so a weekly build parses one tournament's events. Season
+aggregates and the per-week export read that table instead of the raw log.
+
+Usage:
+  python backend/scripts/compute_survival.py            # tournaments not in weekly_survival yet
+  python backend/scripts/compute_survival.py --rebuild  # the whole season
+"""
 
 from __future__ import annotations
 
+import argparse
+import os
 import sqlite3
 from dataclasses import dataclass
-from datetime import datetime, date, timedelta
+from pathlib import Path
+
+import numpy as np
 import pandas as pd
 
+from dirty_tournaments import qmarks
+
+DB_PATH = Path(os.environ.get("POKERLEAGUE_DB", "backend/db/pokerleague.sqlite"))
+SEASON_ID = os.environ.get("SEASON_ID", "spring_2026")
+
 
 @dataclass(frozen=True)
 class SurvivalConfig:
@@ -18,6 +39,7 @@ class SurvivalConfig:
     # column names
     col_tournament_id: str = "tournament_id"
     col_event_ts: str = "event_ts"              # time-only like "7:13pm"
+    col_event_epoch: str = "event_epoch"        # absolute seconds, computed at ingest
     col_event_type: str = "event_type"
     col_player_name: str = "player_name"
     col_eliminated_name: str = "eliminated_player_name"
@@ -30,26 +52,114 @@ class SurvivalConfig:
     evt_buyin: str = "BuyIn"
 
 
-def _parse_tournament_date(d: str) -> date:
-    return datetime.strptime(d.strip(), "%Y-%m-%d").date()
+WEEKLY_COLUMNS = ["tournament_id", "player_name", "tournament_minutes", "minutes_survived", "survival_percent"]
+PARTICIPANT_COLUMNS = ["tournament_id", "player_name", "start_epoch", "end_epoch", "elim_epoch"]
 
 
-def _parse_time_ampm(t: str) -> datetime.time:
-    s = t.strip().lower().replace(" ", "")
-    return datetime.strptime(s, "%I:%M%p").time()
-
-
-def _combine_dt(t_date: str, t_time: str) -> datetime:
-    d = _parse_tournament_date(t_date)
-    tm = _parse_time_ampm(t_time)
-    return datetime.combine(d, tm)
-
+def load_survival_participants(conn: sqlite3.Connection, cfg: SurvivalConfig, tournament_ids=None) -> pd.DataFrame:
+    """
+    One row per participant of the season's (or just tournament_ids')
+    tournaments, with the per-(tournament, player) work done in SQL:
+
+      - participants: the first BuyIn per (tournament, player_name), a GROUP
+        BY streamed off idx_raw_events_buyins
+      - elim_epoch: the first Eliminated for that name, a MIN seek on
+        idx_raw_events_eliminations (a GROUP BY + LEFT JOIN of the
+        eliminations builds an 80k-row automatic index at 1M events)
+      - start_epoch / end_epoch: min START / max END epoch per tournament,
+        else its min / max event_epoch; a second, per-tournament query of
+        index seeks, joined on in pandas
+
+    Rows come by tournament_id, then buy-in order. Only these rows leave
+    SQLite, never the event log itself.
+    """
+    scope = () if tournament_ids is None else tuple(sorted(tournament_ids))
+    scope_sql = "" if tournament_ids is None else f"AND t.{cfg.col_tournament_id} IN ({qmarks(scope)})"
+    elim_name = f"""COALESCE(
+                NULLIF(TRIM(x.{cfg.col_eliminated_name}), ''),
+                NULLIF(TRIM(x.{cfg.col_player_name}), '')
+                )"""
+    participants = pd.DataFrame.from_records(
+        conn.execute(
+            f"""
+            WITH buyins AS MATERIALIZED (
+                -- rowid is that of the row MIN() picked: buy-in order on equal epochs
+                SELECT e.{cfg.col_tournament_id} AS tournament_id, e.{cfg.col_player_name} AS player_name,
+                       MIN(e.{cfg.col_event_epoch}) AS buyin_epoch, e.rowid AS buyin_rowid
+                FROM {cfg.events_table} e
+                WHERE e.{cfg.col_tournament_id} IN (
+                        SELECT t.{cfg.col_tournament_id} FROM {cfg.tournaments_table} t
+                        WHERE t.season_id = ? {scope_sql})
+                  AND e.{cfg.col_event_type} = ?
+                  AND e.{cfg.col_event_epoch} IS NOT NULL
+                  AND e.{cfg.col_player_name} IS NOT NULL
+                GROUP BY e.{cfg.col_tournament_id}, e.{cfg.col_player_name}
+            )
+            SELECT b.tournament_id, b.player_name,
+                   (SELECT MIN(x.{cfg.col_event_epoch}) FROM {cfg.events_table} x
+                    WHERE x.{cfg.col_tournament_id} = b.tournament_id
+                      AND x.{cfg.col_event_type} = ?
+                      -- unary +: no TEXT affinity, so the comparison can use the expression index
+                      AND {elim_name} = +b.player_name
+                      AND x.{cfg.col_event_epoch} IS NOT NULL) AS elim_epoch
+            FROM buyins b
+            ORDER BY b.tournament_id, b.buyin_epoch, b.buyin_rowid
+            """,
+            (cfg.season_id, *scope, cfg.evt_buyin, cfg.evt_eliminated),
+        ).fetchall(),
+        columns=["tournament_id", "player_name", "elim_epoch"],
+    )
 
-def _minutes_between(a: datetime, b: datetime) -> float:
-    return max(0.0, (b - a).total_seconds() / 60.0)
+    bound_sql = f"""(SELECT {{agg}}(e.{cfg.col_event_epoch}) FROM {cfg.events_table} e
+                     WHERE e.{cfg.col_tournament_id} = t.{cfg.col_tournament_id} {{typed}})"""
+    typed = f"AND e.{cfg.col_event_type} = ?"
+    bounds = pd.DataFrame.from_records(
+        conn.execute(
+            f"""
+            SELECT t.{cfg.col_tournament_id},
+                   COALESCE({bound_sql.format(agg="MIN", typed=typed)},
+                            {bound_sql.format(agg="MIN", typed="")}),
+                   COALESCE({bound_sql.format(agg="MAX", typed=typed)},
+                            {bound_sql.format(agg="MAX", typed="")})
+            FROM {cfg.tournaments_table} t
+            WHERE t.season_id = ? {scope_sql}
+            """,
+            (cfg.evt_tournament_start, cfg.evt_tournament_end, cfg.season_id, *scope),
+        ).fetchall(),
+        columns=["tournament_id", "start_epoch", "end_epoch"],
+        index="tournament_id",
+    )
+    return participants.join(bounds, on="tournament_id")[PARTICIPANT_COLUMNS]
 
 
-def compute_survival_weekly(conn: sqlite3.Connection, cfg: SurvivalConfig) -> pd.DataFrame:
+def survival_from_participants(participants: pd.DataFrame) -> pd.DataFrame:
+    """
+    Weekly survival rows from load_survival_participants() output, as column
+    arithmetic (rounding stays in NumPy: SQLite's ROUND differs at the
+    edges). Row order is kept.
+    """
+    if participants.empty:
+        return pd.DataFrame(columns=WEEKLY_COLUMNS)
+
+    start = participants["start_epoch"].to_numpy(dtype=float)
+    elim = participants["elim_epoch"].to_numpy(dtype=float)
+    t_minutes = np.clip((participants["end_epoch"].to_numpy(dtype=float) - start) / 60.0, 0.0, None)
+    survived = np.clip((elim - start) / 60.0, 0.0, None)
+    survived = np.where(t_minutes > 0, np.minimum(survived, t_minutes), survived)
+    minutes_survived = np.where(np.isnan(elim), t_minutes, survived)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        survival_percent = np.where(t_minutes > 0, minutes_survived / t_minutes, 0.0)
+
+    return pd.DataFrame({
+        "tournament_id": participants["tournament_id"].to_numpy(dtype=np.int64),
+        "player_name": participants["player_name"].astype(str).to_numpy(),
+        "tournament_minutes": t_minutes.round(1),
+        "minutes_survived": minutes_survived.round(1),
+        "survival_percent": survival_percent.round(3),
+    })
+
+
+def compute_survival_weekly(conn: sqlite3.Connection, cfg: SurvivalConfig, tournament_ids=None) -> pd.DataFrame:
     """
     Returns one row per (tournament_id, player_name) with:
       - tournament_minutes
@@ -58,104 +168,55 @@ def compute_survival_weekly(conn: sqlite3.Connection, cfg: SurvivalConfig) -> pd
 
     Rules:
       - Participants = all BuyIn player_name for that tournament
-      - Start = TOURNAMENT START timestamp (fallback to MIN event_dt)
-      - End   = TOURNAMENT END timestamp (fallback to MAX event_dt)
+      - Start = TOURNAMENT START timestamp (fallback to MIN event_epoch)
+      - End   = TOURNAMENT END timestamp (fallback to MAX event_epoch)
       - Eliminated players: first Eliminated row for eliminated_player_name
       - Non-eliminated: full tournament duration
-      - Handle midnight crossover: if end < start => end + 1 day
-    """
-    sql = f"""
-    SELECT
-        e.{cfg.col_tournament_id} AS tournament_id,
-        t.{cfg.col_tournament_date} AS tournament_date,
-        e.{cfg.col_event_ts} AS event_ts,
-        e.{cfg.col_event_type} AS event_type,
-        e.{cfg.col_player_name} AS player_name,
-        CASE
-            WHEN e.{cfg.col_event_type} = 'Eliminated'
-                THEN COALESCE(
-                    NULLIF(TRIM(e.{cfg.col_eliminated_name}), ''),
-                    NULLIF(TRIM(e.{cfg.col_player_name}), '')
-                    )
-            ELSE NULL
-            END AS eliminated_player_name
-    FROM {cfg.events_table} e
-    JOIN {cfg.tournaments_table} t
-      ON t.{cfg.col_tournament_id} = e.{cfg.col_tournament_id}
-    WHERE t.season_id = ?
-      AND e.{cfg.col_event_ts} IS NOT NULL
-    """
-    df = pd.read_sql_query(sql, conn, params=(cfg.season_id,))
-
-    if df.empty:
-        return pd.DataFrame(columns=[
-            "tournament_id", "player_name",
-            "tournament_minutes", "minutes_survived", "survival_percent"
-        ])
-
-    # build real datetimes from tournament_date + event_ts
-    df["event_dt"] = df.apply(lambda r: _combine_dt(r["tournament_date"], r["event_ts"]), axis=1)
+      - Midnight crossover is already resolved in event_epoch at ingest
 
-    out_rows = []
-
-    for tid, g in df.groupby("tournament_id", sort=True):
-        # Tournament boundaries
-        start_rows = g[g["event_type"] == cfg.evt_tournament_start]
-        end_rows = g[g["event_type"] == cfg.evt_tournament_end]
-
-        start_dt = start_rows["event_dt"].min() if not start_rows.empty else g["event_dt"].min()
-        end_dt = end_rows["event_dt"].max() if not end_rows.empty else g["event_dt"].max()
-
-        # Midnight crossover (keep consistent with old site)
-        if end_dt < start_dt:
-            end_dt = end_dt + timedelta(days=1)
-
-        tournament_minutes = _minutes_between(start_dt, end_dt)
-
-        # Participants = BuyIn player_name
-        participants = (
-            g.loc[g["event_type"] == cfg.evt_buyin, "player_name"]
-             .dropna()
-             .astype(str)
-             .unique()
-             .tolist()
-        )
-
-        # First elimination timestamp per eliminated player
-        elim = g[g["event_type"] == cfg.evt_eliminated].copy()
-        elim = elim.dropna(subset=["eliminated_player_name"])
-        elim_first = elim.groupby("eliminated_player_name", as_index=True)["event_dt"].min()
-
-        for player in participants:
-            if player in elim_first.index:
-                minutes_survived = _minutes_between(start_dt, elim_first[player])
-                if tournament_minutes > 0:
-                    minutes_survived = min(minutes_survived, tournament_minutes)
-            else:
-                minutes_survived = tournament_minutes
-
-            survival_percent = (minutes_survived / tournament_minutes) if tournament_minutes > 0 else 0.0
+    tournament_ids: just these tournaments (None = whole season).
+    """
+    return survival_from_participants(load_survival_participants(conn, cfg, tournament_ids))
 
-            out_rows.append({
-                "tournament_id": int(tid),
-                "player_name": player,
-                "tournament_minutes": round(tournament_minutes, 1),
-                "minutes_survived": round(minutes_survived, 1),
-                "survival_percent": round(survival_percent, 3),
-            })
 
-    return pd.DataFrame(out_rows)
+def load_survival_weekly(conn: sqlite3.Connection, cfg: SurvivalConfig) -> pd.DataFrame:
+    """
+    The season's persisted weekly_survival rows (same columns as
+    compute_survival_weekly), by tournament, plus week_num, tournament_date
+    and player_id.
+    """
+    return pd.read_sql_query(
+        f"""
+        SELECT ws.tournament_id, p.player_name,
+               ws.tournament_minutes, ws.minutes_survived, ws.survival_percent,
+               w.week_num, t.{cfg.col_tournament_date} AS tournament_date, ws.player_id
+        FROM weekly_survival ws
+        JOIN {cfg.tournaments_table} t ON t.{cfg.col_tournament_id} = ws.tournament_id
+        JOIN players p ON p.player_id = ws.player_id
+        JOIN (
+            SELECT tournament_id,
+                   ROW_NUMBER() OVER (ORDER BY tournament_date, tournament_id) AS week_num
+            FROM {cfg.tournaments_table}
+            WHERE season_id = ?
+        ) w ON w.tournament_id = ws.tournament_id
+        WHERE t.season_id = ?
+        ORDER BY ws.tournament_id, ws.rowid
+        """,
+        conn,
+        params=(cfg.season_id, cfg.season_id),
+    )
 
 
 def compute_survival_season(conn: sqlite3.Connection, cfg: SurvivalConfig) -> pd.DataFrame:
     """
-    Aggregates weekly survival into season metrics per player:
+    Aggregates weekly survival (the weekly_survival table) into season
+    metrics per player:
       - weeks_played
       - avg_minutes_survived
       - avg_survival_percent
       - total_minutes_survived
     """
-    weekly = compute_survival_weekly(conn, cfg)
+    weekly = load_survival_weekly(conn, cfg)
     if weekly.empty:
         return pd.DataFrame(columns=[
             "player_name", "weeks_played",
@@ -182,4 +243,84 @@ def compute_survival_season(conn: sqlite3.Connection, cfg: SurvivalConfig) -> pd
         ascending=[False, True]
     ).reset_index(drop=True)
 
-    return season
\ No newline at end of file
+    return season
+
+
+def pending_tournament_ids(conn: sqlite3.Connection, season_id: str) -> set[int]:
+    """Season tournaments with no weekly_survival rows yet."""
+    rows = conn.execute(
+        """
+        SELECT t.tournament_id
+        FROM tournaments t
+        WHERE t.season_id = ?
+          AND NOT EXISTS (SELECT 1 FROM weekly_survival ws WHERE ws.tournament_id = t.tournament_id)
+        """,
+        (season_id,),
+    ).fetchall()
+    return {int(tid) for (tid,) in rows}
+
+
+def run(conn, season_id=None, tournament_ids=None):
+    """
+    Recompute weekly_survival for tournament_ids (None = whole season):
+    one DELETE for the scope, one executemany INSERT of every row (names ->
+    player_id via players.player_key).
+    """
+    season_id = season_id or SEASON_ID
+    cfg = SurvivalConfig(season_id=season_id)
+    weekly = compute_survival_weekly(conn, cfg, tournament_ids)
+
+    scope = () if tournament_ids is None else tuple(sorted(tournament_ids))
+    scope_sql = "" if tournament_ids is None else f"AND tournament_id IN ({qmarks(scope)})"
+    conn.execute(
+        f"""
+        DELETE FROM weekly_survival
+        WHERE tournament_id IN (SELECT tournament_id FROM tournaments WHERE season_id = ? {scope_sql})
+        """,
+        (season_id, *scope),
+    )
+    # a buy-in name with stray whitespace maps to the same player (lowest
+    # player_id per key); first row wins, unknown names are skipped
+    conn.executemany(
+        """
+        INSERT INTO weekly_survival
+          (tournament_id, player_id, tournament_minutes, minutes_survived, survival_percent)
+        SELECT ?, p.player_id, ?, ?, ?
+        FROM players p
+        WHERE p.player_key = TRIM(?)
+        ORDER BY p.player_id
+        LIMIT 1
+        ON CONFLICT (tournament_id, player_id) DO NOTHING
+        """,
+        zip(
+            weekly["tournament_id"].tolist(),
+            weekly["tournament_minutes"].tolist(),
+            weekly["minutes_survived"].tolist(),
+            weekly["survival_percent"].tolist(),
+            weekly["player_name"].tolist(),
+        ),
+    )
+    n_tournaments = weekly["tournament_id"].nunique()
+    print(f"✅ weekly_survival: {len(weekly)} rows for {n_tournaments} tournaments")
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description="Fill weekly_survival from the raw event log.")
+    ap.add_argument("--rebuild", action="store_true", help="recompute the whole season")
+    args = ap.parse_args(argv)
+
+    conn = sqlite3.connect(str(DB_PATH))
+    try:
+        tournament_ids = None if args.rebuild else pending_tournament_ids(conn, SEASON_ID)
+        if tournament_ids is not None and not tournament_ids:
+            print("⏭️  weekly_survival up to date")
+            return 0
+        run(conn, tournament_ids=tournament_ids)
+        conn.commit()
+    finally:
+        conn.close()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
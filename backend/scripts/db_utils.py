@@ -0,0 +1,28 @@
+# backend/scripts/db_utils.py
+
+from __future__ import annotations
+
+import sqlite3
+from pathlib import Path
+
+# Pragmas for the write-heavy stages (ingest / backfills).
+# WAL + synchronous=NORMAL is durable across app crashes and only risks the
+# last transaction on power loss, which a rebuild from data/incoming recovers.
+WRITE_PRAGMAS = {
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",
+    "cache_size": -65536,     # negative = KiB, i.e. ~64MB page cache
+    "temp_store": "MEMORY",
+}
+
+
+def apply_write_pragmas(conn: sqlite3.Connection) -> None:
+    for name, value in WRITE_PRAGMAS.items():
+        conn.execute(f"PRAGMA {name} = {value}")
+
+
+def connect(db_path: Path | str, write: bool = False) -> sqlite3.Connection:
+    conn = sqlite3.connect(str(db_path))
+    if write:
+        apply_write_pragmas(conn)
+    return conn
@@ -0,0 +1,54 @@
+# backend/scripts/dirty_tournaments.py
+"""
+Tournaments whose derived rows need recomputing.
+
+Ingest marks every tournament it (re)loads, build_weekly_points marks
+tournaments whose week_num shifted, and init marks everything after a data
+migration. The tournament-scoped stages (run(..., tournament_ids=...)) then
+rebuild only those tournaments' rows, and run_pipeline clears the season's
+set once a full build succeeds.
+"""
+
+from __future__ import annotations
+
+import sqlite3
+from typing import Iterable
+
+
+def mark_dirty(conn: sqlite3.Connection, tournament_ids: Iterable[int]) -> None:
+    conn.executemany(
+        "INSERT OR IGNORE INTO dirty_tournaments (tournament_id) VALUES (?)",
+        [(int(tid),) for tid in tournament_ids],
+    )
+
+
+def mark_all_dirty(conn: sqlite3.Connection) -> None:
+    conn.execute("INSERT OR IGNORE INTO dirty_tournaments (tournament_id) SELECT tournament_id FROM tournaments")
+
+
+def dirty_tournament_ids(conn: sqlite3.Connection, season_id: str) -> set[int]:
+    rows = conn.execute(
+        """
+        SELECT d.tournament_id
+        FROM dirty_tournaments d
+        JOIN tournaments t ON t.tournament_id = d.tournament_id
+        WHERE t.season_id = ?
+        """,
+        (season_id,),
+    ).fetchall()
+    return {int(tid) for (tid,) in rows}
+
+
+def clear_dirty(conn: sqlite3.Connection, season_id: str) -> None:
+    conn.execute(
+        """
+        DELETE FROM dirty_tournaments
+        WHERE tournament_id IN (SELECT tournament_id FROM tournaments WHERE season_id = ?)
+        """,
+        (season_id,),
+    )
+
+
+def qmarks(ids) -> str:
+    """ "?,?,?" for an IN (...) list."""
+    return ",".join("?" * len(ids))
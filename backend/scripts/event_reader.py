@@ -0,0 +1,116 @@
+# backend/scripts/event_reader.py
+"""
+Streaming reader for the weekly log CSVs ("mm.dd.yy log.csv").
+
+iter_log_events() is a generator: one normalized LogEvent per CSV row, one
+file open at a time, nothing materialized. Ingest feeds it straight into
+executemany batches; build_all uses the chunked pandas adapter
+iter_event_frames(). Memory is bounded by one row (or one chunk), not by the
+number of weekly logs. read_log_file() is the one-file-at-a-time list form
+used by `ingest_all_csvs.py --jobs N` workers.
+"""
+
+from __future__ import annotations
+
+import csv
+from datetime import datetime
+from pathlib import Path
+from typing import Iterable, Iterator, NamedTuple
+
+from event_times import EventClock, epoch_to_iso
+from log_fields import parse_amount_cents, parse_chips, parse_level, parse_table
+
+
+class LogEvent(NamedTuple):
+    # field order == raw_log_events column order used by ingest
+    event_ts: str
+    event_type: str
+    player_name: str
+    eliminated_player_name: str
+    eliminator_player_name: str
+    notes: str
+    position: int | None
+    level: int | None
+    chips: int | None
+    amount_cents: int | None
+    table_num: int | None
+    event_epoch: int | None
+    event_dt: str | None
+
+
+EVENT_COLUMNS = LogEvent._fields
+
+
+def filename_to_iso_date(filename: str) -> str:
+    # "02.10.26 log.csv" -> "2026-02-10"
+    base = filename.split(" ")[0]  # "02.10.26"
+    dt = datetime.strptime(base, "%m.%d.%y")
+    return dt.strftime("%Y-%m-%d")
+
+
+def normalize_row(r: dict, clock: EventClock) -> LogEvent:
+    event_ts = (r.get("Time") or "").strip()
+    event_type = (r.get("Event") or "unknown").strip()
+
+    pos_text = (r.get("Position") or "").strip()
+    event_epoch = clock.epoch(event_ts, event_type)
+
+    return LogEvent(
+        event_ts=event_ts,
+        event_type=event_type,
+        player_name=(r.get("Players") or "").strip(),
+        # Eliminated rows carry the victim in Players; resolved downstream.
+        eliminated_player_name="",
+        eliminator_player_name=(r.get("Eliminated By") or "").strip(),
+        # raw extras kept verbatim for eliminations.notes
+        notes=(
+            f"Level={r.get('Level','')}; "
+            f"Chips={r.get('Chips','')}; "
+            f"Amount={r.get('Amount','')}; "
+            f"Table={r.get('Table','')}; "
+            f"Position={r.get('Position','')}"
+        ),
+        position=int(pos_text) if pos_text.isdigit() else None,
+        level=parse_level(r.get("Level")),
+        chips=parse_chips(r.get("Chips")),
+        amount_cents=parse_amount_cents(r.get("Amount")),
+        table_num=parse_table(r.get("Table")),
+        event_epoch=event_epoch,
+        event_dt=None if event_epoch is None else epoch_to_iso(event_epoch),
+    )
+
+
+def iter_log_events(csv_path: Path, tournament_date: str | None = None) -> Iterator[LogEvent]:
+    """Yield normalized events for one log file, in file order."""
+    clock = EventClock(tournament_date or filename_to_iso_date(csv_path.name))
+    with open(csv_path, "r", newline="", encoding="utf-8-sig") as f:
+        for r in csv.DictReader(f):
+            yield normalize_row(r, clock)
+
+
+def read_log_file(csv_path: Path, tournament_date: str | None = None) -> list[tuple]:
+    """
+    Whole-file variant of iter_log_events() for process-pool workers: plain
+    tuples pickle smaller than LogEvents and land straight in executemany.
+    """
+    return [tuple(ev) for ev in iter_log_events(csv_path, tournament_date)]
+
+
+def iter_event_frames(csv_paths: Iterable[Path], chunksize: int = 50_000):
+    """
+    Optional pandas adapter: yields DataFrames of at most `chunksize` events
+    (LogEvent columns + source_file + tournament_date) across all files.
+    """
+    import pandas as pd
+
+    columns = list(EVENT_COLUMNS) + ["source_file", "tournament_date"]
+    buf = []
+    for path in csv_paths:
+        tdate = filename_to_iso_date(path.name)
+        for ev in iter_log_events(path, tdate):
+            buf.append((*ev, path.name, tdate))
+            if len(buf) >= chunksize:
+                yield pd.DataFrame.from_records(buf, columns=columns)
+                buf = []
+    if buf:
+        yield pd.DataFrame.from_records(buf, columns=columns)
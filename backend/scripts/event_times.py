@@ -0,0 +1,80 @@
+# backend/scripts/event_times.py
+"""
+Absolute event times for the weekly logs.
+
+The logs only carry a wall-clock "7:13pm". Ingest turns that into
+event_epoch (integer seconds, wall-clock time on the tournament date
+treated as UTC) so downstream stages sort and subtract integers instead of
+re-parsing strings. A time more than 12h *before* TOURNAMENT START is
+taken to be after midnight and rolled to the next day.
+"""
+
+from __future__ import annotations
+
+import calendar
+import re
+from datetime import date, datetime, timezone
+from functools import lru_cache
+
+SECONDS_PER_DAY = 86400
+ROLLOVER_WINDOW = 12 * 3600
+
+TOURNAMENT_START = "TOURNAMENT START"
+
+_TIME_RE = re.compile(r"^(\d{1,2}):(\d{2})(?::(\d{2}))?\s*([ap]\.?m\.?)?$", re.IGNORECASE)
+
+
+@lru_cache(maxsize=4096)
+def parse_time_of_day(text: str | None) -> int | None:
+    """ "7:13pm" / "7:13 PM" / "7:13:05pm" / "19:13" -> seconds since midnight."""
+    m = _TIME_RE.match((text or "").strip())
+    if not m:
+        return None
+    hh, mm, ss, ampm = int(m.group(1)), int(m.group(2)), int(m.group(3) or 0), m.group(4)
+    if ampm:
+        if not 1 <= hh <= 12:
+            return None
+        hh = hh % 12 + (12 if ampm[0].lower() == "p" else 0)
+    if hh > 23 or mm > 59 or ss > 59:
+        return None
+    return hh * 3600 + mm * 60 + ss
+
+
+@lru_cache(maxsize=1024)
+def date_epoch(iso_date: str) -> int:
+    """ "2026-02-10" -> epoch seconds at midnight of that date."""
+    return calendar.timegm(date.fromisoformat(iso_date.strip()).timetuple())
+
+
+@lru_cache(maxsize=8192)
+def epoch_to_iso(epoch: int) -> str:
+    return datetime.fromtimestamp(epoch, tz=timezone.utc).strftime("%Y-%m-%d %H:%M:%S")
+
+
+class EventClock:
+    """
+    Assigns event_epoch to one tournament's events in file order.
+
+    The rollover anchor is the TOURNAMENT START time; events logged before
+    START (buy-ins) are anchored on the first timestamp of the file, which is
+    only minutes earlier.
+    """
+
+    def __init__(self, tournament_date: str):
+        self.base = date_epoch(tournament_date)
+        self.anchor: int | None = None
+        self.started = False
+
+    def epoch(self, time_text: str | None, event_type: str | None = None) -> int | None:
+        tod = parse_time_of_day(time_text)
+        if tod is None:
+            return None
+
+        if event_type == TOURNAMENT_START and not self.started:
+            self.started = True
+            self.anchor = tod
+        elif self.anchor is None:
+            self.anchor = tod
+
+        rollover = SECONDS_PER_DAY if self.anchor - tod > ROLLOVER_WINDOW else 0
+        return self.base + tod + rollover
@@ -1,20 +1,49 @@
-import json
 import sqlite3
 from pathlib import Path
 from datetime import datetime
 from zoneinfo import ZoneInfo
 from chip_and_chair import build_chip_and_chair, ChipAndChairRules
-from compute_survival import compute_survival_season, SurvivalConfig
+from compute_survival import compute_survival_season, load_survival_weekly, SurvivalConfig
+from build_season_totals_drop2 import drop_k_sensitivity
+from survival_curves import survival_curves
+from blind_levels import blind_levels
+from season_simulator import simulate_season
+from icm import chip_and_chair_icm
+from build_weekly_payouts import payout_policy
+from season_json_writer import SeasonJsonWriter
 import os
 
-DB_PATH = Path("backend/db/pokerleague.sqlite")
+DB_PATH = Path(os.environ.get("POKERLEAGUE_DB", "backend/db/pokerleague.sqlite"))
 SEASON_ID = os.environ.get("SEASON_ID", "spring_2026")
 OUT_DIR = Path("frontend/data")
 OUT_PATH = OUT_DIR / f"{SEASON_ID}.json"
 
-def main():
-    conn = sqlite3.connect(DB_PATH)
+def analytics_path(path: Path) -> Path:
+    """<season>.analytics.json: the per-tournament sections the pages load on demand."""
+    return path.with_name(f"{path.stem}.analytics{path.suffix}")
+
+
+def run(conn, season_id=None, out_path=None):
+    season_id = season_id or SEASON_ID
+    out_path = out_path or OUT_DIR / f"{season_id}.json"
+    with SeasonJsonWriter(out_path) as out, SeasonJsonWriter(analytics_path(out_path)) as analytics:
+        write_sections(conn, season_id, out, analytics)
+    print(out.report())
+    print(analytics.report())
+
+
+def write_sections(conn, season_id, out, analytics=None):
+    """
+    Every section of the season JSON, handed to `out` in payload order as
+    soon as it is built. The large per-tournament series (SurvivalWeekly,
+    BlindLevels) go to `analytics` instead (to `out` when it is None).
+    """
+    analytics = analytics or out
     cur = conn.cursor()
+    build_ts = datetime.now(ZoneInfo("America/New_York")).strftime("%b %d, %Y %I:%M %p %Z")
+    for sink in (out,) if analytics is out else (out, analytics):
+        sink.section("season_id", season_id)
+        sink.section("build_ts", build_ts)
 
     # Season totals
     season_totals = cur.execute("""
@@ -33,7 +62,7 @@ def main():
     AND pss.player_id = st.player_id
     WHERE st.season_id = ?
     ORDER BY st.season_points_drop2 DESC, st.season_points_total DESC, p.player_name ASC
-    """, (SEASON_ID,)).fetchall()
+    """, (season_id,)).fetchall()
 
     # Total payouts per player (season total)
     payout_by_player = cur.execute("""
@@ -42,7 +71,7 @@ def main():
         WHERE season_id = ?
         AND NOT (week_num = 10 AND payout_type = 'season_award')
         GROUP BY player_id
-    """, (SEASON_ID,)).fetchall()
+    """, (season_id,)).fetchall()
 
     money_map = { int(pid): float(total or 0) for (pid, total) in payout_by_player }
 
@@ -60,6 +89,7 @@ def main():
         }
         for (name, player_id, total, drop2, played, wks, wins, avg_finish) in season_totals
     ]
+    out.section("SeasonTotals", season_totals_rows)
 
     # ----------------------------
     # Season Awards (Top 3 - derived from leaderboard truth)
@@ -78,21 +108,88 @@ def main():
 
     season_award_rows = [
         {
-            "Player": sorted_totals[0]["Player"],
-            "PlayerID": sorted_totals[0]["PlayerID"],
-            "Amount": 400.0
-        },
-        {
-            "Player": sorted_totals[1]["Player"],
-            "PlayerID": sorted_totals[1]["PlayerID"],
-            "Amount": 250.0
-        },
-        {
-            "Player": sorted_totals[2]["Player"],
-            "PlayerID": sorted_totals[2]["PlayerID"],
-            "Amount": 150.0
+            "Player": r["Player"],
+            "PlayerID": r["PlayerID"],
+            "Amount": float(amount)
         }
+        for r, amount in zip(sorted_totals, payout_policy(season_id).season_awards)
     ]
+    out.section("SeasonAwards", season_award_rows)
+
+    # ----------------------------
+    # Chip & A Chair (backend truth)
+    # ----------------------------
+    rules = ChipAndChairRules(
+        base_stack=6500,
+        season_points_chip_multiplier=150,
+        chip_per_total_elim=50,
+        chip_per_repeat_elim=100,
+        chip_per_hv_elim=250,
+    )
+
+    # --- Eliminations (from SQLite raw_log_events) ---
+    # Your raw_log_events uses:
+    #   event_type = 'Eliminated'
+    #   player_name = eliminated player
+    #   eliminator_player_name = eliminator
+    #
+    # eliminated_player_name is empty in your data, so DO NOT use it.
+
+    # Build a rank map from SeasonTotals (Drop-2 points desc)
+    # (rank 1 = best)
+    sorted_totals = sorted(
+        season_totals_rows,
+        key=lambda r: (float(r.get("SeasonPointsDrop2") or 0), float(r.get("SeasonPointsTotal") or 0)),
+        reverse=True,
+    )
+    rank_by_player = {r["Player"]: i + 1 for i, r in enumerate(sorted_totals)}
+
+    # Get tournament_ids that belong to this season.
+    # Option A (most likely): tournaments has season_id
+    tournament_ids = [
+        row[0]
+        for row in conn.execute(
+            "SELECT tournament_id FROM tournaments WHERE season_id = ?",
+            (season_id,),
+        ).fetchall()
+    ]
+
+    # If tournament_ids comes back empty, your schema probably links differently.
+    # In that case, we’ll adjust, but try this first.
+
+    eliminations_rows = []
+    chip_and_chair_stacks_rows = []
+    if tournament_ids:
+        qmarks = ",".join(["?"] * len(tournament_ids))
+        sql = f"""
+            SELECT
+                tournament_id,
+                event_ts,
+                player_name AS eliminated_player,
+                eliminator_player_name AS eliminator_player
+            FROM raw_log_events
+            WHERE event_type = 'Eliminated'
+            AND tournament_id IN ({qmarks})
+            AND COALESCE(player_name,'') <> ''
+            AND COALESCE(eliminator_player_name,'') <> ''
+        """
+        for tid, event_ts, eliminated, eliminator in conn.execute(sql, tournament_ids).fetchall():
+            eliminations_rows.append({
+                "TournamentID": tid,
+                "EventTS": event_ts,
+                "EliminatedPlayer": eliminated,
+                "EliminatorPlayer": eliminator,
+                "VictimRank": rank_by_player.get(eliminated),
+                "EliminatorRank": rank_by_player.get(eliminator),
+            })
+
+        chip_and_chair_stacks_rows = build_chip_and_chair(
+            season_totals=season_totals_rows,
+            eliminations=eliminations_rows,
+            rules=rules,
+        )
+
+    out.section("ChipAndChairStacks", chip_and_chair_stacks_rows)
 
     # ----------------------------
     # Chip & A Chair Payouts (Top 6 - Week 11)
@@ -108,7 +205,7 @@ def main():
         AND wp.week_num = 11
         AND wp.payout_type = 'chip_and_chair'
         ORDER BY wp.amount DESC
-    """, (SEASON_ID,)).fetchall()
+    """, (season_id,)).fetchall()
 
     chip_and_chair_payout_rows = [
         {
@@ -118,6 +215,10 @@ def main():
         }
         for (pid, name, amount) in chip_and_chair
     ]
+    out.section("ChipAndChairPayouts", chip_and_chair_payout_rows)
+    out.section("ChipAndChairICM", chip_and_chair_icm(
+        chip_and_chair_stacks_rows, payout_policy(season_id).chip_and_chair,
+    ))
 
     # Weekly payouts (sum per week per player)
     payout_totals = cur.execute("""
@@ -126,7 +227,7 @@ def main():
         WHERE season_id = ?
         AND payout_type != 'season_award'
         GROUP BY season_id, week_num, player_id
-    """, (SEASON_ID,)).fetchall()
+    """, (season_id,)).fetchall()
 
     payout_map = {
         (row[1], row[2]): float(row[3] or 0)   # key: (week_num, player_id)
@@ -143,7 +244,7 @@ def main():
     JOIN players p ON p.player_id = wp.player_id
     WHERE wp.season_id = ?
     ORDER BY wp.week_num ASC, wp.finish_place ASC, p.player_name ASC
-""", (SEASON_ID,)).fetchall()
+""", (season_id,)).fetchall()
     
     weekly = cur.execute("""
     SELECT wp.week_num, wp.tournament_date, p.player_name, wp.player_id,
@@ -152,7 +253,7 @@ def main():
     JOIN players p ON p.player_id = wp.player_id
     WHERE wp.season_id = ?
     ORDER BY wp.week_num ASC, wp.finish_place ASC, p.player_name ASC
-    """, (SEASON_ID,)).fetchall()
+    """, (season_id,)).fetchall()
 
     players = cur.execute("""
     SELECT player_id, player_name
@@ -204,14 +305,14 @@ def main():
         }
         for (week, tdate, name, player_id, fp, pts) in weekly
     ]
-
-    build_ts = datetime.now(ZoneInfo("America/New_York")).strftime("%b %d, %Y %I:%M %p %Z")
+    out.section("WeeklyPoints", weekly_rows)
 
 
     # ----------------------------
     # Survival Analytics (backend truth)
     # ----------------------------
-    survival_df = compute_survival_season(conn, SurvivalConfig(season_id=SEASON_ID))
+    survival_cfg = SurvivalConfig(season_id=season_id)
+    survival_df = compute_survival_season(conn, survival_cfg)
 
     survival_rows = [
         {
@@ -223,83 +324,36 @@ def main():
         }
         for r in survival_df.to_dict(orient="records")
     ]
+    out.section("Survival", survival_rows)
 
-    # ----------------------------
-    # Chip & A Chair (backend truth)
-    # ----------------------------
-    rules = ChipAndChairRules(
-        base_stack=6500,
-        season_points_chip_multiplier=150,
-        chip_per_total_elim=50,
-        chip_per_repeat_elim=100,
-        chip_per_hv_elim=250,
-    )
-
-    # --- Eliminations (from SQLite raw_log_events) ---
-    # Your raw_log_events uses:
-    #   event_type = 'Eliminated'
-    #   player_name = eliminated player
-    #   eliminator_player_name = eliminator
-    #
-    # eliminated_player_name is empty in your data, so DO NOT use it.
-
-    # Build a rank map from SeasonTotals (Drop-2 points desc)
-    # (rank 1 = best)
-    sorted_totals = sorted(
-        season_totals_rows,
-        key=lambda r: (float(r.get("SeasonPointsDrop2") or 0), float(r.get("SeasonPointsTotal") or 0)),
-        reverse=True,
-    )
-    rank_by_player = {r["Player"]: i + 1 for i, r in enumerate(sorted_totals)}
-
-    # Get tournament_ids that belong to this season.
-    # Option A (most likely): tournaments has season_id
-    tournament_ids = [
-        row[0]
-        for row in conn.execute(
-            "SELECT tournament_id FROM tournaments WHERE season_id = ?",
-            (SEASON_ID,),
-        ).fetchall()
+    # Per-week survival series (weekly_survival), one row per player per week
+    survival_weekly_rows = [
+        {
+            "Week": int(r["week_num"]),
+            "TournamentDate": r["tournament_date"],
+            "Player": r["player_name"],
+            "PlayerID": int(r["player_id"]),
+            "TournamentMinutes": float(r["tournament_minutes"]),
+            "MinutesSurvived": float(r["minutes_survived"]),
+            "SurvivalPercent": float(r["survival_percent"]),
+        }
+        for r in (
+            load_survival_weekly(conn, survival_cfg)
+            .sort_values(["week_num", "player_name"], kind="stable")
+            .to_dict(orient="records")
+        )
     ]
+    analytics.section("SurvivalWeekly", survival_weekly_rows)
 
-    # If tournament_ids comes back empty, your schema probably links differently.
-    # In that case, we’ll adjust, but try this first.
-
-    eliminations_rows = []
-    if tournament_ids:
-        qmarks = ",".join(["?"] * len(tournament_ids))
-        sql = f"""
-            SELECT
-                tournament_id,
-                event_ts,
-                player_name AS eliminated_player,
-                eliminator_player_name AS eliminator_player
-            FROM raw_log_events
-            WHERE event_type = 'Eliminated'
-            AND tournament_id IN ({qmarks})
-            AND COALESCE(player_name,'') <> ''
-            AND COALESCE(eliminator_player_name,'') <> ''
-        """
-        for tid, event_ts, eliminated, eliminator in conn.execute(sql, tournament_ids).fetchall():
-            eliminations_rows.append({
-                "TournamentID": tid,
-                "EventTS": event_ts,
-                "EliminatedPlayer": eliminated,
-                "EliminatorPlayer": eliminator,
-                "VictimRank": rank_by_player.get(eliminated),
-                "EliminatorRank": rank_by_player.get(eliminator),
-            })
-
-        chip_and_chair_stacks_rows = build_chip_and_chair(
-            season_totals=season_totals_rows,
-            eliminations=eliminations_rows,
-            rules=rules,
-        )
+    # Kaplan-Meier curves (per player, per field size, league-wide)
+    out.section("SurvivalCurves", survival_curves(conn, season_id))
 
+    # Blind-level timeline, eliminations and survival by level
+    analytics.section("BlindLevels", blind_levels(conn, season_id))
 
-    # ----------------------------
-    # Chip & A Chair (backend truth)
-    # ----------------------------
+    # Monte Carlo finish: rank / award / Chip & A Chair odds from the weeks so far
+    out.section("SeasonSimulation", simulate_season(conn, season_id, policy=payout_policy(season_id)))
+    out.section("ChipAndChairRules", rules.__dict__)
 
     # ----------------------------
     # Eliminations Pair Counts (for charts)
@@ -314,7 +368,7 @@ def main():
         WHERE t.season_id = ?
         GROUP BY killer, victim
         ORDER BY killer ASC, victim ASC
-    """, (SEASON_ID,)).fetchall()
+    """, (season_id,)).fetchall()
 
     eliminations_pair_counts_rows = [
         {
@@ -324,28 +378,21 @@ def main():
         }
         for (killer, victim, n) in pair_counts
     ]
+    out.section("EliminationsPairCounts", eliminations_pair_counts_rows)
 
-    payload = {
-        "season_id": SEASON_ID,
-        "build_ts": build_ts,
-        "SeasonTotals": season_totals_rows,
-        "SeasonAwards": season_award_rows,
-
-        # Chip & Chair
-        "ChipAndChairStacks": chip_and_chair_stacks_rows,
-        "ChipAndChairPayouts": chip_and_chair_payout_rows,
+    # ----------------------------
+    # Drop-K sensitivity (standings under every drop rule)
+    # ----------------------------
+    out.section("DropKSensitivity", drop_k_sensitivity(conn, season_id))
 
-        "WeeklyPoints": weekly_rows,
-        "Survival": survival_rows,
-        "ChipAndChairRules": rules.__dict__,
-        "EliminationsPairCounts": eliminations_pair_counts_rows,
-    }
 
-    OUT_PATH.parent.mkdir(parents=True, exist_ok=True)
-    OUT_PATH.write_text(json.dumps(payload, indent=2), encoding="utf-8")
+def main():
+    conn = sqlite3.connect(DB_PATH)
+    try:
+        run(conn, out_path=OUT_PATH)
+    finally:
+        conn.close()
 
-    conn.close()
-print(f"✅ Wrote JSON: {OUT_PATH}")
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
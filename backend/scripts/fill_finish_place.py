@@ -2,103 +2,96 @@ import os
 import sqlite3
 from pathlib import Path
 
-DB_PATH = Path(os.environ.get("POKERLEAGUE_DB", "backend/db/pokerleague.sqlite"))
-SEASON_ID = "spring_2026"
-
-def main():
-    conn = sqlite3.connect(str(DB_PATH))
-    cur = conn.cursor()
+from dirty_tournaments import qmarks
+from season_aggregates import bulk_writes
 
-    # tournaments in season (we use these to scope updates)
-    tournament_ids = [
-        r[0] for r in cur.execute(
-            """
-            SELECT tournament_id
-            FROM tournaments
-            WHERE season_id = ?
-            ORDER BY tournament_date
-            """,
-            (SEASON_ID,),
-        ).fetchall()
-    ]
-
-    updated = 0
-
-    for tid in tournament_ids:
-        # Players who bought in / exist in weekly_points for this tournament
-        players = cur.execute(
-            """
-            SELECT wp.player_id, p.player_name
+DB_PATH = Path(os.environ.get("POKERLEAGUE_DB", "backend/db/pokerleague.sqlite"))
+SEASON_ID = os.environ.get("SEASON_ID", "spring_2026")
+
+# One pass for the whole season (or the scoped tournaments):
+#   roster  - weekly_points rows with the field size n per tournament
+#   outs    - Eliminated rows, first row per (tournament, name) only
+#             (logs sometimes repeat), numbered in event time order
+#   placed  - roster players matched by name: k-th out -> place n - k + 1,
+#             so the last one out is 2nd
+#   winners - the one roster player never eliminated -> 1st (only when
+#             exactly one is left)
+FINISH_PLACES_SQL = """
+    UPDATE weekly_points
+    SET finish_place = f.finish_place
+    FROM (
+        WITH roster AS (
+            SELECT wp.tournament_id, wp.player_id, p.player_name,
+                   COUNT(*) OVER (PARTITION BY wp.tournament_id) AS n
             FROM weekly_points wp
             JOIN players p ON p.player_id = wp.player_id
-            WHERE wp.season_id = ? AND wp.tournament_id = ?
-            """,
-            (SEASON_ID, tid),
-        ).fetchall()
-
-        if not players:
-            continue
-
-        n = len(players)
-        name_to_pid = {name: int(pid) for pid, name in players}
-
-        # Elimination order (player_name holds eliminated player in your logs)
-        elim_names = cur.execute(
-            """
-            SELECT TRIM(player_name) AS eliminated_name
-            FROM raw_log_events
-            WHERE tournament_id = ?
-              AND event_type = 'Eliminated'
-              AND player_name IS NOT NULL
-              AND TRIM(player_name) <> ''
-            ORDER BY raw_event_id ASC
-            """,
-            (tid,),
-        ).fetchall()
-
-        # De-dupe while preserving order (sometimes logs repeat)
-        seen = set()
-        elim_order = []
-        for (nm,) in elim_names:
-            if nm not in seen:
-                seen.add(nm)
-                elim_order.append(nm)
-
-        # Assign finish places:
-        # elim_order[0] => place N, elim_order[1] => N-1, ..., last elim => 2
-        for idx, nm in enumerate(elim_order):
-            pid = name_to_pid.get(nm)
-            if pid is None:
-                continue  # name mismatch; ignore
-            place = n - idx
-            cur.execute(
-                """
-                UPDATE weekly_points
-                SET finish_place = ?
-                WHERE season_id = ? AND tournament_id = ? AND player_id = ?
-                """,
-                (place, SEASON_ID, tid, pid),
-            )
-            updated += cur.rowcount
-
-        # Winner is the one player NOT eliminated
-        eliminated_pids = {name_to_pid[nm] for nm in elim_order if nm in name_to_pid}
-        winner_pids = [pid for pid, _name in players if int(pid) not in eliminated_pids]
-
-        # If we have exactly one winner, set them to 1st
-        if len(winner_pids) == 1:
-            winner_pid = int(winner_pids[0])
-            cur.execute(
-                """
-                UPDATE weekly_points
-                SET finish_place = 1
-                WHERE season_id = ? AND tournament_id = ? AND player_id = ?
-                """,
-                (SEASON_ID, tid, winner_pid),
-            )
-            updated += cur.rowcount
+            WHERE wp.season_id = ? {wp_scope}
+        ),
+        elims AS (
+            SELECT r.tournament_id, TRIM(r.player_name) AS player_name, r.event_epoch, r.raw_event_id,
+                   ROW_NUMBER() OVER (
+                       PARTITION BY r.tournament_id, TRIM(r.player_name)
+                       ORDER BY r.event_epoch NULLS LAST, r.raw_event_id
+                   ) AS dup
+            FROM raw_log_events r
+            JOIN tournaments t ON t.tournament_id = r.tournament_id
+            WHERE t.season_id = ?
+              AND r.event_type = 'Eliminated'
+              AND r.player_name IS NOT NULL
+              AND TRIM(r.player_name) <> ''
+              {r_scope}
+        ),
+        outs AS (
+            SELECT tournament_id, player_name,
+                   ROW_NUMBER() OVER (
+                       PARTITION BY tournament_id
+                       ORDER BY event_epoch NULLS LAST, raw_event_id
+                   ) AS out_num
+            FROM elims
+            WHERE dup = 1
+        ),
+        placed AS (
+            SELECT ro.tournament_id, ro.player_id, ro.n - o.out_num + 1 AS finish_place
+            FROM roster ro
+            JOIN outs o ON o.tournament_id = ro.tournament_id AND o.player_name = ro.player_name
+        ),
+        winners AS (
+            SELECT ro.tournament_id, MIN(ro.player_id) AS player_id, 1 AS finish_place
+            FROM roster ro
+            LEFT JOIN placed pl ON pl.tournament_id = ro.tournament_id AND pl.player_id = ro.player_id
+            WHERE pl.player_id IS NULL
+            GROUP BY ro.tournament_id
+            HAVING COUNT(*) = 1
+        )
+        SELECT * FROM placed
+        UNION ALL
+        SELECT * FROM winners
+    ) f
+    WHERE weekly_points.season_id = ?
+      AND weekly_points.tournament_id = f.tournament_id
+      AND weekly_points.player_id = f.player_id
+"""
+
+
+def run(conn, season_id=None, tournament_ids=None):
+    """tournament_ids: refill just these tournaments (None = whole season)."""
+    season_id = season_id or SEASON_ID
+    cur = conn.cursor()
 
-    conn.commit()
+    if tournament_ids is None:
+        wp_scope = r_scope = ""
+        scope = ()
+    else:
+        scope = tuple(sorted(tournament_ids))
+        wp_scope = f"AND wp.tournament_id IN ({qmarks(scope)})"
+        r_scope = f"AND r.tournament_id IN ({qmarks(scope)})"
+
+    with bulk_writes(conn, [season_id]):
+        cur.execute(
+            FINISH_PLACES_SQL.format(wp_scope=wp_scope, r_scope=r_scope),
+            (season_id, *scope, season_id, *scope, season_id),
+        )
+        updated = cur.rowcount
 
     finish_place_null = cur.execute(
         """
@@ -106,11 +99,19 @@ def main():
         FROM weekly_points
         WHERE season_id = ? AND finish_place IS NULL
         """,
-        (SEASON_ID,),
+        (season_id,),
     ).fetchone()[0]
 
     print(f"✅ fill_finish_place done. updated={updated} finish_place_null={finish_place_null}")
-    conn.close()
+
+
+def main():
+    conn = sqlite3.connect(str(DB_PATH))
+    try:
+        run(conn)
+        conn.commit()
+    finally:
+        conn.close()
 
 
 if __name__ == "__main__":
@@ -1,14 +1,22 @@
+import argparse
 import os
 import sqlite3
+import time
 from pathlib import Path
 
+import numpy as np
+
+from dirty_tournaments import qmarks
+from season_aggregates import bulk_writes
+from scoring_rules import DEFAULT_RULE, season_rule, season_rules
+
 DB_PATH = Path(os.environ.get("POKERLEAGUE_DB", "backend/db/pokerleague.sqlite"))
-SEASON_ID = "spring_2026"
+SEASON_ID = os.environ.get("SEASON_ID", "spring_2026")
 
 
 def points_for_finish(finish_place: int | None) -> float:
     """
-    League rule:
+    League rule (scoring_rules.DEFAULT_RULE, league_flat@v1), one row:
     - 1st place = 8.0
     - each lower place drops by 0.5
     - DNP / no finish place = 0.0
@@ -21,45 +29,72 @@ def points_for_finish(finish_place: int | None) -> float:
     16 -> 0.5
     None -> 0.0
     """
-    if finish_place is None:
-        return 0.0
+    place = np.nan if finish_place is None else int(finish_place)
+    return float(DEFAULT_RULE.points([place])[0])
 
-    return max(0.0, round(8.5 - (0.5 * int(finish_place)), 2))
 
+def write_points(cur, weekly_points_ids, points) -> int:
+    """All (weekly_points_id, points) pairs in one executemany UPDATE."""
+    cur.executemany(
+        "UPDATE weekly_points SET points = ? WHERE weekly_points_id = ?",
+        [(float(p), int(i)) for i, p in zip(weekly_points_ids, points)],
+    )
+    return cur.rowcount
 
-def main():
-    conn = sqlite3.connect(str(DB_PATH))
-    cur = conn.cursor()
 
-    rows = cur.execute(
-        """
-        SELECT weekly_points_id, finish_place
+def rescore(conn, season_ids, tournament_ids=None) -> int:
+    """
+    Score the weekly_points rows of these seasons (optionally just these
+    tournaments) with each season's rule: one SELECT, one vectorized rule
+    call per season, one executemany UPDATE.
+    """
+    season_ids = list(season_ids)
+    if tournament_ids is None:
+        scope_sql, scope = "", ()
+    else:
+        scope = tuple(sorted(tournament_ids))
+        scope_sql = f"AND tournament_id IN ({qmarks(scope)})"
+
+    rows = conn.execute(
+        f"""
+        SELECT season_id, weekly_points_id, finish_place,
+               COUNT(*) OVER (PARTITION BY season_id, tournament_id) AS field_size
         FROM weekly_points
-        WHERE season_id = ?
+        WHERE season_id IN ({qmarks(season_ids)})
+        {scope_sql}
+        ORDER BY season_id
         """,
-        (SEASON_ID,)
+        (*season_ids, *scope),
     ).fetchall()
+    if not rows:
+        return 0
+
+    seasons, ids, places, field_sizes = zip(*rows)
+    seasons = np.asarray(seasons, dtype=object)
+    places = np.array(places, dtype=float)        # None -> NaN
+    field_sizes = np.array(field_sizes, dtype=float)
+    points = np.zeros(len(rows))
 
-    updated = 0
+    for season_id, rule in season_rules(conn, season_ids).items():
+        mask = seasons == season_id
+        if mask.any():
+            points[mask] = rule.points(places[mask], field_sizes[mask])
 
-    for weekly_points_id, finish_place in rows:
-        points = points_for_finish(finish_place)
+    with bulk_writes(conn, season_ids):
+        return write_points(conn.cursor(), ids, points)
 
-        cur.execute(
-            """
-            UPDATE weekly_points
-            SET points = ?
-            WHERE weekly_points_id = ?
-            """,
-            (points, weekly_points_id)
-        )
-        updated += 1
 
-    conn.commit()
+def run(conn, season_id=None, tournament_ids=None):
+    """tournament_ids: rescore just these tournaments (None = whole season)."""
+    season_id = season_id or SEASON_ID
+    cur = conn.cursor()
+
+    rule = season_rule(conn, season_id)
+    updated = rescore(conn, [season_id], tournament_ids)
 
     total = cur.execute(
         "SELECT COUNT(*) FROM weekly_points WHERE season_id = ?",
-        (SEASON_ID,)
+        (season_id,)
     ).fetchone()[0]
 
     null_finish_place = cur.execute(
@@ -69,7 +104,7 @@ def main():
         WHERE season_id = ?
           AND finish_place IS NULL
         """,
-        (SEASON_ID,)
+        (season_id,)
     ).fetchone()[0]
 
     zero_points = cur.execute(
@@ -79,17 +114,34 @@ def main():
         WHERE season_id = ?
           AND COALESCE(points, 0) = 0
         """,
-        (SEASON_ID,)
+        (season_id,)
     ).fetchone()[0]
 
     print(
-        f"✅ fill_points_from_finish done. "
+        f"✅ fill_points_from_finish done ({rule.key}). "
         f"updated={updated} total={total} "
         f"finish_place_null={null_finish_place} points_zero={zero_points}"
     )
 
-    conn.close()
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Fill weekly_points.points from finish_place.")
+    ap.add_argument("--all-seasons", action="store_true", help="rescore every season with its own rule")
+    args = ap.parse_args(argv)
+
+    conn = sqlite3.connect(str(DB_PATH))
+    try:
+        if args.all_seasons:
+            seasons = [r[0] for r in conn.execute("SELECT DISTINCT season_id FROM weekly_points")]
+            t0 = time.perf_counter()
+            updated = rescore(conn, seasons)
+            print(f"✅ rescored {len(seasons)} seasons, {updated} rows in {(time.perf_counter() - t0) * 1000:.1f} ms")
+        else:
+            run(conn)
+        conn.commit()
+    finally:
+        conn.close()
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
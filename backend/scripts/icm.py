@@ -0,0 +1,155 @@
+# backend/scripts/icm.py
+"""
+Independent Chip Model: Chip & A Chair stacks -> dollar equity.
+
+Finish order follows Malmuth-Harville: a player takes the best open place
+with probability stack / chips still in play. Equity is each player's
+expected prize over that order.
+
+Exact: the probability of every set of already-placed players is built
+one place at a time, each set computed once (states that reach the same
+set are merged), so a 16-player field paying 6 places is ~7k sets and a
+few NumPy ops per place. Fields where that state count explodes use
+Monte Carlo: an order is a sort of Exp(1) / stack keys (the smallest key
+takes 1st), so a chunk of trials is one draw and one argpartition.
+
+Usage:
+  python backend/scripts/icm.py                       # stacks from the season JSON
+  python backend/scripts/icm.py --stacks 16875 15900 14100 12000 9800
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+from math import comb
+from pathlib import Path
+
+import numpy as np
+
+from build_weekly_payouts import CHIP_AND_CHAIR_PAYOUTS, payout_policy
+
+SEASON_ID = os.environ.get("SEASON_ID", "spring_2026")
+OUT_DIR = Path("frontend/data")
+
+EXACT_MAX_STATES = 100_000   # placed-player sets the exact model may visit
+TRIALS = 200_000
+CHUNK = 50_000
+SEED = 2026
+
+
+def _check(stacks, payouts) -> tuple[np.ndarray, np.ndarray]:
+    stacks = np.asarray(stacks, dtype=float)
+    if stacks.ndim != 1 or (stacks <= 0).any():
+        raise ValueError("ICM needs a 1-D array of positive stacks")
+    return stacks, np.asarray(payouts, dtype=float)[:len(stacks)]
+
+
+def exact_states(n_players: int, paid: int) -> int:
+    """Placed-player sets the exact model visits: sum of C(n, k), k < paid."""
+    return sum(comb(n_players, k) for k in range(min(paid, n_players)))
+
+
+def icm_exact(stacks, payouts) -> np.ndarray:
+    """Exact ICM equity per player, one layer of placed-player sets per paid place."""
+    stacks, payouts = _check(stacks, payouts)
+    n = len(stacks)
+    if n > 62:
+        raise ValueError("icm_exact tracks placed players in a 64-bit mask; use icm_monte_carlo")
+    total = stacks.sum()
+    bits = np.int64(1) << np.arange(n, dtype=np.int64)
+    equity = np.zeros(n)
+
+    # one row per set of placed players: bitmask, P(exactly they took the top places), their chips
+    masks, prob, placed = np.zeros(1, dtype=np.int64), np.ones(1), np.zeros(1)
+    for place, prize in enumerate(payouts):
+        free = (masks[:, None] & bits[None, :]) == 0
+        p_next = np.where(free, prob[:, None] * stacks[None, :] / (total - placed)[:, None], 0.0)
+        equity += prize * p_next.sum(axis=0)
+        if place == len(payouts) - 1:
+            break
+        state, player = np.nonzero(free)
+        masks, first, inv = np.unique(masks[state] | bits[player], return_index=True, return_inverse=True)
+        prob = np.bincount(inv, weights=p_next[state, player], minlength=len(masks))
+        placed = placed[state[first]] + stacks[player[first]]
+    return equity
+
+
+def icm_monte_carlo(stacks, payouts, trials: int = TRIALS, seed: int = SEED) -> np.ndarray:
+    """ICM equity per player from `trials` sampled finish orders (reproducible per seed)."""
+    stacks, payouts = _check(stacks, payouts)
+    n, paid = len(stacks), len(payouts)
+    rng = np.random.default_rng(seed)
+    equity = np.zeros(n)
+    done = 0
+    while done < trials:
+        size = min(CHUNK, trials - done)
+        keys = rng.standard_exponential((size, n)) / stacks[None, :]
+        top = np.argpartition(keys, paid - 1, axis=1)[:, :paid] if paid < n else np.tile(np.arange(n), (size, 1))
+        top = np.take_along_axis(top, np.argsort(np.take_along_axis(keys, top, axis=1), axis=1), axis=1)
+        equity += np.bincount(top.ravel(), weights=np.tile(payouts, size), minlength=n)
+        done += size
+    return equity / trials
+
+
+def icm_equity(stacks, payouts, trials: int = TRIALS, seed: int = SEED) -> tuple[np.ndarray, str]:
+    """Exact when the field is small enough, Monte Carlo otherwise. Returns (equity, method)."""
+    stacks, payouts = _check(stacks, payouts)
+    if len(stacks) <= 62 and exact_states(len(stacks), len(payouts)) <= EXACT_MAX_STATES:
+        return icm_exact(stacks, payouts), "exact"
+    return icm_monte_carlo(stacks, payouts, trials, seed), "monte_carlo"
+
+
+def chip_and_chair_icm(stack_rows, payouts=CHIP_AND_CHAIR_PAYOUTS) -> dict:
+    """
+    ChipAndChairICM JSON section from ChipAndChairStacks rows: per player
+    the chip share, the chip-proportional share of the prize pool and
+    the ICM equity.
+    """
+    rows = [r for r in stack_rows or [] if (r.get("TotalStack") or 0) > 0]
+    out = {"Payouts": [float(p) for p in payouts], "Method": None, "Players": []}
+    if not rows:
+        return out
+    stacks = np.array([r["TotalStack"] for r in rows], dtype=float)
+    equity, out["Method"] = icm_equity(stacks, payouts)
+    share = stacks / stacks.sum()
+    pool = float(sum(payouts[:len(rows)]))
+    out["Players"] = [
+        {
+            "Player": r["Player"],
+            "TotalStack": int(r["TotalStack"]),
+            "ChipShare": round(float(share[i]), 4),
+            "ChipEquity": round(float(share[i] * pool), 2),
+            "ICMEquity": round(float(equity[i]), 2),
+        }
+        for i, r in enumerate(rows)
+    ]
+    return out
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description="ICM equity for Chip & A Chair stacks.")
+    ap.add_argument("--stacks", type=float, nargs="+", help="default: ChipAndChairStacks from the season JSON")
+    ap.add_argument("--payouts", type=float, nargs="+", default=list(payout_policy(SEASON_ID).chip_and_chair),
+                    help="ladder to price (default: the season's PayoutPolicy)")
+    args = ap.parse_args(argv)
+
+    if args.stacks:
+        rows = [{"Player": f"Seat {i + 1}", "TotalStack": s} for i, s in enumerate(args.stacks)]
+    else:
+        season = json.loads((OUT_DIR / f"{SEASON_ID}.json").read_text(encoding="utf-8"))
+        rows = season.get("ChipAndChairStacks") or []
+    icm = chip_and_chair_icm(rows, args.payouts)
+    print(f"ICM ({icm['Method']}), payouts {icm['Payouts']}")
+    print(f"  {'player':<16} {'stack':>7} {'chips %':>7} {'chip $':>8} {'ICM $':>8}")
+    for r in icm["Players"]:
+        print(
+            f"  {r['Player']:<16} {r['TotalStack']:7d} {r['ChipShare'] * 100:7.2f} "
+            f"{r['ChipEquity']:8.2f} {r['ICMEquity']:8.2f}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,9 +1,16 @@
 import re
 import sys
-import csv
-import sqlite3
+import hashlib
+import os
+import argparse
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
 from pathlib import Path
-from datetime import datetime
+
+from db_utils import connect
+from dirty_tournaments import mark_dirty
+from event_reader import EVENT_COLUMNS, filename_to_iso_date, iter_log_events, read_log_file
 
 FILENAME_PATTERN = re.compile(r"^\d{2}\.\d{2}\.\d{2} log\.csv$")
 
@@ -13,16 +20,9 @@ def validate_csv_filename(filename):
         print("Expected format: mm.dd.yy log.csv (example: 03.14.26 log.csv)")
         sys.exit(1)
 
-DB_PATH = Path("backend/db/pokerleague.sqlite")
+DB_PATH = Path(os.environ.get("POKERLEAGUE_DB", "backend/db/pokerleague.sqlite"))
 DATA_DIR = Path("data/incoming")
-SEASON_ID = "spring_2026"
-
-
-def filename_to_iso_date(filename: str) -> str:
-    # "02.10.26 log.csv" -> "2026-02-10"
-    base = filename.split(" ")[0]  # "02.10.26"
-    dt = datetime.strptime(base, "%m.%d.%y")
-    return dt.strftime("%Y-%m-%d")
+SEASON_ID = os.environ.get("SEASON_ID", "spring_2026")
 
 
 def get_or_create_tournament(cur, season_id: str, iso_date: str, source_file: str) -> int:
@@ -43,75 +43,224 @@ def get_or_create_tournament(cur, season_id: str, iso_date: str, source_file: st
     return int(cur.fetchone()[0])
 
 
-def ingest_one_csv(cur, tournament_id: int, csv_path: Path) -> int:
-    # wipe existing rows for this tournament (safe reruns)
-    cur.execute("DELETE FROM raw_log_events WHERE tournament_id = ?", (tournament_id,))
+def file_sha256(path: Path) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 16), b""):
+            h.update(chunk)
+    return h.hexdigest()
 
-    with open(csv_path, "r", newline="", encoding="utf-8-sig") as f:
-        reader = csv.DictReader(f)
-        rows = list(reader)
 
-    inserted = 0
-    for r in rows:
-        event_ts = (r.get("Time") or "").strip()
-        event_type = (r.get("Event") or "unknown").strip()
-        player_name = (r.get("Players") or "").strip()
-        eliminator_player_name = (r.get("Eliminated By") or "").strip()
-        eliminated_player_name = ""
-
-        pos_text = (r.get("Position") or "").strip()
-        position = int(pos_text) if pos_text.isdigit() else None
-
-        notes = (
-            f"Level={r.get('Level','')}; "
-            f"Chips={r.get('Chips','')}; "
-            f"Amount={r.get('Amount','')}; "
-            f"Table={r.get('Table','')}; "
-            f"Position={r.get('Position','')}"
-        )
+def manifest_status(cur, csv_path: Path) -> tuple[str, int, int, str | None]:
+    """
+    Compare a log CSV against its ingest_manifest row.
 
+    Returns (status, size_bytes, mtime_ns, content_sha256) where status is
+    "new", "changed", "touched" (same bytes, new mtime) or "unchanged".
+    The hash is only computed when size/mtime don't match the manifest.
+    """
+    st = csv_path.stat()
+    row = cur.execute(
+        """
+        SELECT size_bytes, mtime_ns, content_sha256
+        FROM ingest_manifest
+        WHERE source_path = ?
+        """,
+        (csv_path.as_posix(),),
+    ).fetchone()
+
+    if row and row[0] == st.st_size and row[1] == st.st_mtime_ns:
+        return "unchanged", st.st_size, st.st_mtime_ns, row[2]
+
+    sha = file_sha256(csv_path)
+    if row is None:
+        return "new", st.st_size, st.st_mtime_ns, sha
+    if row[2] == sha:
+        return "touched", st.st_size, st.st_mtime_ns, sha
+    return "changed", st.st_size, st.st_mtime_ns, sha
+
+
+def record_manifest(cur, csv_path: Path, size_bytes: int, mtime_ns: int, sha: str,
+                    tournament_id: int | None = None, row_count: int | None = None) -> None:
+    if tournament_id is None:
+        # touched file: keep the tournament/row_count from the last real ingest
         cur.execute(
             """
-            INSERT INTO raw_log_events
-                (tournament_id, event_ts, event_type, player_name, eliminated_player_name, eliminator_player_name, notes, position)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            UPDATE ingest_manifest
+            SET size_bytes = ?, mtime_ns = ?
+            WHERE source_path = ?
             """,
-            (tournament_id, event_ts, event_type, player_name, eliminated_player_name, eliminator_player_name, notes, position),
+            (size_bytes, mtime_ns, csv_path.as_posix()),
         )
-        inserted += 1
+        return
+
+    cur.execute(
+        """
+        INSERT INTO ingest_manifest
+            (source_path, size_bytes, mtime_ns, content_sha256, tournament_id, row_count, ingested_at)
+        VALUES (?, ?, ?, ?, ?, ?, datetime('now'))
+        ON CONFLICT(source_path) DO UPDATE SET
+            size_bytes = excluded.size_bytes,
+            mtime_ns = excluded.mtime_ns,
+            content_sha256 = excluded.content_sha256,
+            tournament_id = excluded.tournament_id,
+            row_count = excluded.row_count,
+            ingested_at = excluded.ingested_at
+        """,
+        (csv_path.as_posix(), size_bytes, mtime_ns, sha, tournament_id, row_count),
+    )
+
+
+INSERT_EVENT_SQL = f"""
+    INSERT INTO raw_log_events (tournament_id, {", ".join(EVENT_COLUMNS)})
+    VALUES ({", ".join("?" * (len(EVENT_COLUMNS) + 1))})
+"""
+
+# rows per executemany() call; bounds memory regardless of log size
+INGEST_BATCH_SIZE = 5000
+
+
+def insert_events(cur, tournament_id: int, events, batch_size: int = INGEST_BATCH_SIZE) -> int:
+    # wipe existing rows for this tournament (safe reruns)
+    cur.execute("DELETE FROM raw_log_events WHERE tournament_id = ?", (tournament_id,))
+
+    inserted = 0
+    batch = []
+    for ev in events:
+        batch.append((tournament_id, *ev))
+        if len(batch) >= batch_size:
+            cur.executemany(INSERT_EVENT_SQL, batch)
+            inserted += len(batch)
+            batch.clear()
+
+    if batch:
+        cur.executemany(INSERT_EVENT_SQL, batch)
+        inserted += len(batch)
 
     return inserted
 
 
-def main():
-    if not DB_PATH.exists():
-        raise SystemExit(f"DB not found: {DB_PATH}")
-    if not DATA_DIR.exists():
-        raise SystemExit(f"Data dir not found: {DATA_DIR}")
+def ingest_one_csv(cur, tournament_id: int, csv_path: Path, tournament_date: str,
+                   batch_size: int = INGEST_BATCH_SIZE) -> int:
+    return insert_events(cur, tournament_id, iter_log_events(csv_path, tournament_date), batch_size)
+
+
+def iter_parsed(todo, jobs: int):
+    """
+    Yield (item, events) for each (path, ...) item in `todo`, in order.
+
+    jobs <= 1 streams each file lazily in-process. Otherwise files are parsed
+    by a process pool with at most 2*jobs files in flight (bounded memory);
+    results are still consumed in input order, so the single writer assigns
+    tournament_ids exactly as a sequential run would.
+    """
+    if jobs <= 1:
+        for item in todo:
+            yield item, iter_log_events(item[0])
+        return
+
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        items = iter(todo)
+        pending = deque(
+            (item, pool.submit(read_log_file, item[0]))
+            for item in islice(items, 2 * jobs)
+        )
+        while pending:
+            item, future = pending.popleft()
+            nxt = next(items, None)
+            if nxt is not None:
+                pending.append((nxt, pool.submit(read_log_file, nxt[0])))
+            yield item, future.result()
+
+
+def run(conn, season_id=None, data_dir=None, force=False, jobs=1):
+    """
+    Ingest every new/changed CSV in data_dir on an open connection.
+
+    Commits after the season row and after each file, so an interrupted
+    backfill resumes from the manifest instead of starting over.
+    """
+    season_id = season_id or SEASON_ID
+    data_dir = data_dir or DATA_DIR
 
-    csv_files = sorted(DATA_DIR.glob("*.csv"))
+    if not data_dir.exists():
+        raise SystemExit(f"Data dir not found: {data_dir}")
+
+    csv_files = sorted(data_dir.glob("*.csv"))
     if not csv_files:
-        raise SystemExit(f"No log CSV files found in {DATA_DIR}")
+        raise SystemExit(f"No log CSV files found in {data_dir}")
 
     for p in csv_files:
         validate_csv_filename(p.name)
 
-    conn = sqlite3.connect(DB_PATH)
     cur = conn.cursor()
 
-    # ensure season exists
-    cur.execute("INSERT OR IGNORE INTO seasons (season_id) VALUES (?)", (SEASON_ID,))
+    # ensure season exists (season_name is NOT NULL; default it to the id)
+    cur.execute(
+        "INSERT OR IGNORE INTO seasons (season_id, season_name) VALUES (?, ?)",
+        (season_id, season_id),
+    )
+    conn.commit()
+
+    counts = {"new": 0, "changed": 0, "touched": 0, "unchanged": 0}
+    todo = []
 
     for p in csv_files:
+        status, size_bytes, mtime_ns, sha = manifest_status(cur, p)
+        if force and status in ("touched", "unchanged"):
+            status = "changed"
+        counts[status] += 1
+
+        if status == "touched":
+            record_manifest(cur, p, size_bytes, mtime_ns, sha)
+            print(f"⏭️  {p.name} unchanged (mtime only)")
+            continue
+        if status == "unchanged":
+            continue
+        todo.append((p, status, size_bytes, mtime_ns, sha))
+    conn.commit()  # manifest touches
+
+    for (p, status, size_bytes, mtime_ns, sha), events in iter_parsed(todo, jobs):
         iso_date = filename_to_iso_date(p.name)
-        tournament_id = get_or_create_tournament(cur, SEASON_ID, iso_date, p.name)
-        inserted = ingest_one_csv(cur, tournament_id, p)
-        print(f"✅ {p.name} -> tournament_id={tournament_id} rows={inserted}")
+        tournament_id = get_or_create_tournament(cur, season_id, iso_date, p.name)
+        inserted = insert_events(cur, tournament_id, events)
+        record_manifest(cur, p, size_bytes, mtime_ns, sha, tournament_id, inserted)
+        mark_dirty(conn, [tournament_id])
+        conn.commit()  # one transaction per file
+        print(f"✅ {p.name} ({status}) -> tournament_id={tournament_id} rows={inserted}")
 
-    conn.commit()
-    conn.close()
-    print("✅ Done ingesting all log CSVs.")
+    # manifest rows whose CSV is gone (rows stay in raw_log_events; reported only)
+    present = {p.as_posix() for p in csv_files}
+    missing = [
+        path for (path,) in cur.execute("SELECT source_path FROM ingest_manifest ORDER BY source_path")
+        if path not in present
+    ]
+    for path in missing:
+        print(f"⚠️  {path} is in the ingest manifest but no longer on disk")
+
+    print(
+        f"✅ Done ingesting log CSVs. new={counts['new']} changed={counts['changed']} "
+        f"unchanged={counts['unchanged'] + counts['touched']} missing={len(missing)}"
+    )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Ingest weekly log CSVs into raw_log_events.")
+    parser.add_argument("--force", action="store_true", help="re-ingest every CSV, ignoring the manifest")
+    parser.add_argument("--jobs", "-j", type=int, default=1,
+                        help="parse files in N worker processes (inserts stay single-writer, in order)")
+    args = parser.parse_args(argv)
+
+    if not DB_PATH.exists():
+        raise SystemExit(f"DB not found: {DB_PATH}")
+
+    conn = connect(DB_PATH, write=True)
+    try:
+        run(conn, force=args.force, jobs=args.jobs)
+        conn.commit()
+    finally:
+        conn.close()
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
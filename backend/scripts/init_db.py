@@ -2,9 +2,24 @@ import os
 import sqlite3
 from pathlib import Path
 
+from dirty_tournaments import mark_all_dirty
+from migrate_db import migrate
+
 DB_PATH = Path(os.environ.get("POKERLEAGUE_DB", "backend/db/pokerleague.sqlite"))
 SCHEMA_PATH = Path("backend/sql/schema.sql")
 
+def run(conn, season_id=None, schema=None):
+    if schema is None:
+        schema = SCHEMA_PATH.read_text(encoding="utf-8")
+    conn.executescript(schema)
+    applied = migrate(conn)
+    print(f"Initialized schema in {DB_PATH}")
+    if applied:
+        # migrations may rewrite event data; recompute every tournament
+        mark_all_dirty(conn)
+        print(f"Applied migrations: {applied}")
+
+
 def main():
     DB_PATH.parent.mkdir(parents=True, exist_ok=True)
 
@@ -18,9 +33,8 @@ def main():
 
     conn = sqlite3.connect(str(DB_PATH))
     try:
-        conn.executescript(schema)
+        run(conn, schema=schema)
         conn.commit()
-        print(f"Initialized schema in {DB_PATH}")
     finally:
         conn.close()
 
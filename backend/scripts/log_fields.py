@@ -0,0 +1,80 @@
+# backend/scripts/log_fields.py
+"""
+Parsers for the free-text columns of the weekly log CSVs.
+
+  Level   "Level 4, 150/300, 15 min."  -> 4     (Break rows -> None)
+          (parse_blinds: -> (150, 300, 15); "1,500/3K" -> 1500, 3000)
+  Chips   "6,500 each"                 -> 6500
+  Amount  "$20.00 each"                -> 2000  (cents)
+  Table   "2"                          -> 2
+
+Every parser returns None for blank / unparseable text.
+"""
+
+from __future__ import annotations
+
+import re
+from decimal import Decimal, InvalidOperation
+
+_LEVEL_RE = re.compile(r"^\s*level\s+(\d+)", re.IGNORECASE)
+_BLINDS_RE = re.compile(
+    r"^\s*level\s+\d+\s*,\s*(\d+(?:[,.]\d+)*[km]?)\s*/\s*(\d+(?:[,.]\d+)*[km]?)(?:\s*,\s*(\d+)\s*min)?",
+    re.IGNORECASE,
+)
+_INT_RE = re.compile(r"-?\d[\d,]*")
+_AMOUNT_RE = re.compile(r"-?\$?\s*(\d[\d,]*(?:\.\d+)?|\.\d+)")
+
+# notes blob written by ingest: "Level=..; Chips=..; Amount=..; Table=..; Position=.."
+_NOTES_RE = re.compile(r"(Level|Chips|Amount|Table|Position)=(.*?)(?=; (?:Chips|Amount|Table|Position)=|$)")
+
+
+def parse_level(text: str | None) -> int | None:
+    m = _LEVEL_RE.match(text or "")
+    return int(m.group(1)) if m else None
+
+
+def _chip_count(text: str) -> int:
+    """ "1,500" -> 1500, "3K" -> 3000, "1.5M" -> 1500000"""
+    s = text.replace(",", "").lower()
+    mult = {"k": 1_000, "m": 1_000_000}.get(s[-1:], 1)
+    return int(round(float(s.rstrip("km")) * mult))
+
+
+def parse_blinds(text: str | None) -> tuple[int, int, int | None] | None:
+    """ "Level 8, 700/1,400, 15 min." -> (700, 1400, 15)"""
+    m = _BLINDS_RE.match(text or "")
+    if not m:
+        return None
+    try:
+        small, big = _chip_count(m.group(1)), _chip_count(m.group(2))
+    except ValueError:
+        return None
+    return small, big, (int(m.group(3)) if m.group(3) else None)
+
+
+def parse_chips(text: str | None) -> int | None:
+    m = _INT_RE.search(text or "")
+    return int(m.group(0).replace(",", "")) if m else None
+
+
+def parse_amount_cents(text: str | None) -> int | None:
+    s = (text or "").strip()
+    m = _AMOUNT_RE.search(s)
+    if not m:
+        return None
+    try:
+        dollars = Decimal(m.group(1).replace(",", ""))
+    except InvalidOperation:
+        return None
+    cents = int((dollars * 100).to_integral_value())
+    return -cents if s.startswith("-") else cents
+
+
+def parse_table(text: str | None) -> int | None:
+    s = (text or "").strip()
+    return int(s) if s.isdigit() else None
+
+
+def parse_notes(notes: str | None) -> dict[str, str]:
+    """Split a legacy notes blob back into {"Level": .., "Chips": .., ...}."""
+    return {k: v for k, v in _NOTES_RE.findall(notes or "")}
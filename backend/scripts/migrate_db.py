@@ -0,0 +1,193 @@
+# backend/scripts/migrate_db.py
+"""
+In-place upgrades for databases created by an older schema.sql.
+
+schema.sql only does CREATE ... IF NOT EXISTS, so new columns on existing
+tables need an ALTER + backfill. Each migration is idempotent and the last
+applied version is kept in PRAGMA user_version. init_db.py runs migrate()
+right after the schema script.
+"""
+
+from __future__ import annotations
+
+import sqlite3
+
+from event_times import EventClock, epoch_to_iso
+from log_fields import parse_amount_cents, parse_chips, parse_level, parse_notes, parse_table
+
+
+def _columns(conn: sqlite3.Connection, table: str) -> set[str]:
+    # table_xinfo also lists generated columns
+    return {row[1] for row in conn.execute(f"PRAGMA table_xinfo({table})")}
+
+
+def _add_columns(conn: sqlite3.Connection, table: str, columns: dict[str, str]) -> None:
+    existing = _columns(conn, table)
+    for name, decl in columns.items():
+        if name not in existing:
+            conn.execute(f"ALTER TABLE {table} ADD COLUMN {name} {decl}")
+
+
+def m001_typed_event_columns(conn: sqlite3.Connection) -> None:
+    """raw_log_events: level / chips / amount_cents / table_num parsed from notes."""
+    _add_columns(conn, "raw_log_events", {
+        "level": "INTEGER",
+        "chips": "INTEGER",
+        "amount_cents": "INTEGER",
+        "table_num": "INTEGER",
+    })
+
+    rows = conn.execute("""
+        SELECT raw_event_id, notes
+        FROM raw_log_events
+        WHERE notes IS NOT NULL
+          AND level IS NULL AND chips IS NULL AND amount_cents IS NULL AND table_num IS NULL
+    """).fetchall()
+
+    updates = []
+    for raw_event_id, notes in rows:
+        f = parse_notes(notes)
+        updates.append((
+            parse_level(f.get("Level")),
+            parse_chips(f.get("Chips")),
+            parse_amount_cents(f.get("Amount")),
+            parse_table(f.get("Table")),
+            raw_event_id,
+        ))
+
+    conn.executemany("""
+        UPDATE raw_log_events
+        SET level = ?, chips = ?, amount_cents = ?, table_num = ?
+        WHERE raw_event_id = ?
+    """, updates)
+
+
+def m002_event_epoch(conn: sqlite3.Connection) -> None:
+    """raw_log_events: absolute event_epoch / event_dt from tournament_date + event_ts."""
+    _add_columns(conn, "raw_log_events", {
+        "event_epoch": "INTEGER",
+        "event_dt": "TEXT",
+    })
+
+    rows = conn.execute("""
+        SELECT r.tournament_id, t.tournament_date, r.raw_event_id, r.event_ts, r.event_type
+        FROM raw_log_events r
+        JOIN tournaments t ON t.tournament_id = r.tournament_id
+        ORDER BY r.tournament_id, r.raw_event_id
+    """).fetchall()
+
+    updates = []
+    clock, clock_tid = None, None
+    for tid, tdate, raw_event_id, event_ts, event_type in rows:
+        if tid != clock_tid:
+            clock, clock_tid = EventClock(tdate), tid
+        epoch = clock.epoch(event_ts, event_type)
+        updates.append((epoch, None if epoch is None else epoch_to_iso(epoch), raw_event_id))
+
+    conn.executemany(
+        "UPDATE raw_log_events SET event_epoch = ?, event_dt = ? WHERE raw_event_id = ?",
+        updates,
+    )
+
+
+def m003_stage_code_fp(conn: sqlite3.Connection) -> None:
+    """build_stage_runs: code_fp, so a stage's code change forces a full recompute."""
+    _add_columns(conn, "build_stage_runs", {"code_fp": "TEXT"})
+
+
+def m004_player_key(conn: sqlite3.Connection) -> None:
+    """players: player_key = TRIM(player_name), indexed for set-based joins."""
+    _add_columns(conn, "players", {
+        "player_key": "TEXT GENERATED ALWAYS AS (TRIM(player_name)) VIRTUAL",
+    })
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_players_key ON players(player_key)")
+
+
+def m005_season_drop_weeks(conn: sqlite3.Connection) -> None:
+    """seasons: drop_weeks = K for the drop-K season total (was the DROPS = 2 constant)."""
+    _add_columns(conn, "seasons", {"drop_weeks": "INTEGER NOT NULL DEFAULT 2"})
+
+
+def m006_season_aggregate_triggers(conn: sqlite3.Connection) -> None:
+    """season_totals / player_season_stats: views + triggers (season_aggregates.py), backfilled."""
+    import season_aggregates
+
+    season_aggregates.install(conn)
+    season_aggregates.refresh(conn)
+
+
+def m007_aggregate_bulk_guard(conn: sqlite3.Connection) -> None:
+    """
+    season_aggregates: aggregate_control + bulk guard on the weekly_points
+    triggers, drop-K from the player's own rows (install() recreates both).
+    """
+    import season_aggregates
+
+    season_aggregates.install(conn)
+    season_aggregates.refresh(conn)
+
+
+def m008_event_epoch_indexes(conn: sqlite3.Connection) -> None:
+    """
+    raw_log_events: a tournament's events of one type in epoch order, and
+    its first / last event, are index seeks (compute_survival).
+    """
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_raw_events_tournament_type_epoch "
+        "ON raw_log_events(tournament_id, event_type, event_epoch)"
+    )
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_raw_events_tournament_epoch ON raw_log_events(tournament_id, event_epoch)"
+    )
+
+
+def m009_stage_season_fp(conn: sqlite3.Connection) -> None:
+    """build_stage_runs: season_fp, so a season-wide input change (scoring rules) forces a full recompute."""
+    _add_columns(conn, "build_stage_runs", {"season_fp": "TEXT"})
+
+
+def m010_survival_partial_indexes(conn: sqlite3.Connection) -> None:
+    """
+    raw_log_events: covering partial indexes over the BuyIn / Eliminated
+    rows only, so compute_survival's first buy-in is a streamed GROUP BY and
+    a player's first elimination an index seek, at little ingest cost.
+    """
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_raw_events_buyins "
+        "ON raw_log_events(tournament_id, event_type, player_name, event_epoch) "
+        "WHERE event_type = 'BuyIn'"
+    )
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_raw_events_eliminations "
+        "ON raw_log_events(tournament_id, event_type, "
+        "COALESCE(NULLIF(TRIM(eliminated_player_name), ''), NULLIF(TRIM(player_name), '')), "
+        "event_epoch, eliminated_player_name, player_name) "
+        "WHERE event_type = 'Eliminated'"
+    )
+
+
+MIGRATIONS = [
+    (1, m001_typed_event_columns),
+    (2, m002_event_epoch),
+    (3, m003_stage_code_fp),
+    (4, m004_player_key),
+    (5, m005_season_drop_weeks),
+    (6, m006_season_aggregate_triggers),
+    (7, m007_aggregate_bulk_guard),
+    (8, m008_event_epoch_indexes),
+    (9, m009_stage_season_fp),
+    (10, m010_survival_partial_indexes),
+]
+
+
+def migrate(conn: sqlite3.Connection) -> list[int]:
+    """Apply pending migrations; returns the versions that ran."""
+    current = conn.execute("PRAGMA user_version").fetchone()[0]
+    applied = []
+    for version, fn in MIGRATIONS:
+        if version <= current:
+            continue
+        fn(conn)
+        conn.execute(f"PRAGMA user_version = {version}")
+        applied.append(version)
+    return applied
@@ -0,0 +1,327 @@
+#!/usr/bin/env python3
+"""
+In-process, incremental build runner: the `make build` stages, in the same
+order, in one interpreter sharing one SQLite connection.
+
+Each stage module exposes run(conn, season_id=...); its main() is a thin
+wrapper that opens its own connection, so every script still runs on its
+own. Here pandas and the stage modules are imported once, the DB is opened
+once, and the runner commits once after each stage (rolling back and
+stopping on the first failure).
+
+Stages declare what they read and write (tables, table columns, files; see
+stage_fingerprints.py), which makes the build a DAG: a stage depends on the
+earlier stages that write what it reads. A stage is skipped when its
+inputs, its own code and its outputs all still match the fingerprints
+recorded in build_stage_runs after its last successful run, so a rebuild
+with no new CSV is close to a no-op.
+
+Stages marked `scoped` take tournament_ids: when they have to run and did
+run before with the same code and the same `season_reads`, they only
+rebuild the tournaments in dirty_tournaments (marked by ingest), so a
+weekly build costs one tournament plus the season-level aggregates.
+season_reads are the reads that are not partitioned by tournament (the
+scoring rules): a change there touches every week, not just the dirty
+ones. Otherwise (first run, code change, season-wide input change,
+--rebuild, or changed inputs with nothing marked dirty) they recompute the
+whole season. The season's dirty set is cleared after a full build.
+check_scoped_build.py compares a scoped build against a clean one.
+
+Usage:
+  python backend/scripts/run_pipeline.py
+  python backend/scripts/run_pipeline.py --only payouts export
+  python backend/scripts/run_pipeline.py --jobs 4      # ingest parse workers
+  python backend/scripts/run_pipeline.py --rebuild     # ignore fingerprints
+  python backend/scripts/run_pipeline.py --graph       # print the DAG
+  python backend/scripts/run_pipeline.py --rebuild --cprofile-dir /tmp/prof
+
+Every build writes build_profile.json (per-stage wall/CPU time, tracemalloc
+peak, SQL statement counts; see stage_profiler.py) next to the season JSON.
+"""
+
+from __future__ import annotations
+
+import argparse
+import importlib
+import os
+import sqlite3
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+
+from db_utils import connect
+from dirty_tournaments import clear_dirty, dirty_tournament_ids
+from stage_fingerprints import FingerprintCache, source_fingerprint, spec_target
+from stage_profiler import StageProfile, StageProfiler
+
+DB_PATH = Path(os.environ.get("POKERLEAGUE_DB", "backend/db/pokerleague.sqlite"))
+SEASON_ID = os.environ.get("SEASON_ID", "spring_2026")
+SCRIPTS_DIR = Path(__file__).resolve().parent
+PROFILE_PATH = Path("frontend/data/build_profile.json")  # next to the season JSON
+
+
+@dataclass(frozen=True)
+class Stage:
+    name: str                       # matches the Makefile target
+    module: str                     # module exposing run(conn, season_id=...)
+    reads: tuple[str, ...] = ()
+    writes: tuple[str, ...] = ()
+    code: tuple[str, ...] = ()      # helper modules whose source is part of the fingerprint
+    always: bool = False            # never skipped
+    scoped: bool = False            # run() takes tournament_ids (dirty tournaments only)
+    season_reads: tuple[str, ...] = ()  # reads not partitioned by tournament; a change unscopes the run
+
+
+# build order; a stage may only read what it or an earlier stage writes
+STAGES = [
+    Stage(
+        "init", "init_db",
+        code=("migrate_db",),
+        always=True,  # schema + migrations; must run before anything is fingerprinted
+    ),
+    Stage(
+        "ingest", "ingest_all_csvs",
+        reads=("data/incoming/*.csv",),
+        writes=("seasons", "tournaments", "raw_log_events", "ingest_manifest"),
+        code=("event_reader", "event_times", "log_fields"),
+    ),
+    Stage(
+        "elims", "build_eliminations",
+        reads=("raw_log_events",),
+        writes=("eliminations",),
+        scoped=True,
+    ),
+    Stage(
+        "points", "build_weekly_points",
+        reads=("tournaments", "raw_log_events(tournament_id, event_type, player_name)", "players"),
+        writes=("players", "weekly_points(season_id, tournament_id, week_num, tournament_date, player_id)"),
+        scoped=True,
+    ),
+    Stage(
+        "survival", "compute_survival",
+        reads=(
+            "tournaments", "players",
+            "raw_log_events(tournament_id, event_type, player_name, eliminated_player_name, event_epoch)",
+        ),
+        writes=("weekly_survival",),
+        scoped=True,
+    ),
+    Stage(
+        "finish", "fill_finish_place",
+        reads=(
+            "tournaments", "players",
+            "raw_log_events(tournament_id, event_type, player_name)",
+            "weekly_points(season_id, tournament_id, player_id)",
+        ),
+        writes=("weekly_points(finish_place)",),
+        scoped=True,
+    ),
+    Stage(
+        "points_from_finish", "fill_points_from_finish",
+        reads=("weekly_points(season_id, tournament_id, finish_place)", "scoring_rules", "season_scoring_rules"),
+        writes=("weekly_points(points)",),
+        code=("scoring_rules",),
+        scoped=True,
+        season_reads=("scoring_rules", "season_scoring_rules"),
+    ),
+    Stage(
+        "totals", "build_season_totals_drop2",
+        reads=(
+            "seasons(season_id, drop_weeks)", "tournaments", "players",
+            "weekly_points(season_id, tournament_id, player_id, points)",
+        ),
+        writes=("season_totals",),
+    ),
+    Stage(
+        "stats", "build_player_season_stats",
+        reads=("players", "weekly_points(season_id, player_id, finish_place)"),
+        writes=("player_season_stats",),
+    ),
+    Stage(
+        "payouts", "build_weekly_payouts",
+        reads=(
+            "players", "season_totals", "player_season_stats",
+            "weekly_points(season_id, tournament_id, week_num, player_id, finish_place)",
+        ),
+        writes=("weekly_payouts",),
+        scoped=True,  # season awards (the season_totals reads) are redone on every run
+    ),
+    Stage(
+        "export", "export_season_json",
+        reads=(
+            "season_totals", "player_season_stats", "weekly_payouts", "weekly_points",
+            "players", "tournaments", "raw_log_events", "eliminations", "weekly_survival",
+            "seasons(season_id, drop_weeks)",
+        ),
+        writes=(
+            "frontend/data/{season_id}.json", "frontend/data/{season_id}.min.json*",
+            "frontend/data/{season_id}.analytics.json", "frontend/data/{season_id}.analytics.min.json*",
+        ),
+        code=(
+            "chip_and_chair", "compute_survival", "survival_curves", "blind_levels", "log_fields",
+            "build_season_totals_drop2", "season_simulator", "icm", "build_weekly_payouts",
+            "season_json_writer",
+        ),
+    ),
+]
+STAGE_NAMES = [s.name for s in STAGES]
+
+
+def stage_dependencies(stages=STAGES) -> dict[str, list[str]]:
+    """stage -> earlier stages that write something it reads."""
+    deps = {}
+    for i, stage in enumerate(stages):
+        reads = {spec_target(s) for s in stage.reads}
+        deps[stage.name] = [
+            up.name for up in stages[:i]
+            if reads & {spec_target(s) for s in up.writes}
+        ]
+    return deps
+
+
+def code_fingerprint(stage: Stage) -> str:
+    return source_fingerprint(SCRIPTS_DIR / f"{m}.py" for m in (stage.module, *stage.code))
+
+
+def _last_run(conn: sqlite3.Connection, stage: Stage, season_id: str):
+    return conn.execute(
+        "SELECT input_fp, output_fp, code_fp, season_fp FROM build_stage_runs WHERE stage = ? AND season_id = ?",
+        (stage.name, season_id),
+    ).fetchone()
+
+
+def _record_run(conn: sqlite3.Connection, stage: Stage, season_id: str,
+                input_fp: str, output_fp: str, code_fp: str, season_fp: str) -> None:
+    conn.execute(
+        """
+        INSERT INTO build_stage_runs (stage, season_id, input_fp, output_fp, code_fp, season_fp, finished_at)
+        VALUES (?, ?, ?, ?, ?, ?, datetime('now'))
+        ON CONFLICT(stage, season_id) DO UPDATE SET
+            input_fp = excluded.input_fp,
+            output_fp = excluded.output_fp,
+            code_fp = excluded.code_fp,
+            season_fp = excluded.season_fp,
+            finished_at = excluded.finished_at
+        """,
+        (stage.name, season_id, input_fp, output_fp, code_fp, season_fp),
+    )
+
+
+def run_pipeline(conn: sqlite3.Connection, season_id: str, only=None,
+                 stage_kwargs: dict | None = None, rebuild=False,
+                 profiler: StageProfiler | None = None) -> list[StageProfile]:
+    """
+    Run (or skip) the stages in order on `conn`.
+
+    `rebuild` is True (every stage) or a collection of stage names to run
+    regardless of fingerprints. Returns one StageProfile per stage.
+    """
+    stage_kwargs = stage_kwargs or {}
+    profiler = profiler or StageProfiler(conn, trace_memory=False)
+    fps = FingerprintCache(conn, season_id)
+    for stage in STAGES:
+        if only and stage.name not in only:
+            continue
+
+        t0 = time.perf_counter()
+        forced = stage.always or rebuild is True or stage.name in (rebuild or ())
+        code_fp = code_fingerprint(stage)
+        last = None if stage.always else _last_run(conn, stage, season_id)
+        outputs_intact = last is not None and last[1] == fps.combined(stage.writes)
+
+        if not forced and outputs_intact and last[0] == fps.combined(stage.reads, code_fp):
+            print(f"⏭️  {stage.name} up to date")
+            profiler.skipped(stage.name, time.perf_counter() - t0)
+            continue
+
+        kwargs = dict(stage_kwargs.get(stage.name, {}))
+        if stage.scoped:
+            # dirty tournaments only if the stage ran before with this code
+            # and these season-wide inputs; its outputs may legitimately
+            # differ (upstream re-inserted rows)
+            dirty = None
+            if (not forced and last is not None and last[2] == code_fp
+                    and last[3] == fps.combined(stage.season_reads)):
+                dirty = dirty_tournament_ids(conn, season_id) or None
+            kwargs["tournament_ids"] = dirty
+            print(f"\n==> {stage.name}" + ("" if dirty is None else f" (tournaments {sorted(dirty)})"))
+        else:
+            print(f"\n==> {stage.name}")
+
+        try:
+            with profiler.run(stage.name, check_s=time.perf_counter() - t0):
+                module = importlib.import_module(stage.module)
+                module.run(conn, season_id=season_id, **kwargs)
+            if stage.always:
+                fps = FingerprintCache(conn, season_id)
+            fps.invalidate(stage.writes)
+            # recorded as of *after* the run, so a stage that reads what it
+            # writes (points: players) is not stale on the next build
+            _record_run(
+                conn, stage, season_id,
+                fps.combined(stage.reads, code_fp), fps.combined(stage.writes), code_fp,
+                fps.combined(stage.season_reads),
+            )
+            conn.commit()
+        except BaseException:
+            conn.rollback()
+            raise
+
+    if not only:
+        clear_dirty(conn, season_id)
+        conn.commit()
+    return profiler.profiles
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description="Run the season build in one process.")
+    ap.add_argument("--only", nargs="+", choices=STAGE_NAMES, metavar="STAGE",
+                    help=f"run just these stages (still in build order): {', '.join(STAGE_NAMES)}")
+    ap.add_argument("--rebuild", action="store_true", help="run every stage, ignoring fingerprints")
+    ap.add_argument("--graph", action="store_true", help="print stage dependencies and exit")
+    ap.add_argument("--jobs", "-j", type=int, default=1, help="ingest: parse files in N worker processes")
+    ap.add_argument("--force", action="store_true", help="ingest: re-ingest every CSV, ignoring the manifest")
+    ap.add_argument("--profile-out", type=Path, help=f"stage profile JSON (default {PROFILE_PATH})")
+    ap.add_argument("--cprofile-dir", type=Path, help="also dump a cProfile <stage>.prof per stage here")
+    ap.add_argument("--no-tracemalloc", action="store_true", help="skip peak-memory tracing (it slows Python-heavy stages)")
+    args = ap.parse_args(argv)
+
+    if args.graph:
+        for name, deps in stage_dependencies().items():
+            print(f"{name:<20} <- {', '.join(deps) or '(sources)'}")
+        return 0
+
+    DB_PATH.parent.mkdir(parents=True, exist_ok=True)
+    conn = connect(DB_PATH, write=True)
+    profiler = StageProfiler(conn, trace_memory=not args.no_tracemalloc, cprofile_dir=args.cprofile_dir)
+    build_ts = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+    try:
+        run_pipeline(
+            conn, SEASON_ID, only=args.only,
+            stage_kwargs={"ingest": {"jobs": args.jobs, "force": args.force}},
+            rebuild=True if args.rebuild else ({"ingest"} if args.force else ()),
+            profiler=profiler,
+        )
+    finally:
+        # written for failed builds too: the last profile is the failing stage
+        profile_path = args.profile_out or PROFILE_PATH
+        profiler.write_json(profile_path, SEASON_ID, build_ts)
+        profiler.record(conn, SEASON_ID, build_ts)
+        conn.commit()
+        conn.close()
+
+    print(f"\n✅ Build done for {SEASON_ID} (profile: {profile_path})")
+    print(f"  {'stage':<20} {'status':<8} {'wall':>8} {'cpu':>8} {'peak MB':>8} {'SQL':>7}")
+    for p in profiler.profiles:
+        peak = "" if p.peak_mem_bytes is None else f"{p.peak_mem_bytes / 1e6:8.1f}"
+        print(
+            f"  {p.stage:<20} {p.status:<8} {p.wall_s:7.3f}s {p.cpu_s + p.cpu_children_s:7.3f}s "
+            f"{peak:>8} {p.sql_statements:>7}"
+        )
+    print(f"  {'total':<20} {'':<8} {sum(p.wall_s for p in profiler.profiles):7.3f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,182 @@
+# backend/scripts/scoring_rules.py
+"""
+Weekly scoring rules: finish place (+ field size) -> points.
+
+A rule is a named, versioned formula with parameters, evaluated over whole
+NumPy arrays (one call per season, no per-row Python). The built-in rules
+live in BUILTIN_RULES; more can be added without code edits as rows in
+scoring_rules (formula = a FORMULAS key, params = JSON), and a season picks
+its rule in season_scoring_rules. Seasons without a row use DEFAULT_RULE.
+
+Formulas (places are float arrays, NaN = no finish place = 0 points):
+  place_linear   max(floor, round(base - step * place, ndigits))
+  field_linear   max(floor, step * (field_size - place + 1))
+  place_table    points[place - 1], `default` past the end of the table
+
+Usage:
+  python backend/scripts/scoring_rules.py --list
+  python backend/scripts/scoring_rules.py --season fall_2026 --set field_size@v1
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sqlite3
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import numpy as np
+
+DB_PATH = Path(os.environ.get("POKERLEAGUE_DB", "backend/db/pokerleague.sqlite"))
+
+
+def _place_linear(places, field_sizes, base, step, floor=0.0, ndigits=2):
+    return np.maximum(floor, np.round(base - step * places, ndigits))
+
+
+def _field_linear(places, field_sizes, step, floor=0.0):
+    return np.maximum(floor, step * (field_sizes - places + 1))
+
+
+def _place_table(places, field_sizes, points, default=0.0):
+    table = np.append(np.asarray(points, dtype=float), default)
+    idx = np.nan_to_num(places, nan=len(table)).astype(np.int64) - 1
+    return table[np.clip(idx, 0, len(table) - 1)]
+
+
+FORMULAS = {
+    "place_linear": _place_linear,
+    "field_linear": _field_linear,
+    "place_table": _place_table,
+}
+
+
+@dataclass(frozen=True)
+class ScoringRule:
+    name: str
+    version: int
+    formula: str
+    params: dict = field(default_factory=dict)
+    description: str = ""
+
+    @property
+    def key(self) -> str:
+        return f"{self.name}@v{self.version}"
+
+    def points(self, finish_places, field_sizes=None) -> np.ndarray:
+        """Points per row; finish_places may hold NaN (no finish -> 0.0)."""
+        places = np.asarray(finish_places, dtype=float)
+        fields = np.full_like(places, np.nan) if field_sizes is None else np.asarray(field_sizes, dtype=float)
+        pts = np.asarray(FORMULAS[self.formula](places, fields, **self.params), dtype=float)
+        return np.where(np.isnan(places), 0.0, pts)
+
+
+BUILTIN_RULES = {
+    (r.name, r.version): r
+    for r in (
+        ScoringRule(
+            "league_flat", 1, "place_linear", {"base": 8.5, "step": 0.5},
+            "1st = 8.0, each place below -0.5, never below 0",
+        ),
+        ScoringRule(
+            "field_size", 1, "field_linear", {"step": 0.5},
+            "0.5 per player finished ahead of, incl. yourself (build_all.py)",
+        ),
+    )
+}
+DEFAULT_RULE = BUILTIN_RULES[("league_flat", 1)]
+
+
+def parse_rule_key(key: str) -> tuple[str, int]:
+    """ "field_size@v1" -> ("field_size", 1)"""
+    name, _, version = key.partition("@v")
+    if not name or not version.isdigit():
+        raise ValueError(f"Bad rule key {key!r} (expected name@vN)")
+    return name, int(version)
+
+
+def load_rules(conn: sqlite3.Connection) -> dict[tuple[str, int], ScoringRule]:
+    """Built-in rules plus any rows in scoring_rules (which win on a clash)."""
+    rules = dict(BUILTIN_RULES)
+    try:
+        rows = conn.execute(
+            "SELECT rule_name, version, formula, params, description FROM scoring_rules"
+        ).fetchall()
+    except sqlite3.OperationalError:  # DB from before scoring_rules
+        return rules
+    for name, version, formula, params, description in rows:
+        if formula not in FORMULAS:
+            raise ValueError(f"scoring rule {name}@v{version}: unknown formula {formula!r}")
+        rules[(name, int(version))] = ScoringRule(
+            name, int(version), formula, json.loads(params or "{}"), description or ""
+        )
+    return rules
+
+
+def season_rules(conn: sqlite3.Connection, season_ids, rules=None) -> dict[str, ScoringRule]:
+    """season_id -> its ScoringRule (DEFAULT_RULE when none is assigned)."""
+    rules = load_rules(conn) if rules is None else rules
+    try:
+        assigned = {
+            season_id: (name, int(version))
+            for season_id, name, version in conn.execute(
+                "SELECT season_id, rule_name, version FROM season_scoring_rules"
+            )
+        }
+    except sqlite3.OperationalError:
+        assigned = {}
+
+    out = {}
+    for season_id in season_ids:
+        key = assigned.get(season_id)
+        if key is not None and key not in rules:
+            raise ValueError(f"season {season_id}: unknown scoring rule {key[0]}@v{key[1]}")
+        out[season_id] = DEFAULT_RULE if key is None else rules[key]
+    return out
+
+
+def season_rule(conn: sqlite3.Connection, season_id: str) -> ScoringRule:
+    return season_rules(conn, [season_id])[season_id]
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description="List scoring rules or assign one to a season.")
+    ap.add_argument("--list", action="store_true", help="list rules and season assignments")
+    ap.add_argument("--season", help="season_id to assign a rule to")
+    ap.add_argument("--set", metavar="NAME@vN", help="rule for --season")
+    args = ap.parse_args(argv)
+
+    conn = sqlite3.connect(str(DB_PATH))
+    try:
+        if args.set:
+            if not args.season:
+                ap.error("--set needs --season")
+            name, version = parse_rule_key(args.set)
+            if (name, version) not in load_rules(conn):
+                ap.error(f"unknown rule {args.set}")
+            conn.execute(
+                """
+                INSERT INTO season_scoring_rules (season_id, rule_name, version) VALUES (?, ?, ?)
+                ON CONFLICT(season_id) DO UPDATE SET rule_name = excluded.rule_name, version = excluded.version
+                """,
+                (args.season, name, version),
+            )
+            conn.commit()
+            print(f"✅ {args.season} scores with {args.set} (rerun points_from_finish to apply)")
+
+        if args.list or not args.set:
+            for rule in load_rules(conn).values():
+                default = " (default)" if rule == DEFAULT_RULE else ""
+                print(f"  {rule.key:<18} {rule.formula:<13} {json.dumps(rule.params)}  {rule.description}{default}")
+            seasons = [r[0] for r in conn.execute("SELECT season_id FROM seasons ORDER BY season_id")]
+            for season_id, rule in season_rules(conn, seasons).items():
+                print(f"  {season_id:<18} -> {rule.key}")
+    finally:
+        conn.close()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
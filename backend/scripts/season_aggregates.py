@@ -0,0 +1,343 @@
+# backend/scripts/season_aggregates.py
+"""
+season_totals and player_season_stats as trigger-maintained aggregates.
+
+Two views compute one (season, player) row from weekly_points:
+  season_totals_calc         total, drop-K total (seasons.drop_weeks, absent
+                             weeks count as 0), weeks in season, weeks played
+  player_season_stats_calc   wins, avg finish (players with a finish only)
+
+Triggers on weekly_points, tournaments, seasons and players upsert just the
+affected rows from those views, so any write (a stage, a backfill, live
+results mid-tournament) leaves both tables current and leaderboard reads
+are plain lookups. install() creates the views, triggers and the unique
+index the upserts need; migrate_db runs it (m006, m007) and backfills.
+
+The weekly_points triggers fire per row, which suits live results but not
+the stages that rewrite a whole season in one statement. Those wrap the
+write in bulk_writes(): aggregate_control.bulk = 1 turns the weekly_points
+triggers off, and the season is refreshed once from the views on the way
+out.
+
+The batch stages (build_season_totals_drop2 / build_player_season_stats)
+remain the from-scratch rebuild, and `verify` compares the tables against
+that full recompute (NumPy / Python, not the views).
+
+Usage:
+  python backend/scripts/season_aggregates.py verify
+  python backend/scripts/season_aggregates.py verify --all-seasons
+  python backend/scripts/season_aggregates.py refresh      # rewrite from the views
+
+  with bulk_writes(conn, [season_id]):
+      conn.execute("UPDATE weekly_points SET ...")
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sqlite3
+from contextlib import contextmanager
+from pathlib import Path
+
+DB_PATH = Path(os.environ.get("POKERLEAGUE_DB", "backend/db/pokerleague.sqlite"))
+SEASON_ID = os.environ.get("SEASON_ID", "spring_2026")
+
+TOTALS_COLUMNS = ("season_points_total", "season_points_drop2", "weeks_in_season", "weeks_played")
+STATS_COLUMNS = ("wins", "avg_finish")
+TOLERANCE = 1e-6
+
+VIEWS_SQL = """
+DROP VIEW IF EXISTS season_totals_calc;
+CREATE VIEW season_totals_calc AS
+SELECT
+  season_id,
+  player_id,
+  ROUND(COALESCE(total, 0), 2) AS season_points_total,
+  ROUND(COALESCE((
+    -- best (weeks - drop_weeks) weeks, absent / NULL-points weeks as 0.0.
+    -- Only the player's own rows are ranked (idx_weekly_points_season_player):
+    -- the (weeks - played) absent zeros sit below every week >= 0 and above
+    -- every week < 0, so a negative week's rank moves down by that many.
+    SELECT SUM(v) FROM (
+      SELECT wp.points AS v, ROW_NUMBER() OVER (ORDER BY wp.points DESC) AS rn
+      FROM weekly_points wp
+      WHERE wp.season_id = b.season_id AND wp.player_id = b.player_id AND wp.points IS NOT NULL
+    )
+    WHERE CASE WHEN v >= 0 THEN rn ELSE rn + MAX(b.weeks_in_season - b.weeks_played, 0) END
+          <= b.weeks_in_season - b.drop_weeks
+  ), 0), 2) AS season_points_drop2,
+  weeks_in_season,
+  weeks_played
+FROM (
+  SELECT
+    s.season_id,
+    p.player_id,
+    s.drop_weeks,
+    (
+      SELECT SUM(wp.points) FROM weekly_points wp
+      WHERE wp.season_id = s.season_id AND wp.player_id = p.player_id
+    ) AS total,
+    (SELECT COUNT(*) FROM tournaments t WHERE t.season_id = s.season_id) AS weeks_in_season,
+    (
+      SELECT COUNT(*) FROM weekly_points wp
+      WHERE wp.season_id = s.season_id AND wp.player_id = p.player_id AND wp.points IS NOT NULL
+    ) AS weeks_played
+  FROM seasons s
+  CROSS JOIN players p
+) b;
+
+DROP VIEW IF EXISTS player_season_stats_calc;
+CREATE VIEW player_season_stats_calc AS
+SELECT
+  season_id,
+  player_id,
+  SUM(CASE WHEN finish_place = 1 THEN 1 ELSE 0 END) AS wins,
+  AVG(CAST(finish_place AS REAL)) AS avg_finish
+FROM weekly_points
+WHERE finish_place IS NOT NULL
+GROUP BY season_id, player_id;
+
+-- one row; bulk = 1 while a stage rewrites weekly_points (bulk_writes)
+CREATE TABLE IF NOT EXISTS aggregate_control (
+  id INTEGER PRIMARY KEY CHECK (id = 1),
+  bulk INTEGER NOT NULL DEFAULT 0
+);
+INSERT OR IGNORE INTO aggregate_control (id, bulk) VALUES (1, 0);
+"""
+
+# weekly_points triggers stand down while bulk_writes() is open
+NOT_BULK = "WHEN COALESCE((SELECT bulk FROM aggregate_control WHERE id = 1), 0) = 0"
+
+
+def _totals_sql(where: str) -> str:
+    """Upsert the season_totals rows matching `where` from season_totals_calc."""
+    return f"""
+  INSERT INTO season_totals (season_id, player_id, {", ".join(TOTALS_COLUMNS)})
+  SELECT season_id, player_id, {", ".join(TOTALS_COLUMNS)}
+  FROM season_totals_calc
+  WHERE {where}
+  ON CONFLICT(season_id, player_id) DO UPDATE SET
+    {", ".join(f"{c} = excluded.{c}" for c in TOTALS_COLUMNS)};
+"""
+
+
+def _stats_sql(where: str) -> str:
+    """Upsert / drop the player_season_stats rows matching `where`."""
+    return f"""
+  INSERT INTO player_season_stats (season_id, player_id, {", ".join(STATS_COLUMNS)})
+  SELECT season_id, player_id, {", ".join(STATS_COLUMNS)}
+  FROM player_season_stats_calc
+  WHERE {where}
+  ON CONFLICT(season_id, player_id) DO UPDATE SET
+    {", ".join(f"{c} = excluded.{c}" for c in STATS_COLUMNS)};
+
+  DELETE FROM player_season_stats
+  WHERE {where}
+    AND NOT EXISTS (
+      SELECT 1 FROM weekly_points wp
+      WHERE wp.season_id = player_season_stats.season_id
+        AND wp.player_id = player_season_stats.player_id
+        AND wp.finish_place IS NOT NULL
+    );
+"""
+
+
+def _refresh_sql(where: str) -> str:
+    return _totals_sql(where) + _stats_sql(where)
+
+
+def _trigger(name: str, event: str, body: str, when: str = "") -> str:
+    return f"DROP TRIGGER IF EXISTS {name};\nCREATE TRIGGER {name}\n{event}\n{when}\nBEGIN\n{body}END;\n"
+
+
+def triggers_sql() -> str:
+    one = "season_id = {r}.season_id AND player_id = {r}.player_id"
+    season = "season_id = {r}.season_id"
+    return "".join([
+        _trigger(
+            "trg_weekly_points_aggregates_insert", "AFTER INSERT ON weekly_points",
+            _refresh_sql(one.format(r="NEW")), NOT_BULK,
+        ),
+        _trigger(
+            "trg_weekly_points_aggregates_delete", "AFTER DELETE ON weekly_points",
+            _refresh_sql(one.format(r="OLD")), NOT_BULK,
+        ),
+        # updates refresh only what the changed columns feed: the stages fill
+        # finish_place and points in separate bulk UPDATEs
+        _trigger(
+            "trg_weekly_points_aggregates_update_key",
+            "AFTER UPDATE OF season_id, tournament_id, player_id ON weekly_points",
+            _refresh_sql(one.format(r="OLD")) + _refresh_sql(one.format(r="NEW")), NOT_BULK,
+        ),
+        _trigger(
+            "trg_weekly_points_aggregates_update_points", "AFTER UPDATE OF points ON weekly_points",
+            _totals_sql(one.format(r="NEW")), NOT_BULK,
+        ),
+        _trigger(
+            "trg_weekly_points_aggregates_update_finish", "AFTER UPDATE OF finish_place ON weekly_points",
+            _stats_sql(one.format(r="NEW")), NOT_BULK,
+        ),
+        # weeks_in_season (and so every drop-K total) follow the tournament list
+        _trigger(
+            "trg_tournaments_aggregates_insert", "AFTER INSERT ON tournaments",
+            _refresh_sql(season.format(r="NEW")),
+        ),
+        _trigger(
+            "trg_tournaments_aggregates_delete", "AFTER DELETE ON tournaments",
+            _refresh_sql(season.format(r="OLD")),
+        ),
+        _trigger(
+            "trg_tournaments_aggregates_update", "AFTER UPDATE OF season_id ON tournaments",
+            _refresh_sql(season.format(r="OLD")) + _refresh_sql(season.format(r="NEW")),
+        ),
+        _trigger(
+            "trg_seasons_aggregates_insert", "AFTER INSERT ON seasons",
+            _refresh_sql(season.format(r="NEW")),
+        ),
+        _trigger(
+            "trg_seasons_aggregates_drop_weeks", "AFTER UPDATE OF drop_weeks ON seasons",
+            _refresh_sql(season.format(r="NEW")),
+        ),
+        _trigger(
+            "trg_seasons_aggregates_delete", "AFTER DELETE ON seasons",
+            "  DELETE FROM season_totals WHERE season_id = OLD.season_id;\n"
+            "  DELETE FROM player_season_stats WHERE season_id = OLD.season_id;\n",
+        ),
+        # every player has a season_totals row (zeros until they play)
+        _trigger(
+            "trg_players_aggregates_insert", "AFTER INSERT ON players",
+            _refresh_sql("player_id = NEW.player_id"),
+        ),
+        _trigger(
+            "trg_players_aggregates_delete", "AFTER DELETE ON players",
+            "  DELETE FROM season_totals WHERE player_id = OLD.player_id;\n"
+            "  DELETE FROM player_season_stats WHERE player_id = OLD.player_id;\n",
+        ),
+    ])
+
+
+def install(conn: sqlite3.Connection) -> None:
+    """Views, triggers and the unique key the upserts need (idempotent)."""
+    conn.executescript(VIEWS_SQL)
+    conn.execute("DROP INDEX IF EXISTS idx_season_totals_season_player")
+    conn.execute(
+        "CREATE UNIQUE INDEX IF NOT EXISTS idx_season_totals_season_player ON season_totals(season_id, player_id)"
+    )
+    conn.executescript(triggers_sql())
+
+
+def refresh(conn: sqlite3.Connection, season_id: str | None = None) -> None:
+    """Rewrite the aggregates from the views (one season, or all when None)."""
+    where, params = ("season_id = ?", (season_id,)) if season_id else ("1 = 1", ())
+    conn.execute(f"DELETE FROM season_totals WHERE {where}", params)
+    conn.execute(f"DELETE FROM player_season_stats WHERE {where}", params)
+    for stmt in _refresh_sql(where).split(";"):  # one `where` per statement
+        if stmt.strip():
+            conn.execute(stmt, params)
+
+
+@contextmanager
+def bulk_writes(conn: sqlite3.Connection, season_ids):
+    """
+    Turn the weekly_points triggers off for a bulk rewrite of these seasons,
+    then refresh each season once (one statement set, not one per row).
+    """
+    conn.execute("UPDATE aggregate_control SET bulk = 1 WHERE id = 1")
+    try:
+        yield
+    finally:
+        conn.execute("UPDATE aggregate_control SET bulk = 0 WHERE id = 1")
+    for season_id in sorted(set(season_ids)):
+        refresh(conn, season_id)
+
+
+def _reference_stats(conn: sqlite3.Connection, season_id: str) -> dict[int, tuple]:
+    wins: dict[int, int] = {}
+    finishes: dict[int, list[int]] = {}
+    for player_id, finish_place in conn.execute(
+        "SELECT player_id, finish_place FROM weekly_points WHERE season_id = ? AND finish_place IS NOT NULL",
+        (season_id,),
+    ):
+        finishes.setdefault(int(player_id), []).append(int(finish_place))
+        wins[int(player_id)] = wins.get(int(player_id), 0) + (finish_place == 1)
+    return {pid: (wins[pid], sum(f) / len(f)) for pid, f in finishes.items()}
+
+
+def _diff(label: str, stored: dict, expected: dict, columns) -> list[str]:
+    problems = []
+    for pid in sorted(set(stored) | set(expected)):
+        got, want = stored.get(pid), expected.get(pid)
+        if got is None or want is None:
+            problems.append(f"{label} player {pid}: {'missing' if got is None else 'unexpected'} row")
+            continue
+        for col, g, w in zip(columns, got, want):
+            if g is None or w is None or abs(float(g) - float(w)) > TOLERANCE:
+                if not (g is None and w is None):
+                    problems.append(f"{label} player {pid}: {col} = {g}, full recompute = {w}")
+    return problems
+
+
+def verify(conn: sqlite3.Connection, season_id: str) -> list[str]:
+    """Mismatches between the stored aggregates and a full recompute ([] = in sync)."""
+    from build_season_totals_drop2 import season_totals_rows
+
+    stored_totals = {
+        int(r[0]): tuple(r[1:])
+        for r in conn.execute(
+            f"SELECT player_id, {', '.join(TOTALS_COLUMNS)} FROM season_totals WHERE season_id = ?",
+            (season_id,),
+        )
+    }
+    expected_totals = {int(r[0]): tuple(r[1:]) for r in season_totals_rows(conn, season_id)}
+
+    stored_stats = {
+        int(r[0]): tuple(r[1:])
+        for r in conn.execute(
+            f"SELECT player_id, {', '.join(STATS_COLUMNS)} FROM player_season_stats WHERE season_id = ?",
+            (season_id,),
+        )
+    }
+    return (
+        _diff("season_totals", stored_totals, expected_totals, TOTALS_COLUMNS)
+        + _diff("player_season_stats", stored_stats, _reference_stats(conn, season_id), STATS_COLUMNS)
+    )
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description="Check or rewrite the trigger-maintained season aggregates.")
+    ap.add_argument("command", choices=("verify", "refresh"))
+    ap.add_argument("--season", default=SEASON_ID)
+    ap.add_argument("--all-seasons", action="store_true")
+    args = ap.parse_args(argv)
+
+    conn = sqlite3.connect(str(DB_PATH))
+    try:
+        seasons = (
+            [r[0] for r in conn.execute("SELECT season_id FROM seasons ORDER BY season_id")]
+            if args.all_seasons else [args.season]
+        )
+        if args.command == "refresh":
+            for season_id in seasons:
+                refresh(conn, season_id)
+            conn.commit()
+            print(f"✅ aggregates rewritten for {', '.join(seasons)}")
+            return 0
+
+        failed = False
+        for season_id in seasons:
+            problems = verify(conn, season_id)
+            if problems:
+                failed = True
+                print(f"❌ {season_id}: {len(problems)} mismatches")
+                for p in problems[:20]:
+                    print(f"   {p}")
+            else:
+                print(f"✅ {season_id}: season_totals and player_season_stats match a full recompute")
+        return 1 if failed else 0
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
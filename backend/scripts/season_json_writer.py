@@ -0,0 +1,180 @@
+# backend/scripts/season_json_writer.py
+"""
+Streaming writer for the season JSON export.
+
+Sections go to disk as they are produced, each serialized once per
+variant: the readable file (indent=2, byte-for-byte what
+json.dumps(payload, indent=2) gave), a compact production file
+(<season>.min.json) and its precompressed siblings (.min.json.gz and
+.min.json.br), so a static host can serve them as-is.
+
+Everything is written to .tmp files first. The last key, content_hash,
+is a SHA-256 of the compact sections minus the volatile ones (build_ts);
+a file whose stored content_hash matches is left alone, so an export
+with nothing new keeps its mtime (and the Last-Modified the pages cache
+on) and its old build_ts.
+
+Usage:
+  with SeasonJsonWriter(Path("frontend/data/spring_2026.json")) as out:
+      out.section("season_id", "spring_2026")
+      ...
+  print(out.report())
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import re
+import zlib
+from pathlib import Path
+
+import brotli
+
+VOLATILE_KEYS = ("build_ts",)   # changes every build; not content
+HASH_KEY = "content_hash"
+_HASH_TAIL_RE = re.compile(rb'"content_hash":\s*"([0-9a-f]{64})"\s*}\s*$')
+
+
+class _Sink:
+    """One output file, written to <path>.tmp and swapped in on commit."""
+
+    def __init__(self, path: Path, encode=None):
+        self.path = path
+        self.tmp = path.with_name(path.name + ".tmp")
+        self.encode = encode
+        self.fh = open(self.tmp, "wb")
+        self.size = 0
+        self.written = False
+
+    def write(self, data: bytes) -> None:
+        if self.encode is not None:
+            data = self.encode.process(data)
+        self.fh.write(data)
+        self.size += len(data)
+
+    def close(self) -> None:
+        if self.encode is not None:
+            data = self.encode.finish()
+            self.fh.write(data)
+            self.size += len(data)
+        self.fh.close()
+
+    def commit(self, keep_existing: bool) -> None:
+        if keep_existing and self.path.exists():
+            self.tmp.unlink()
+            self.size = self.path.stat().st_size
+        else:
+            os.replace(self.tmp, self.path)
+            self.written = True
+
+    def abort(self) -> None:
+        self.fh.close()
+        self.tmp.unlink(missing_ok=True)
+
+
+class _Gzip:
+    """Streaming gzip (zlib wbits=31: mtime 0 in the header, so reproducible)."""
+
+    def __init__(self):
+        self.z = zlib.compressobj(9, zlib.DEFLATED, 31)
+
+    def process(self, data: bytes) -> bytes:
+        return self.z.compress(data)
+
+    def finish(self) -> bytes:
+        return self.z.flush()
+
+
+def stored_hash(path: Path) -> str | None:
+    """content_hash from the tail of an earlier export (None if absent)."""
+    try:
+        with open(path, "rb") as fh:
+            fh.seek(max(0, fh.seek(0, os.SEEK_END) - 256))
+            m = _HASH_TAIL_RE.search(fh.read())
+    except FileNotFoundError:
+        return None
+    return m.group(1).decode() if m else None
+
+
+def compact_path(path: Path) -> Path:
+    return path.with_name(f"{path.stem}.min{path.suffix}")
+
+
+class SeasonJsonWriter:
+    """
+    Writes one JSON object section by section to the readable file, the
+    compact file and the compressed siblings of the compact file.
+    """
+
+    def __init__(self, path: Path, volatile=VOLATILE_KEYS):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.volatile = set(volatile)
+        self.hash = hashlib.sha256()
+        self.count = 0
+        self.changed: dict[Path, bool] = {}
+        mini = compact_path(self.path)
+        self.pretty = _Sink(self.path)
+        self.compact = [
+            _Sink(mini),
+            _Sink(mini.with_name(mini.name + ".gz"), _Gzip()),
+            _Sink(mini.with_name(mini.name + ".br"), brotli.Compressor(quality=11)),
+        ]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            for sink in (self.pretty, *self.compact):
+                sink.abort()
+        return False
+
+    def section(self, key: str, value) -> None:
+        """Write `"key": value` to every variant."""
+        name = json.dumps(key)
+        pretty = json.dumps(value, indent=2).replace("\n", "\n  ")
+        compact = json.dumps(value, separators=(",", ":"))
+        first = self.count == 0
+        self.pretty.write((("{\n  " if first else ",\n  ") + f"{name}: {pretty}").encode("utf-8"))
+        chunk = (("{" if first else ",") + f"{name}:{compact}").encode("utf-8")
+        for sink in self.compact:
+            sink.write(chunk)
+        if key not in self.volatile:
+            self.hash.update(chunk)
+        self.count += 1
+
+    def close(self) -> None:
+        digest = self.hash.hexdigest()
+        self.section(HASH_KEY, digest)
+        self.pretty.write(b"\n}")
+        for sink in self.compact:
+            sink.write(b"}")
+        for sink in (self.pretty, *self.compact):
+            sink.close()
+
+        # the compact file and its siblings are kept or replaced together, so
+        # they always carry the same build_ts (a missing sibling replaces all)
+        self.pretty.commit(keep_existing=stored_hash(self.path) == digest)
+        mini, *siblings = self.compact
+        mini_same = stored_hash(mini.path) == digest and all(s.path.exists() for s in siblings)
+        mini.commit(keep_existing=mini_same)
+        for sink in siblings:
+            sink.commit(keep_existing=mini_same)
+
+    def report(self) -> str:
+        """Byte sizes of every variant vs the readable file, and which were rewritten."""
+        base = self.pretty.size or 1
+        lines = [
+            f"✅ {'Wrote' if self.pretty.written else 'Unchanged'} JSON: {self.path} ({self.pretty.size:,} bytes)"
+        ]
+        for sink in self.compact:
+            state = "written" if sink.written else "unchanged"
+            lines.append(
+                f"   {sink.path.name:<34} {sink.size:>10,} bytes  {sink.size / base:6.1%} of indented  ({state})"
+            )
+        return "\n".join(lines)
@@ -0,0 +1,301 @@
+# backend/scripts/season_simulator.py
+"""
+Monte Carlo season finish: where the Drop-2 standings, the season awards
+and the Chip & A Chair stacks can still end up, from the weeks played so
+far. Award week, award ladder and the number of Chip & A Chair places
+paid come from the season's PayoutPolicy.
+
+Each remaining regular-season week, every player draws one of their own
+weeks so far (points as scored, 0 for a week they missed), so attendance
+and form come from the player's empirical distribution and the season's
+scoring rule is already baked in. A chunk of seasons is one array op:
+draws are (seasons x remaining weeks x players), drop-K totals one
+np.partition, ranks one lexsort. Chunks are seeded from one SeedSequence,
+so results depend on the seed only (not on how many worker processes
+ran them).
+
+Chip & A Chair stacks use the export's rules on each simulated season's
+Drop-2 points and ranks (HV eliminations follow the simulated ranks);
+eliminations are the ones logged in the weeks played so far.
+
+--check reruns an --as-of-week replay on an in-memory copy of the DB with
+the later weeks deleted; the two results must be identical.
+
+Usage:
+  python backend/scripts/season_simulator.py
+  python backend/scripts/season_simulator.py --as-of-week 6 --seasons 100000 --jobs 4
+  python backend/scripts/season_simulator.py --as-of-week 6 --check
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sqlite3
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+
+from build_season_totals_drop2 import points_matrix, season_drops
+from build_weekly_payouts import PayoutPolicy, payout_policy
+from chip_and_chair import ChipAndChairRules
+from dirty_tournaments import qmarks
+
+DB_PATH = Path(os.environ.get("POKERLEAGUE_DB", "backend/db/pokerleague.sqlite"))
+SEASON_ID = os.environ.get("SEASON_ID", "spring_2026")
+
+N_SEASONS = 100_000
+CHUNK = 10_000                            # seasons per array op / per worker task
+SEED = 2026
+
+
+def _simulate_chunk(args):
+    """
+    One chunk of seasons. Returns (rank_counts P x P, award_money P,
+    stack_sum P, chip_leader P, top_stack P) summed over the chunk.
+    """
+    (seed, n, points, won, names_order, drops, remaining,
+     base_chips, killer, victim, rules, season_awards, paid) = args
+    rng = np.random.default_rng(seed)
+    n_players, n_weeks = points.shape
+
+    # draws: one of the player's own weeks per remaining week
+    pick = rng.integers(0, n_weeks, size=(n, remaining, n_players))
+    rows = np.arange(n_players)[None, None, :]
+    drawn = points[rows, pick]                                            # n x remaining x P
+    wins = won.sum(axis=1)[None, :] + won[rows, pick].sum(axis=1)
+    season = np.concatenate(
+        [np.broadcast_to(points[None, :, :], (n, n_players, n_weeks)), drawn.transpose(0, 2, 1)],
+        axis=2,
+    )                                                                     # n x P x weeks
+    total = np.round(season.sum(axis=2), 2)
+    if drops <= 0:
+        drop_k = total
+    elif season.shape[2] <= drops:
+        drop_k = np.zeros_like(total)
+    else:
+        drop_k = np.round(np.partition(season, drops - 1, axis=2)[:, :, drops:].sum(axis=2), 2)
+
+    # standings as SeasonAwards: Drop-2, total, wins, name, all desc
+    name_key = np.broadcast_to(names_order[None, :], total.shape)
+    order = np.lexsort((-name_key, -wins, -total, -drop_k), axis=1)
+    rank = np.empty_like(order)
+    np.put_along_axis(rank, order, np.arange(n_players)[None, :], axis=1)   # 0-based
+    rank_counts = np.bincount(
+        (np.arange(n_players)[None, :] * n_players + rank).ravel(), minlength=n_players * n_players
+    ).reshape(n_players, n_players)
+
+    awards = np.zeros(n_players + 1)
+    awards[:len(season_awards)] = season_awards[:n_players]
+    award_money = awards[np.minimum(rank, n_players)].sum(axis=0)
+
+    # dense Drop-2 rank (ties share), as chip_and_chair.dense_ranks_by_drop2
+    by_drop = np.take_along_axis(drop_k, order, axis=1)
+    dense_sorted = np.cumsum(np.c_[np.ones(n, dtype=bool), by_drop[:, 1:] != by_drop[:, :-1]], axis=1)
+    dense = np.empty_like(dense_sorted)
+    np.put_along_axis(dense, order, dense_sorted, axis=1)
+    dense = np.c_[dense, np.full(n, 999)]                                   # index -1 -> unranked
+
+    # Chip & A Chair: base + fixed elim chips + points chips + HV elims (simulated ranks)
+    hv = (dense[:, victim] <= rules.hv_victim_rank_max) & (dense[:, killer] >= rules.hv_eliminator_rank_min)
+    hv_count = np.zeros((n, n_players + 1))
+    np.add.at(hv_count.T, killer, hv.T)
+    stacks = (
+        base_chips[None, :]
+        + np.round(drop_k * rules.season_points_chip_multiplier)
+        + np.trunc(hv_count[:, :n_players] * rules.chip_per_hv_elim)
+    )
+    stack_order = np.lexsort((name_key, -stacks), axis=1)
+    stack_rank = np.empty_like(stack_order)
+    np.put_along_axis(stack_rank, stack_order, np.arange(n_players)[None, :], axis=1)
+
+    return (
+        rank_counts,
+        award_money,
+        stacks.sum(axis=0),
+        (stack_rank == 0).sum(axis=0),
+        (stack_rank < paid).sum(axis=0),
+    )
+
+
+def _eliminations(conn, season_id, tournament_ids):
+    """Eliminations logged in these tournaments (the weeks played so far)."""
+    scope = [int(t) for t in tournament_ids]
+    if not scope:
+        return []
+    return conn.execute(
+        f"""
+        SELECT TRIM(r.eliminator_player_name), TRIM(r.player_name)
+        FROM raw_log_events r
+        JOIN tournaments t ON t.tournament_id = r.tournament_id
+        WHERE t.season_id = ?
+          AND r.tournament_id IN ({qmarks(scope)})
+          AND r.event_type = 'Eliminated'
+          AND COALESCE(r.player_name, '') <> ''
+          AND COALESCE(r.eliminator_player_name, '') <> ''
+        """,
+        (season_id, *scope),
+    ).fetchall()
+
+
+def simulate_season(conn: sqlite3.Connection, season_id=None, n_seasons: int = N_SEASONS,
+                    seed: int = SEED, jobs: int = 1, as_of_week: int | None = None,
+                    rules: ChipAndChairRules = ChipAndChairRules(),
+                    policy: PayoutPolicy | None = None) -> dict:
+    """
+    Simulate the rest of the regular season n_seasons times. Returns the
+    SeasonSimulation JSON section: per player, the probability of each
+    final Drop-2 rank, of each season award, and Chip & A Chair stack
+    outcomes. as_of_week pretends only weeks 1..as_of_week were played.
+    policy: the season's payouts (payout_policy(season_id) if None).
+    """
+    season_id = season_id or SEASON_ID
+    policy = policy or payout_policy(season_id)
+    season_awards, paid = tuple(policy.season_awards), len(policy.chip_and_chair)
+    drops = season_drops(conn, season_id)
+    player_ids, tournament_ids, points, played = points_matrix(conn, season_id)
+    won = np.zeros(points.shape)
+    winners = conn.execute(
+        "SELECT player_id, tournament_id FROM weekly_points WHERE season_id = ? AND finish_place = 1",
+        (season_id,),
+    ).fetchall()
+    for pid, tid in winners:
+        pi, ti = np.flatnonzero(player_ids == pid), np.flatnonzero(tournament_ids == tid)
+        won[pi, ti] = 1.0
+    weeks = min(points.shape[1], policy.award_week if as_of_week is None else as_of_week)
+    points, played, won = points[:, :weeks], played[:, :weeks], won[:, :weeks]
+    tournament_ids = tournament_ids[:weeks]
+    keep = played.any(axis=1)
+    player_ids, points, won = player_ids[keep], points[keep], won[keep]
+    n_players = len(player_ids)
+    remaining = policy.award_week - weeks
+    out = {
+        "Seasons": 0, "Seed": seed, "WeeksPlayed": weeks, "WeeksRemaining": max(remaining, 0),
+        "Awards": [float(a) for a in season_awards], "Players": [],
+    }
+    if not n_players:
+        return out
+    if remaining <= 0:
+        n_seasons, remaining = 1, 0            # nothing left to draw: the one outcome
+
+    names = dict(conn.execute("SELECT player_id, player_name FROM players").fetchall())
+    player_names = [names[int(pid)] for pid in player_ids]
+    names_order = np.argsort(np.argsort(np.array(player_names, dtype=object).astype(str)))
+    index = {name.strip(): i for i, name in enumerate(player_names)}
+
+    # chips that don't depend on the simulated points: base + elims + repeat tiers
+    elims = _eliminations(conn, season_id, tournament_ids)
+    killer = np.array([index.get(k, -1) for k, _ in elims], dtype=np.int64)
+    victim = np.array([index.get(v, -1) for _, v in elims], dtype=np.int64)
+    base_chips = np.full(n_players, float(rules.base_stack))
+    mine = killer >= 0
+    base_chips += np.trunc(np.bincount(killer[mine], minlength=n_players) * rules.chip_per_total_elim)
+    pairs, pair_n = np.unique(np.c_[killer, victim][mine], axis=0, return_counts=True)
+    for pair_killer, cnt in zip(pairs[:, 0] if len(pairs) else [], pair_n):
+        if cnt >= 2:
+            base_chips[pair_killer] += rules.chip_per_repeat_elim if cnt == 2 else rules.chip_per_hv_elim
+
+    sizes = [CHUNK] * (n_seasons // CHUNK) + ([n_seasons % CHUNK] if n_seasons % CHUNK else [])
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    tasks = [
+        (s, n, points, won, names_order, drops, remaining, base_chips, killer, victim, rules,
+         season_awards, paid)
+        for s, n in zip(seeds, sizes)
+    ]
+    if jobs > 1 and len(tasks) > 1:
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            results = list(pool.map(_simulate_chunk, tasks))
+    else:
+        results = [_simulate_chunk(t) for t in tasks]
+    rank_counts, award_money, stack_sum, chip_leader, top_stack = (sum(r[i] for r in results) for i in range(5))
+
+    p_rank = rank_counts / n_seasons
+    out["Seasons"] = n_seasons
+    out["Players"] = sorted(
+        (
+            {
+                "Player": player_names[i],
+                "PlayerID": int(player_ids[i]),
+                "ExpectedRank": round(float(p_rank[i] @ np.arange(1, n_players + 1)), 2),
+                "RankProb": [round(float(x), 4) for x in p_rank[i]],
+                "AwardProb": [round(float(x), 4) for x in p_rank[i, :len(season_awards)]],
+                "ExpectedAward": round(float(award_money[i] / n_seasons), 2),
+                "ChipAndChair": {
+                    "ExpectedStack": round(float(stack_sum[i] / n_seasons)),
+                    "ChipLeaderProb": round(float(chip_leader[i] / n_seasons), 4),
+                    f"Top{paid}StackProb": round(float(top_stack[i] / n_seasons), 4),
+                },
+            }
+            for i in range(n_players)
+        ),
+        key=lambda r: (r["ExpectedRank"], r["Player"]),
+    )
+    return out
+
+
+def check_as_of(conn: sqlite3.Connection, season_id=None, as_of_week: int = 1, **kwargs) -> bool:
+    """
+    simulate_season(as_of_week=N) against a copy of the DB that only has the
+    season's first N tournaments (date order, as points_matrix): a replay
+    must not see anything from the weeks after N.
+    """
+    season_id = season_id or SEASON_ID
+    replay = simulate_season(conn, season_id, as_of_week=as_of_week, **kwargs)
+
+    truncated = sqlite3.connect(":memory:")
+    try:
+        conn.backup(truncated)
+        later = [r[0] for r in truncated.execute(
+            "SELECT tournament_id FROM tournaments WHERE season_id = ? ORDER BY tournament_date",
+            (season_id,),
+        ).fetchall()[as_of_week:]]
+        if later:
+            for table in ("weekly_points", "raw_log_events", "tournaments"):
+                truncated.execute(f"DELETE FROM {table} WHERE tournament_id IN ({qmarks(later)})", later)
+        truncated.commit()
+        return replay == simulate_season(truncated, season_id, **kwargs)
+    finally:
+        truncated.close()
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description="Monte Carlo projection of the season finish.")
+    ap.add_argument("--seasons", type=int, default=N_SEASONS)
+    ap.add_argument("--seed", type=int, default=SEED)
+    ap.add_argument("--jobs", "-j", type=int, default=1, help="worker processes")
+    ap.add_argument("--as-of-week", type=int, help="simulate from the standings after this week")
+    ap.add_argument("--check", action="store_true",
+                    help="compare the --as-of-week replay with a DB truncated to those weeks")
+    args = ap.parse_args(argv)
+
+    conn = sqlite3.connect(str(DB_PATH))
+    try:
+        if args.check:
+            if args.as_of_week is None:
+                ap.error("--check needs --as-of-week")
+            ok = check_as_of(conn, as_of_week=args.as_of_week, n_seasons=args.seasons,
+                             seed=args.seed, jobs=args.jobs)
+            print(f"{'✅' if ok else '❌'} week {args.as_of_week} replay "
+                  f"{'matches' if ok else 'differs from'} a DB truncated to weeks 1..{args.as_of_week}")
+            return 0 if ok else 1
+        sim = simulate_season(conn, n_seasons=args.seasons, seed=args.seed, jobs=args.jobs,
+                              as_of_week=args.as_of_week)
+    finally:
+        conn.close()
+    n_awards, paid = len(sim["Awards"]), len(payout_policy(SEASON_ID).chip_and_chair)
+    print(f"{SEASON_ID}: {sim['Seasons']:,} seasons from week {sim['WeeksPlayed']} "
+          f"({sim['WeeksRemaining']} to play, seed {sim['Seed']})")
+    print(f"  {'player':<16} {'E[rank]':>7} {'P(1st)':>7} {f'P(top{n_awards})':>7} "
+          f"{'E[award]':>8} {f'P(CC top{paid})':>10}")
+    for r in sim["Players"]:
+        print(
+            f"  {r['Player']:<16} {r['ExpectedRank']:7.2f} {r['AwardProb'][0]:7.3f} "
+            f"{sum(r['AwardProb']):7.3f} {r['ExpectedAward']:8.2f} "
+            f"{r['ChipAndChair'][f'Top{paid}StackProb']:10.3f}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
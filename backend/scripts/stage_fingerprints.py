@@ -0,0 +1,137 @@
+# backend/scripts/stage_fingerprints.py
+"""
+Fingerprints for the incremental build (see run_pipeline.py).
+
+A stage declares what it reads and writes as specs:
+  "raw_log_events"                           whole table
+  "weekly_points(season_id, finish_place)"   just those columns
+  "data/incoming/*.csv"                      files (anything with a "/"),
+                                             "{season_id}" is filled in
+
+Tables hash as row count + sha256 over the selected columns in rowid order,
+except tables listed in table_versions (raw_log_events), which are too big
+to re-read every build: those use (version, count, max rowid), kept exact by
+the delete/update triggers in schema.sql. Files hash as sorted (path, size,
+mtime_ns), the same cheap check the ingest manifest uses.
+
+Column specs let a stage that fills one column of a shared table
+(fill_finish_place -> weekly_points.finish_place) ignore the columns other
+stages write, so reruns don't cascade.
+"""
+
+from __future__ import annotations
+
+import glob
+import hashlib
+import json
+import re
+import sqlite3
+from pathlib import Path
+
+_TABLE_SPEC_RE = re.compile(r"^\s*(\w+)\s*(?:\(([^)]*)\))?\s*$")
+_FETCH_ROWS = 10_000
+
+
+def is_file_spec(spec: str) -> bool:
+    return "/" in spec
+
+
+def parse_table_spec(spec: str) -> tuple[str, tuple[str, ...]]:
+    """ "weekly_points(season_id, points)" -> ("weekly_points", ("season_id", "points"))"""
+    m = _TABLE_SPEC_RE.match(spec)
+    if not m:
+        raise ValueError(f"Bad table spec: {spec!r}")
+    cols = tuple(c.strip() for c in (m.group(2) or "").split(",") if c.strip())
+    return m.group(1), cols
+
+
+def spec_target(spec: str) -> str:
+    """Table name or file pattern a spec refers to (for dependency edges)."""
+    return spec if is_file_spec(spec) else parse_table_spec(spec)[0]
+
+
+def _table_version(conn: sqlite3.Connection, table: str) -> int | None:
+    try:
+        row = conn.execute(
+            "SELECT version FROM table_versions WHERE table_name = ?", (table,)
+        ).fetchone()
+    except sqlite3.OperationalError:  # DB from before table_versions
+        return None
+    return None if row is None else int(row[0])
+
+
+def table_fingerprint(conn: sqlite3.Connection, spec: str) -> str:
+    table, cols = parse_table_spec(spec)
+    exists = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (table,)
+    ).fetchone()
+    if not exists:
+        return "missing"
+
+    version = _table_version(conn, table)
+    if version is not None:
+        count, max_rowid = conn.execute(f"SELECT COUNT(*), MAX(rowid) FROM {table}").fetchone()
+        return f"v{version}:{count}:{max_rowid}"
+
+    h = hashlib.sha256()
+    n = 0
+    cur = conn.execute(f"SELECT {', '.join(cols) or '*'} FROM {table} ORDER BY rowid")
+    while True:
+        rows = cur.fetchmany(_FETCH_ROWS)
+        if not rows:
+            break
+        h.update(repr(rows).encode("utf-8"))
+        n += len(rows)
+    return f"{n}:{h.hexdigest()}"
+
+
+def files_fingerprint(pattern: str) -> str:
+    entries = []
+    for path in sorted(glob.glob(pattern)):
+        st = Path(path).stat()
+        entries.append((Path(path).as_posix(), st.st_size, st.st_mtime_ns))
+    if not entries:
+        return "missing"
+    return f"{len(entries)}:{hashlib.sha256(repr(entries).encode('utf-8')).hexdigest()}"
+
+
+def source_fingerprint(paths) -> str:
+    h = hashlib.sha256()
+    for path in paths:
+        h.update(Path(path).read_bytes())
+    return h.hexdigest()
+
+
+class FingerprintCache:
+    """
+    Memoizes spec fingerprints within one build; the runner calls
+    invalidate() with a stage's writes after it runs.
+    """
+
+    def __init__(self, conn: sqlite3.Connection, season_id: str):
+        self.conn = conn
+        self.season_id = season_id
+        self._cache: dict[str, str] = {}
+
+    def resolve(self, spec: str) -> str:
+        return spec.format(season_id=self.season_id)
+
+    def get(self, spec: str) -> str:
+        spec = self.resolve(spec)
+        if spec not in self._cache:
+            if is_file_spec(spec):
+                self._cache[spec] = files_fingerprint(spec)
+            else:
+                self._cache[spec] = table_fingerprint(self.conn, spec)
+        return self._cache[spec]
+
+    def combined(self, specs, extra: str = "") -> str:
+        doc = {spec: self.get(spec) for spec in specs}
+        doc["_code"] = extra
+        return hashlib.sha256(json.dumps(doc, sort_keys=True).encode("utf-8")).hexdigest()
+
+    def invalidate(self, specs) -> None:
+        targets = {spec_target(self.resolve(s)) for s in specs}
+        for key in list(self._cache):
+            if spec_target(key) in targets:
+                del self._cache[key]
@@ -0,0 +1,177 @@
+# backend/scripts/stage_profiler.py
+"""
+Per-stage instrumentation for run_pipeline.py.
+
+For each stage that runs, records wall and CPU time, the tracemalloc peak,
+and every SQL statement the stage issues on the shared connection (via
+set_trace_callback). Statements are normalized (literals -> ?) and counted,
+so an N+1 loop shows up as one statement with a large count. Trigger
+programs a statement fires are counted apart (sql_trigger_calls), so one
+bulk INSERT stays one statement. Optionally dumps a cProfile per stage.
+
+run_pipeline writes the profiles to build_profile.json next to the season
+JSON and appends one row per stage to build_profile_runs, so the numbers
+can be compared across builds.
+"""
+
+from __future__ import annotations
+
+import cProfile
+import json
+import os
+import re
+import sqlite3
+import time
+import tracemalloc
+from collections import Counter
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+
+_SQL_LITERAL_RE = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+TOP_STATEMENTS = 5
+
+
+def normalize_sql(sql: str) -> str:
+    """Expanded SQL from the trace callback -> literal-free, one-line shape."""
+    return " ".join(_SQL_LITERAL_RE.sub("?", sql).split())
+
+
+class SqlTrace:
+    """
+    set_trace_callback target that counts top-level statements. SQLite calls
+    back once per statement and again each time it enters a trigger program,
+    reporting the outer statement's text both times; a callback identical to
+    the previous one is therefore a trigger sub-statement, not a new
+    statement. (So is a statement re-run verbatim back to back: it counts
+    once.)
+    """
+
+    def __init__(self):
+        self.statements: Counter = Counter()
+        self.trigger_calls = 0
+        self._last: str | None = None
+
+    def __call__(self, sql: str) -> None:
+        if sql == self._last:
+            self.trigger_calls += 1
+            return
+        self._last = sql
+        self.statements[normalize_sql(sql)] += 1
+
+
+@dataclass
+class StageProfile:
+    stage: str
+    status: str = "ran"                 # "ran" | "skipped"
+    wall_s: float = 0.0                 # whole stage, incl. fingerprint checks
+    check_s: float = 0.0                # fingerprint checks alone
+    cpu_s: float = 0.0
+    cpu_children_s: float = 0.0         # e.g. ingest --jobs workers
+    peak_mem_bytes: int | None = None
+    sql_statements: int = 0             # top-level statements
+    sql_distinct: int = 0
+    sql_trigger_calls: int = 0          # trigger programs those statements fired
+    sql_by_verb: dict = field(default_factory=dict)
+    sql_top: list = field(default_factory=list)   # [{"sql": ..., "count": n}]
+    cprofile: str | None = None
+
+
+class StageProfiler:
+    def __init__(self, conn: sqlite3.Connection, trace_memory: bool = True, cprofile_dir: Path | None = None):
+        self.conn = conn
+        self.trace_memory = trace_memory
+        self.cprofile_dir = cprofile_dir
+        self.profiles: list[StageProfile] = []
+
+    def skipped(self, stage: str, check_s: float) -> StageProfile:
+        prof = StageProfile(stage, status="skipped", wall_s=check_s, check_s=check_s)
+        self.profiles.append(prof)
+        return prof
+
+    @contextmanager
+    def run(self, stage: str, check_s: float = 0.0):
+        """Wrap one stage's run(); the profile is recorded even if it raises."""
+        prof = StageProfile(stage, check_s=check_s)
+        self.profiles.append(prof)
+
+        trace = SqlTrace()
+        self.conn.set_trace_callback(trace)
+
+        started_tracing = False
+        if self.trace_memory:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                started_tracing = True
+            tracemalloc.reset_peak()
+
+        profiler = cProfile.Profile() if self.cprofile_dir else None
+        t_wall, t_cpu, t_os = time.perf_counter(), time.process_time(), os.times()
+        if profiler:
+            profiler.enable()
+        try:
+            yield prof
+        finally:
+            if profiler:
+                profiler.disable()
+            t_os_end = os.times()
+            prof.cpu_s = time.process_time() - t_cpu
+            prof.cpu_children_s = (
+                (t_os_end.children_user - t_os.children_user)
+                + (t_os_end.children_system - t_os.children_system)
+            )
+            prof.wall_s = check_s + time.perf_counter() - t_wall
+
+            if self.trace_memory:
+                prof.peak_mem_bytes = tracemalloc.get_traced_memory()[1]
+                if started_tracing:
+                    tracemalloc.stop()
+            self.conn.set_trace_callback(None)
+
+            statements = trace.statements
+            prof.sql_statements = sum(statements.values())
+            prof.sql_distinct = len(statements)
+            prof.sql_trigger_calls = trace.trigger_calls
+            verbs = Counter()
+            for sql, n in statements.items():
+                verbs[(sql.split(" ", 1)[0] or "?").upper()] += n
+            prof.sql_by_verb = dict(verbs.most_common())
+            prof.sql_top = [
+                {"sql": sql[:200], "count": n} for sql, n in statements.most_common(TOP_STATEMENTS)
+            ]
+
+            if profiler:
+                self.cprofile_dir.mkdir(parents=True, exist_ok=True)
+                out = self.cprofile_dir / f"{stage}.prof"
+                profiler.dump_stats(out)
+                prof.cprofile = out.as_posix()
+
+    def write_json(self, path: Path, season_id: str, build_ts: str) -> None:
+        doc = {
+            "season_id": season_id,
+            "build_ts": build_ts,
+            "total_wall_s": round(sum(p.wall_s for p in self.profiles), 6),
+            "stages": [asdict(p) for p in self.profiles],
+        }
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(doc, indent=2), encoding="utf-8")
+
+    def record(self, conn: sqlite3.Connection, season_id: str, build_ts: str) -> None:
+        try:
+            self._insert(conn, season_id, build_ts)
+        except sqlite3.OperationalError as e:  # e.g. --only on a DB init hasn't upgraded
+            print(f"⚠️  build_profile_runs not recorded: {e}")
+
+    def _insert(self, conn: sqlite3.Connection, season_id: str, build_ts: str) -> None:
+        conn.executemany(
+            """
+            INSERT INTO build_profile_runs
+                (build_ts, season_id, stage, status, wall_s, cpu_s, peak_mem_bytes, sql_statements)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+            [
+                (build_ts, season_id, p.stage, p.status, p.wall_s, p.cpu_s + p.cpu_children_s,
+                 p.peak_mem_bytes, p.sql_statements)
+                for p in self.profiles
+            ],
+        )
@@ -0,0 +1,178 @@
+# backend/scripts/survival_curves.py
+"""
+Kaplan-Meier survival curves from weekly_survival (compute_survival.py).
+
+Time is normalized: survival_percent, the share of the tournament a player
+lasted (0..1), so tournaments of different lengths line up. Eliminations
+are events; the winner (finish_place 1, or no finish place at all) is
+censored at tournament end.
+
+One vectorized estimator serves every grouping (per player, per field
+size, league-wide): rows are sorted by (group, time) once, the at-risk
+counts come from positions in that order, log(1 - d/n) is cumsummed per
+group, and every group's step function is read off a fixed grid with a
+single searchsorted. No per-group Python loop.
+
+Usage:
+  python backend/scripts/survival_curves.py          # league + field-size curves
+"""
+
+from __future__ import annotations
+
+import os
+import sqlite3
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+DB_PATH = Path(os.environ.get("POKERLEAGUE_DB", "backend/db/pokerleague.sqlite"))
+SEASON_ID = os.environ.get("SEASON_ID", "spring_2026")
+
+GRID_POINTS = 21   # 0.00, 0.05, ..., 1.00 of the tournament
+
+
+def load_curve_inputs(conn: sqlite3.Connection, season_id: str) -> pd.DataFrame:
+    """
+    One row per player per tournament: player, normalized time, whether
+    the player was eliminated (event) and the tournament's field size.
+    """
+    return pd.read_sql_query(
+        """
+        SELECT ws.player_id, p.player_name,
+               ws.survival_percent AS time,
+               COALESCE(wp.finish_place, 1) > 1 AS event,
+               COUNT(*) OVER (PARTITION BY ws.tournament_id) AS field_size
+        FROM weekly_survival ws
+        JOIN tournaments t ON t.tournament_id = ws.tournament_id
+        JOIN players p ON p.player_id = ws.player_id
+        LEFT JOIN weekly_points wp
+          ON wp.tournament_id = ws.tournament_id AND wp.player_id = ws.player_id
+        WHERE t.season_id = ?
+          AND ws.tournament_minutes > 0
+        """,
+        conn,
+        params=(season_id,),
+    )
+
+
+def kaplan_meier(times, events, groups, grid) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Kaplan-Meier curves for every group at once.
+
+    times: float in [0, 1]; events: bool (False = censored); groups: any
+    labels. Returns (labels, curves, n, n_events) with curves[g, j] =
+    S(grid[j]) for labels[g] (right-continuous: events at grid[j] count).
+    """
+    times = np.asarray(times, dtype=float)
+    events = np.asarray(events, dtype=bool)
+    grid = np.asarray(grid, dtype=float)
+    labels, g = np.unique(np.asarray(groups), return_inverse=True)
+    n_groups = len(labels)
+    if not len(times):
+        return labels, np.ones((0, len(grid))), np.zeros(0, dtype=int), np.zeros(0, dtype=int)
+
+    order = np.lexsort((times, g))
+    g, times, events = g[order], times[order], events[order]
+    group_n = np.bincount(g, minlength=n_groups)
+    group_end = np.cumsum(group_n)                      # one past each group's last row
+
+    # distinct (group, time) steps: at risk = rows of the group from here on
+    first = np.flatnonzero(np.r_[True, (g[1:] != g[:-1]) | (times[1:] != times[:-1])])
+    step_g, step_t = g[first], times[first]
+    at_risk = group_end[step_g] - first
+    deaths = np.add.reduceat(events.astype(np.int64), first)
+
+    # S after each step = exp(cumsum log(1 - d/n)) within the group; a step
+    # where everyone at risk is eliminated zeroes the rest of the curve, so
+    # those are counted apart (a -inf would poison the shared cumsum)
+    factor = 1.0 - deaths / at_risk
+    dead = factor <= 0.0
+    cum_log = np.cumsum(np.log(np.where(dead, 1.0, factor)))
+    cum_dead = np.cumsum(dead)
+    group_start_step = np.searchsorted(step_g, np.arange(n_groups))
+    log_offset = np.r_[0.0, cum_log][group_start_step]
+    dead_offset = np.r_[0, cum_dead][group_start_step]
+    surv = np.where(
+        cum_dead - dead_offset[step_g] > 0, 0.0, np.exp(cum_log - log_offset[step_g])
+    )
+
+    # read every group's step function on the grid in one searchsorted:
+    # keys are group * 2 + time (times live in [0, 1])
+    step_key = step_g * 2.0 + step_t
+    grid_key = (np.arange(n_groups)[:, None] * 2.0 + grid[None, :]).ravel()
+    idx = np.searchsorted(step_key, grid_key, side="right") - 1
+    grid_g = np.repeat(np.arange(n_groups), len(grid))
+    inside = (idx >= 0) & (step_g[np.maximum(idx, 0)] == grid_g)
+    curves = np.where(inside, surv[np.maximum(idx, 0)], 1.0).reshape(n_groups, len(grid))
+
+    n_events = np.bincount(g, weights=events, minlength=n_groups).astype(int)
+    return labels, curves, group_n, n_events
+
+
+def median_time(curves, grid) -> np.ndarray:
+    """First grid time where S <= 0.5 (NaN if the curve never gets there)."""
+    below = curves <= 0.5
+    return np.where(below.any(axis=1), np.asarray(grid)[below.argmax(axis=1)], np.nan)
+
+
+def _curve_rows(labels, curves, n, n_events, grid, key=None, label_fn=lambda x: x):
+    medians = median_time(curves, grid)
+    return [
+        {
+            **({key: label_fn(labels[i])} if key else {}),
+            "N": int(n[i]),
+            "Events": int(n_events[i]),
+            "Median": None if np.isnan(medians[i]) else float(medians[i]),
+            "S": [round(float(x), 3) for x in curves[i]],
+        }
+        for i in range(len(labels))
+    ]
+
+
+def survival_curves(conn: sqlite3.Connection, season_id=None, grid_points: int = GRID_POINTS) -> dict:
+    """
+    The season's curves for the JSON export:
+    {"Grid", "League", "ByFieldSize": [...], "ByPlayer": [...]}.
+    """
+    season_id = season_id or SEASON_ID
+    grid = np.round(np.linspace(0.0, 1.0, grid_points), 3)
+    df = load_curve_inputs(conn, season_id)
+    times, events = df["time"].to_numpy(dtype=float), df["event"].to_numpy(dtype=bool)
+
+    league = kaplan_meier(times, events, np.zeros(len(df), dtype=int), grid)
+    by_field = kaplan_meier(times, events, df["field_size"].to_numpy(), grid)
+    by_player = kaplan_meier(times, events, df["player_id"].to_numpy(), grid)
+
+    names = dict(zip(df["player_id"], df["player_name"]))
+    player_rows = sorted(
+        ({"Player": names[row["PlayerID"]], **row} for row in _curve_rows(*by_player, grid, "PlayerID", int)),
+        key=lambda r: r["Player"],
+    )
+
+    return {
+        "Grid": [round(float(x), 3) for x in grid],
+        "League": (_curve_rows(*league, grid) or [None])[0],
+        "ByFieldSize": _curve_rows(*by_field, grid, "FieldSize", int),
+        "ByPlayer": player_rows,
+    }
+
+
+def main() -> int:
+    conn = sqlite3.connect(str(DB_PATH))
+    try:
+        curves = survival_curves(conn)
+    finally:
+        conn.close()
+    grid = curves["Grid"]
+    print(f"Kaplan-Meier survival, {SEASON_ID} (time = share of tournament)")
+    print("  " + " ".join(f"{t:5.2f}" for t in grid[::4]))
+    rows = [("league", curves["League"])] if curves["League"] else []
+    rows += [(f"field {r['FieldSize']}", r) for r in curves["ByFieldSize"]]
+    for label, r in rows:
+        print(f"  {' '.join(f'{s:5.3f}' for s in r['S'][::4])}  {label} (n={r['N']}, median {r['Median']})")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -5,12 +5,15 @@ CREATE TABLE IF NOT EXISTS seasons (
   season_name TEXT NOT NULL,
   start_date  TEXT,
   end_date    TEXT,
-  is_active   INTEGER DEFAULT 0
+  is_active   INTEGER DEFAULT 0,
+  drop_weeks  INTEGER NOT NULL DEFAULT 2   -- lowest K weeks dropped from season_points_drop2
 );
 
 CREATE TABLE IF NOT EXISTS players (
   player_id INTEGER PRIMARY KEY,
-  player_name TEXT NOT NULL UNIQUE
+  player_name TEXT NOT NULL UNIQUE,
+  -- name as matched against log rows; indexed by migrate_db (m004)
+  player_key TEXT GENERATED ALWAYS AS (TRIM(player_name)) VIRTUAL
 );
 
 CREATE TABLE IF NOT EXISTS tournaments (
@@ -54,7 +57,7 @@ CREATE TABLE IF NOT EXISTS season_totals (
   player_id INTEGER NOT NULL,
 
   season_points_total REAL NOT NULL,
-  season_points_drop2 REAL NOT NULL,
+  season_points_drop2 REAL NOT NULL,     -- total minus the lowest seasons.drop_weeks weeks
   weeks_in_season INTEGER NOT NULL,
   weeks_played INTEGER NOT NULL,
 
@@ -64,11 +67,20 @@ CREATE TABLE IF NOT EXISTS season_totals (
   FOREIGN KEY (player_id) REFERENCES players(player_id)
 );
 
-CREATE INDEX IF NOT EXISTS idx_season_totals_season_player
+-- unique: the season_aggregates triggers upsert on it (migrate_db m006
+-- replaces the old non-unique index of the same name)
+CREATE UNIQUE INDEX IF NOT EXISTS idx_season_totals_season_player
 ON season_totals(season_id, player_id);
 
-CREATE INDEX IF NOT EXISTS idx_season_totals_season_player
-ON season_totals(season_id, player_id);
+-- Kept current by the season_aggregates triggers (migrate_db m006);
+-- build_player_season_stats.py rebuilds it from scratch
+CREATE TABLE IF NOT EXISTS player_season_stats (
+  season_id TEXT NOT NULL,
+  player_id INTEGER NOT NULL,
+  wins INTEGER NOT NULL DEFAULT 0,
+  avg_finish REAL,
+  PRIMARY KEY (season_id, player_id)
+);
 
 CREATE TABLE IF NOT EXISTS raw_log_events (
   raw_event_id INTEGER PRIMARY KEY,
@@ -80,9 +92,18 @@ CREATE TABLE IF NOT EXISTS raw_log_events (
   eliminator_player_name TEXT,
   position INTEGER,
   notes TEXT,
+  level INTEGER,          -- blind level number ("Level 4, 150/300, 15 min." -> 4)
+  chips INTEGER,          -- "6,500 each" -> 6500
+  amount_cents INTEGER,   -- "$20.00 each" -> 2000
+  table_num INTEGER,
+  event_epoch INTEGER,    -- absolute seconds (tournament_date + event_ts, rolled past midnight)
+  event_dt TEXT,          -- same instant as "YYYY-MM-DD HH:MM:SS"
   FOREIGN KEY (tournament_id) REFERENCES tournaments(tournament_id)
 );
 
+CREATE INDEX IF NOT EXISTS idx_raw_events_tournament_type
+ON raw_log_events(tournament_id, event_type);
+
 CREATE TABLE IF NOT EXISTS weekly_payouts (
   payout_id     INTEGER PRIMARY KEY AUTOINCREMENT,
   season_id     TEXT    NOT NULL,     -- matches seasons.season_id (ex: "spring_2026")
@@ -102,6 +123,19 @@ ON weekly_payouts(season_id, week_num);
 CREATE INDEX IF NOT EXISTS idx_weekly_payouts_season_player
 ON weekly_payouts(season_id, player_id);
 
+-- Survival minutes per player per tournament (compute_survival.py; scoped
+-- runs refresh only dirty tournaments, so the raw log is parsed once per week)
+CREATE TABLE IF NOT EXISTS weekly_survival (
+  tournament_id      INTEGER NOT NULL,
+  player_id          INTEGER NOT NULL,
+  tournament_minutes REAL    NOT NULL,
+  minutes_survived   REAL    NOT NULL,
+  survival_percent   REAL    NOT NULL,   -- 0..1
+  PRIMARY KEY (tournament_id, player_id),
+  FOREIGN KEY (tournament_id) REFERENCES tournaments(tournament_id),
+  FOREIGN KEY (player_id) REFERENCES players(player_id)
+);
+
 -- Eliminations table
 CREATE TABLE IF NOT EXISTS eliminations (
     elimination_id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -117,4 +151,92 @@ CREATE TABLE IF NOT EXISTS eliminations (
 );
 
 CREATE INDEX IF NOT EXISTS idx_elims_tournament
-ON eliminations(tournament_id);
\ No newline at end of file
+ON eliminations(tournament_id);
+
+-- Ingest manifest (one row per weekly log CSV; lets ingest skip unchanged files)
+CREATE TABLE IF NOT EXISTS ingest_manifest (
+  source_path    TEXT PRIMARY KEY,     -- e.g. "data/incoming/02.10.26 log.csv"
+  size_bytes     INTEGER NOT NULL,
+  mtime_ns       INTEGER NOT NULL,
+  content_sha256 TEXT    NOT NULL,
+  tournament_id  INTEGER,
+  row_count      INTEGER,
+  ingested_at    TEXT DEFAULT (datetime('now')),
+  FOREIGN KEY (tournament_id) REFERENCES tournaments(tournament_id)
+);
+
+-- Incremental build bookkeeping (run_pipeline.py): fingerprints of each
+-- stage's declared reads/writes as of its last successful run
+CREATE TABLE IF NOT EXISTS build_stage_runs (
+  stage       TEXT NOT NULL,
+  season_id   TEXT NOT NULL,
+  input_fp    TEXT NOT NULL,
+  output_fp   TEXT NOT NULL,
+  code_fp     TEXT,           -- stage source alone (a code change forces a full recompute)
+  season_fp   TEXT,           -- season-wide reads alone (a change there forces one too)
+  finished_at TEXT DEFAULT (datetime('now')),
+  PRIMARY KEY (stage, season_id)
+);
+
+-- Data version counters for tables too big to checksum on every build.
+-- Inserts show up in COUNT(*) / MAX(rowid); deletes and updates bump the
+-- counter, so (version, count, max rowid) changes whenever the rows do.
+CREATE TABLE IF NOT EXISTS table_versions (
+  table_name TEXT PRIMARY KEY,
+  version    INTEGER NOT NULL DEFAULT 0
+);
+
+INSERT OR IGNORE INTO table_versions (table_name) VALUES ('raw_log_events');
+
+CREATE TRIGGER IF NOT EXISTS trg_raw_log_events_version_delete
+AFTER DELETE ON raw_log_events
+BEGIN
+  UPDATE table_versions SET version = version + 1 WHERE table_name = 'raw_log_events';
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_raw_log_events_version_update
+AFTER UPDATE ON raw_log_events
+BEGIN
+  UPDATE table_versions SET version = version + 1 WHERE table_name = 'raw_log_events';
+END;
+
+-- Tournaments whose derived rows (eliminations, weekly_points, payouts)
+-- need recomputing; see dirty_tournaments.py
+CREATE TABLE IF NOT EXISTS dirty_tournaments (
+  tournament_id INTEGER PRIMARY KEY,
+  marked_at     TEXT DEFAULT (datetime('now')),
+  FOREIGN KEY (tournament_id) REFERENCES tournaments(tournament_id)
+);
+
+-- One row per stage per run_pipeline build (stage_profiler.py)
+CREATE TABLE IF NOT EXISTS build_profile_runs (
+  build_ts       TEXT    NOT NULL,     -- UTC "YYYY-MM-DDTHH:MM:SSZ"
+  season_id      TEXT    NOT NULL,
+  stage          TEXT    NOT NULL,
+  status         TEXT    NOT NULL,     -- "ran" | "skipped"
+  wall_s         REAL    NOT NULL,
+  cpu_s          REAL    NOT NULL,
+  peak_mem_bytes INTEGER,
+  sql_statements INTEGER NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS idx_build_profile_runs_season_stage
+ON build_profile_runs(season_id, stage, build_ts);
+
+-- Extra scoring rules beyond scoring_rules.BUILTIN_RULES, and the rule each
+-- season scores with (none = scoring_rules.DEFAULT_RULE)
+CREATE TABLE IF NOT EXISTS scoring_rules (
+  rule_name   TEXT    NOT NULL,
+  version     INTEGER NOT NULL,
+  formula     TEXT    NOT NULL,              -- key of scoring_rules.FORMULAS
+  params      TEXT    NOT NULL DEFAULT '{}', -- JSON keyword args for the formula
+  description TEXT,
+  PRIMARY KEY (rule_name, version)
+);
+
+CREATE TABLE IF NOT EXISTS season_scoring_rules (
+  season_id TEXT    PRIMARY KEY,
+  rule_name TEXT    NOT NULL,
+  version   INTEGER NOT NULL,
+  FOREIGN KEY (season_id) REFERENCES seasons(season_id)
+);
@@ -2,12 +2,24 @@ import { resolveSeason } from "./season_config.js";
 
 const MEMORY_CACHE = new Map();
 
-const CACHE_VERSION = "v1"; // bump when you change JSON schema or want to flush all caches
+const ANALYTICS_CACHE = new Map();
+
+const CACHE_VERSION = "v2"; // bump when you change JSON schema or want to flush all caches
 
 function storageKey(seasonId) {
   return `PL_ANALYTICS_SEASON_DATA__${seasonId}__${CACHE_VERSION}`;
 }
 
+// The compact .min.json files are build outputs (not in git); a plain
+// checkout only has the readable copy, so a 404 retries fallbackPath.
+export async function fetchSeasonFile(path, fallbackPath, init = {}) {
+  const resp = await fetch(path, init);
+  if (resp.status === 404 && fallbackPath) {
+    return fetch(fallbackPath, init);
+  }
+  return resp;
+}
+
 export async function loadSeasonData(seasonId) {
   const season = resolveSeason(seasonId);
 
@@ -26,7 +38,7 @@ export async function loadSeasonData(seasonId) {
       // (Python http.server supports Last-Modified; some servers also return ETag.)
       let serverStamp = null;
       try {
-        const head = await fetch(season.dataPath, { method: "HEAD", cache: "no-store" });
+        const head = await fetchSeasonFile(season.dataPath, season.dataFallbackPath, { method: "HEAD", cache: "no-store" });
         if (head.ok) {
           serverStamp =
             head.headers.get("etag") ||
@@ -51,7 +63,7 @@ export async function loadSeasonData(seasonId) {
   // Fetch
   let resp;
   try {
-    resp = await fetch(season.dataPath, { cache: "no-store" });
+    resp = await fetchSeasonFile(season.dataPath, season.dataFallbackPath, { cache: "no-store" });
   } catch (e) {
     throw new Error(
       `Network error fetching ${season.dataPath}. Make sure you run python http.server from /frontend.`
@@ -59,7 +71,7 @@ export async function loadSeasonData(seasonId) {
   }
 
   if (!resp.ok) {
-    throw new Error(`Failed to load ${season.dataPath}. HTTP ${resp.status} ${resp.statusText}`);
+    throw new Error(`Failed to load ${season.dataPath} or ${season.dataFallbackPath}. HTTP ${resp.status} ${resp.statusText}`);
   }
 
   let json;
@@ -76,7 +88,7 @@ export async function loadSeasonData(seasonId) {
   // Attach a cache stamp so we can detect stale sessionStorage next load
   let cacheStamp = null;
   try {
-    const head = await fetch(season.dataPath, { method: "HEAD", cache: "no-store" });
+    const head = await fetchSeasonFile(season.dataPath, season.dataFallbackPath, { method: "HEAD", cache: "no-store" });
     if (head.ok) {
       cacheStamp =
         head.headers.get("etag") ||
@@ -97,8 +109,39 @@ export async function loadSeasonData(seasonId) {
   return { season, data: json, source: "fetch" };
 }
 
+// SurvivalWeekly / BlindLevels live in a separate file; fetch it only when a page needs them
+export async function loadSeasonAnalytics(seasonId) {
+  const season = resolveSeason(seasonId);
+
+  if (ANALYTICS_CACHE.has(season.id)) {
+    return { season, data: ANALYTICS_CACHE.get(season.id), source: "memory" };
+  }
+
+  let resp;
+  try {
+    resp = await fetchSeasonFile(season.analyticsPath, season.analyticsFallbackPath, { cache: "no-store" });
+  } catch (e) {
+    throw new Error(`Network error fetching ${season.analyticsPath}.`);
+  }
+
+  if (!resp.ok) {
+    throw new Error(`Failed to load ${season.analyticsPath} or ${season.analyticsFallbackPath}. HTTP ${resp.status} ${resp.statusText}`);
+  }
+
+  let json;
+  try {
+    json = await resp.json();
+  } catch (e) {
+    throw new Error(`Invalid JSON at ${season.analyticsPath}.`);
+  }
+
+  ANALYTICS_CACHE.set(season.id, json);
+  return { season, data: json, source: "fetch" };
+}
+
 export function clearSeasonCache(seasonId) {
   MEMORY_CACHE.delete(seasonId);
+  ANALYTICS_CACHE.delete(seasonId);
   try {
     sessionStorage.removeItem(storageKey(seasonId));
   } catch (e) {}
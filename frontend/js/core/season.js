@@ -3,11 +3,12 @@
   getAllSeasons,
   resolveSeasonIdFromUrl
 } from "./season_config.js";
+import { fetchSeasonFile } from "./data_loader.js";
 
 export async function loadSeason() {
   const season = resolveSeasonConfig();
 
-  const response = await fetch(season.dataPath, { cache: "no-store" });
+  const response = await fetchSeasonFile(season.dataPath, season.dataFallbackPath, { cache: "no-store" });
 
   if (!response.ok) {
     throw new Error(`Failed to load season data: ${season.dataPath}`);
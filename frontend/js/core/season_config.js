@@ -22,10 +22,34 @@ export function getDefaultSeasonId() {
   return DEFAULT_SEASON_ID;
 }
 
+// compact export (the host compresses it); <season>.json is the readable copy
 export function buildSeasonDataPath(seasonId) {
+  return `/data/${seasonId}.min.json`;
+}
+
+// per-tournament series (SurvivalWeekly, BlindLevels), loaded on demand
+export function buildSeasonAnalyticsPath(seasonId) {
+  return `/data/${seasonId}.analytics.min.json`;
+}
+
+// readable copies, tracked in git; used when the compact file isn't built (404)
+export function buildSeasonDataFallbackPath(seasonId) {
   return `/data/${seasonId}.json`;
 }
 
+export function buildSeasonAnalyticsFallbackPath(seasonId) {
+  return `/data/${seasonId}.analytics.json`;
+}
+
+function seasonPaths(seasonId) {
+  return {
+    dataPath: buildSeasonDataPath(seasonId),
+    dataFallbackPath: buildSeasonDataFallbackPath(seasonId),
+    analyticsPath: buildSeasonAnalyticsPath(seasonId),
+    analyticsFallbackPath: buildSeasonAnalyticsFallbackPath(seasonId)
+  };
+}
+
 export function resolveSeasonIdFromUrl() {
   const params = new URLSearchParams(window.location.search);
   const requestedSeasonId = params.get("season");
@@ -44,7 +68,7 @@ export function resolveSeasonConfig(seasonId = null) {
   if (season) {
     return {
       ...season,
-      dataPath: buildSeasonDataPath(season.id)
+      ...seasonPaths(season.id)
     };
   }
 
@@ -52,7 +76,7 @@ export function resolveSeasonConfig(seasonId = null) {
 
   return {
     ...fallbackSeason,
-    dataPath: buildSeasonDataPath(fallbackSeason.id)
+    ...seasonPaths(fallbackSeason.id)
   };
 }
 
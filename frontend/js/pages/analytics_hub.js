@@ -4,7 +4,7 @@ import {
   resolveSeason,
   SEASONS
 } from "../core/season_config.js";
-import { clearSeasonCache } from "../core/data_loader.js";
+import { clearSeasonCache, fetchSeasonFile } from "../core/data_loader.js";
 
 /* -----------------------------
    Season helpers
@@ -285,7 +285,7 @@ async function init() {
   hide(contentRow);
 
   try {
-    const response = await fetch(season.dataPath, { cache: "no-store" });
+    const response = await fetchSeasonFile(season.dataPath, season.dataFallbackPath, { cache: "no-store" });
 
     if (!response.ok) {
       throw new Error(`Failed to load ${season.dataPath}. HTTP ${response.status} ${response.statusText}`);